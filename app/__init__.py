@@ -1,35 +1,119 @@
 from flask import Flask
 from datetime import timedelta
 from dotenv import load_dotenv
-from .extensions import db, ma, jwt, cors
+from .extensions import db, ma, jwt, cors, migrate, async_db
+from .utils.hashing import HashingUnavailable
+from .utils.fieldsets import FieldsetError
+from .utils.routing import configure_replica_binds, init_read_replicas
 import os
 
 # Cargar variables de entorno
 load_dotenv()
 
-def create_app():
+def create_app(config=None):
     app = Flask(__name__)
     
     # Configuración básica
     app.config['SECRET_KEY'] = 'mi_super_secreto_12345'
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'mysql+pymysql://root@localhost/db_blogs'
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'mysql+pymysql://root@localhost/db_blogs')
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     
+    # Réplicas de lectura (URIs separadas por comas) y segundos durante los que
+    # un usuario que acaba de escribir sigue leyendo de la primaria
+    app.config['SQLALCHEMY_READ_REPLICAS'] = [
+        uri for uri in os.getenv('DATABASE_REPLICA_URLS', '').split(',') if uri
+    ]
+    app.config['REPLICA_STICKY_SECONDS'] = float(os.getenv('REPLICA_STICKY_SECONDS', 5))
+    
     # Configuración JWT
     app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'jwt-secret-key')
     app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=24)
     
+    # Autorización: confiar en el rol firmado en el JWT y caché de usuarios
+    app.config['AUTH_TRUST_JWT_CLAIMS'] = os.getenv('AUTH_TRUST_JWT_CLAIMS', 'false').lower() == 'true'
+    app.config['AUTH_USER_CACHE_TTL'] = int(os.getenv('AUTH_USER_CACHE_TTL', 60))
+    # Cada cuántos segundos relee cada worker la versión de los cambios de rol o estado
+    app.config['AUTH_VERSION_CHECK_SECONDS'] = float(os.getenv('AUTH_VERSION_CHECK_SECONDS', 1))
+    
+    # Hashing de contraseñas en un pool de procesos acotado
+    app.config['PASSWORD_HASH_METHOD'] = os.getenv('PASSWORD_HASH_METHOD', 'scrypt')
+    app.config['PASSWORD_HASH_WORKERS'] = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+    app.config['PASSWORD_HASH_QUEUE_DEPTH'] = int(os.getenv('PASSWORD_HASH_QUEUE_DEPTH', 8))
+    app.config['PASSWORD_HASH_TIMEOUT'] = float(os.getenv('PASSWORD_HASH_TIMEOUT', 5))
+    
+    # Token buckets de login y registro ('capacidad/segundos') por IP y por
+    # cuenta; 'memory' por proceso o 'sqlite:///ruta' compartido entre workers
+    app.config['RATE_LIMIT_ENABLED'] = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    app.config['RATE_LIMIT_IP'] = os.getenv('RATE_LIMIT_IP', '20/60')
+    app.config['RATE_LIMIT_ACCOUNT'] = os.getenv('RATE_LIMIT_ACCOUNT', '5/60')
+    app.config['RATE_LIMIT_STORAGE'] = os.getenv('RATE_LIMIT_STORAGE', 'memory')
+    # Proxies inversos de confianza delante de la aplicación. Con N > 0 la IP
+    # del cliente (y su cubo de rate limit) sale de X-Forwarded-For; con 0 se
+    # usa la dirección de la conexión, que detrás de un proxy es la del proxy
+    app.config['PROXY_FIX_X_FOR'] = int(os.getenv('PROXY_FIX_X_FOR', 0))
+    
+    # Total de los listados paginados: 'exact', 'cached' (COUNT reutilizado
+    # durante PAGINATION_COUNT_TTL segundos) o 'estimated' (estadísticas de la tabla)
+    app.config['PAGINATION_COUNT_STRATEGY'] = os.getenv('PAGINATION_COUNT_STRATEGY', 'cached')
+    app.config['PAGINATION_COUNT_TTL'] = int(os.getenv('PAGINATION_COUNT_TTL', 30))
+    
+    # Filas por transacción en las importaciones masivas
+    app.config['BULK_IMPORT_CHUNK_SIZE'] = int(os.getenv('BULK_IMPORT_CHUNK_SIZE', 500))
+    # Filas leídas por lote del cursor en las exportaciones
+    app.config['EXPORT_BATCH_SIZE'] = int(os.getenv('EXPORT_BATCH_SIZE', 1000))
+    
+    # Antigüedad máxima (segundos) de los agregados de /api/stats/detailed
+    app.config['STATS_ROLLUP_MAX_AGE'] = int(os.getenv('STATS_ROLLUP_MAX_AGE', 300))
+    
+    # Posts más recientes precalculados por categoría (más que el límite máximo de página)
+    app.config['CATEGORY_TOP_POSTS'] = int(os.getenv('CATEGORY_TOP_POSTS', 101))
+    
+    # Cada cuántos segundos relee cada worker la versión de las categorías
+    app.config['CATEGORY_VERSION_CHECK_SECONDS'] = float(os.getenv('CATEGORY_VERSION_CHECK_SECONDS', 1))
+    
+    # Calentamiento en wsgi.py antes del fork de los workers (gunicorn --preload)
+    app.config['WARMUP_ON_STARTUP'] = os.getenv('WARMUP_ON_STARTUP', 'true').lower() == 'true'
+    
+    # Instrumentación SQL por petición (Server-Timing y log de consultas lentas)
+    app.config['SQL_INSTRUMENTATION'] = os.getenv('SQL_INSTRUMENTATION', 'false').lower() == 'true'
+    app.config['SLOW_QUERY_THRESHOLD_MS'] = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', 100))
+    
+    # Compresión gzip/deflate de las respuestas JSON, NDJSON y CSV: tamaño
+    # mínimo en bytes, nivel de zlib y compresión de las exportaciones en streaming
+    app.config['COMPRESSION_ENABLED'] = os.getenv('COMPRESSION_ENABLED', 'true').lower() == 'true'
+    app.config['COMPRESSION_MIN_SIZE'] = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+    app.config['COMPRESSION_LEVEL'] = int(os.getenv('COMPRESSION_LEVEL', 6))
+    app.config['COMPRESSION_STREAMING'] = os.getenv('COMPRESSION_STREAMING', 'true').lower() == 'true'
+    
+    # Vistas async en /api/async con un engine async (aiomysql/aiosqlite);
+    # por defecto la misma base de datos con el driver async equivalente
+    app.config['ASYNC_VIEWS'] = os.getenv('ASYNC_VIEWS', 'false').lower() == 'true'
+    app.config['ASYNC_DATABASE_URL'] = os.getenv('ASYNC_DATABASE_URL')
+    # Peticiones en curso a la vez por proceso ASGI (ver asgi.py)
+    app.config['ASGI_THREADS'] = int(os.getenv('ASGI_THREADS', 40))
+    
+    # Configuración adicional (tests, benchmarks) antes de inicializar extensiones
+    if config:
+        app.config.update(config)
+    
     # Configuración CORS
     cors.init_app(app, resources={
         r"/api/*": {
             "origins": ["http://localhost:3000", "http://localhost:5173"],  # Ajusta según tu frontend
             "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-            "allow_headers": ["Content-Type", "Authorization"]
+            "allow_headers": ["Content-Type", "Authorization", "X-Last-Write"],
+            "expose_headers": ["X-Last-Write"]
         }
     })
     
+    if app.config['PROXY_FIX_X_FOR']:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_FIX_X_FOR'])
+    
     # Inicializar extensiones con la aplicación
+    configure_replica_binds(app.config)
     db.init_app(app)
+    migrate.init_app(app, db)
     ma.init_app(app)
     jwt.init_app(app)
     
@@ -40,6 +124,7 @@ def create_app():
     from .views.comment import comment_bp
     from .views.category import category_bp
     from .views.stats import stats_bp
+    from .views.bulk import bulk_bp
     
     app.register_blueprint(auth_bp, url_prefix='/api')
     app.register_blueprint(user_bp, url_prefix='/api')
@@ -47,6 +132,31 @@ def create_app():
     app.register_blueprint(comment_bp, url_prefix='/api')
     app.register_blueprint(category_bp, url_prefix='/api')
     app.register_blueprint(stats_bp, url_prefix='/api')
+    app.register_blueprint(bulk_bp, url_prefix='/api')
+    
+    if app.config['ASYNC_VIEWS']:
+        from .views.async_api import async_bp
+        async_db.init_app(app)
+        app.register_blueprint(async_bp, url_prefix='/api/async')
+
+    # Listeners de SQLAlchemy (paths de comentarios, contadores, búsqueda,
+    # versión y top de posts de las categorías)
+    from .utils import threads, counters, search, category_cache, category_top  # noqa: F401
+
+    # Comandos CLI
+    from .commands import register_commands
+    register_commands(app)
+    
+    # Lecturas a réplicas, escrituras a la primaria
+    init_read_replicas(app)
+    
+    if app.config['COMPRESSION_ENABLED']:
+        from .utils.compression import init_compression
+        init_compression(app)
+    
+    if app.config['SQL_INSTRUMENTATION']:
+        from .utils.instrumentation import init_sql_instrumentation
+        init_sql_instrumentation(app)
     
     # Manejadores de error
     @app.errorhandler(404)
@@ -58,6 +168,14 @@ def create_app():
         db.session.rollback()
         return {'error': 'Internal Server Error'}, 500
 
+    @app.errorhandler(HashingUnavailable)
+    def hashing_unavailable_error(error):
+        return {'error': 'Server busy, try again later'}, 503, {'Retry-After': '1'}
+
+    @app.errorhandler(FieldsetError)
+    def fieldset_error(error):
+        return {'message': str(error)}, 400
+
     @jwt.invalid_token_loader
     def invalid_token_callback(error):
         return {'message': 'Invalid token'}, 401
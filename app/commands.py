@@ -0,0 +1,150 @@
+import click
+from flask.cli import with_appcontext
+from .extensions import db
+
+
+@click.command('rebuild-comment-paths')
+@with_appcontext
+def rebuild_comment_paths_command():
+    """Recalcula el path materializado de todos los comentarios"""
+    from .utils.threads import rebuild_paths
+    updated = rebuild_paths()
+    db.session.commit()
+    click.echo(f'{updated} comentarios actualizados')
+
+
+@click.command('rebuild-counters')
+@with_appcontext
+def rebuild_counters_command():
+    """Recalcula desde cero los contadores de /api/stats"""
+    from .utils.counters import rebuild_counters
+    values = rebuild_counters()
+    db.session.commit()
+    for name, value in values.items():
+        click.echo(f'{name}: {value}')
+
+
+@click.command('refresh-rollups')
+@with_appcontext
+def refresh_rollups_command():
+    """Recalcula los agregados de /api/stats/detailed (para ejecutar con cron)"""
+    from .utils.rollups import refresh_all
+    rollups = refresh_all()
+    db.session.commit()
+    for rollup in rollups:
+        click.echo(f'{rollup.name}: {rollup.computed_at.isoformat()}')
+
+
+@click.command('rebuild-search-index')
+@with_appcontext
+def rebuild_search_index_command():
+    """Reconstruye el índice de texto completo de los posts"""
+    from .utils.search import rebuild_index, SearchUnavailable
+    try:
+        rebuild_index()
+    except SearchUnavailable as e:
+        raise click.ClickException(str(e))
+    db.session.commit()
+    click.echo('Índice de búsqueda reconstruido')
+
+
+@click.command('rebuild-category-top-posts')
+@with_appcontext
+def rebuild_category_top_posts_command():
+    """Recalcula los posts más recientes precalculados de cada categoría"""
+    from .utils.category_top import rebuild_top_posts
+    categories = rebuild_top_posts()
+    db.session.commit()
+    click.echo(f'{categories} categorías actualizadas')
+
+
+@click.command('check-serializers')
+@click.option('--limit', default=500, help='Filas por modelo a comparar')
+@with_appcontext
+def check_serializers_command(limit):
+    """Verifica que los serializadores compilados coinciden con marshmallow"""
+    from .models import Users, Blogs, Comment, Category
+    from .schemas import UserSchema, BlogSchema, CommentSchema, CategorySchema
+    from .utils.serializers import check_parity
+
+    checks = [
+        (UserSchema(many=True), Users),
+        (BlogSchema(many=True), Blogs),
+        (CommentSchema(many=True), Comment),
+        (CategorySchema(many=True), Category),
+    ]
+    failed = False
+    for schema, model in checks:
+        rows = model.query.order_by(model.id).limit(limit).all()
+        mismatches = check_parity(schema, rows)
+        status = 'OK' if not mismatches else f'{len(mismatches)} diferencias'
+        click.echo(f'{type(schema).__name__}: {len(rows)} filas, {status}')
+        failed = failed or bool(mismatches)
+    if failed:
+        raise SystemExit(1)
+
+
+@click.command('explain-hot-queries')
+@click.option('--verbose', is_flag=True, help='Muestra el plan completo de cada consulta')
+@with_appcontext
+def explain_hot_queries_command(verbose):
+    """Falla si alguna consulta caliente recorre una tabla entera (EXPLAIN)"""
+    from .utils.explain import explain_hot_queries
+
+    failed = False
+    for name, (plan, problems) in explain_hot_queries().items():
+        status = 'OK' if not problems else 'FULL SCAN: ' + '; '.join(problems)
+        click.echo(f'{name}: {status}')
+        if verbose:
+            for step in plan:
+                click.echo(f'    {step}')
+        failed = failed or bool(problems)
+    if failed:
+        raise SystemExit(1)
+
+
+@click.command('startup-profile')
+@click.option('--top', default=15, help='Módulos más lentos a mostrar')
+@click.option('--warmup', 'with_warmup', is_flag=True,
+              help='Calienta la aplicación antes de las primeras peticiones')
+def startup_profile_command(top, with_warmup):
+    """Tiempo de importación por módulo y de la primera petición por vista, en frío"""
+    from .utils.warmup import profile_startup
+
+    try:
+        result = profile_startup(with_warmup)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+
+    click.echo(f"Importación de app: {result['import_ms']:.1f} ms")
+    click.echo(f"create_app: {result['create_app_ms']:.1f} ms")
+    if result['warmup_ms'] is not None:
+        click.echo(f"Calentamiento: {result['warmup_ms']:.1f} ms")
+
+    click.echo('\nMódulos de la aplicación (acumulado / propio, ms):')
+    for module, self_ms, cumulative_ms, _ in result['imports']:
+        if module == 'app' or module.startswith('app.'):
+            click.echo(f'  {module:<40} {cumulative_ms:8.1f} {self_ms:8.1f}')
+
+    click.echo('\nPaquetes de primer nivel más lentos (acumulado, ms):')
+    top_level = [entry for entry in result['imports'] if entry[3] == 0]
+    for module, _, cumulative_ms, _ in sorted(top_level, key=lambda e: e[2], reverse=True)[:top]:
+        click.echo(f'  {module:<40} {cumulative_ms:8.1f}')
+
+    click.echo('\nPrimera petición por módulo de vistas (primera / segunda, ms):')
+    for request in result['requests']:
+        click.echo(
+            f"  {request['module']:<22} {request['path']:<36} {request['status']} "
+            f"{request['first_ms']:8.1f} {request['second_ms']:8.1f}"
+        )
+
+
+def register_commands(app):
+    app.cli.add_command(rebuild_comment_paths_command)
+    app.cli.add_command(rebuild_counters_command)
+    app.cli.add_command(refresh_rollups_command)
+    app.cli.add_command(rebuild_search_index_command)
+    app.cli.add_command(rebuild_category_top_posts_command)
+    app.cli.add_command(check_serializers_command)
+    app.cli.add_command(explain_hot_queries_command)
+    app.cli.add_command(startup_profile_command)
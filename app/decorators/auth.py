@@ -1,7 +1,130 @@
-from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask_jwt_extended import get_jwt, get_jwt_identity, verify_jwt_in_request
 from functools import wraps
-from flask import jsonify
-from ..models import Users
+from collections import namedtuple
+from datetime import datetime, timezone
+from flask import jsonify, current_app
+from sqlalchemy import insert, select, update
+from ..extensions import db
+from ..models import AuthChange, Counter, Users
+from ..utils.cache import TTLCache
+
+# Datos mínimos del usuario necesarios para autorizar una petición
+AuthUser = namedtuple('AuthUser', ['id', 'role', 'is_active'])
+
+# Fila de la tabla counter con la versión de los cambios de rol o estado. Cada
+# cambio la incrementa en su misma transacción; cada worker la compara con la
+# última que vio y, si difiere, relee la tabla auth_change.
+AUTH_VERSION = 'auth_version'
+
+# Caché por proceso de usuarios autenticados (id -> AuthUser)
+_user_cache = TTLCache(ttl=60, maxsize=1024)
+# Última versión leída de la base de datos, se relee cada pocos segundos
+_versions = TTLCache(ttl=1, maxsize=1)
+# Cambios conocidos por este worker: versión e {id: timestamp del cambio}
+_changes = {'version': None, 'changed_at': {}}
+
+
+def _primary(statement):
+    # Siempre en la primaria aunque la petición lea de una réplica: un rol o
+    # un estado atrasados autorizarían lo que ya no se debe
+    return db.session.execute(statement, bind_arguments={'bind': db.engine})
+
+
+def invalidate_user(user_id):
+    """
+    Registra en la transacción de la sesión que cambió el rol o el estado del
+    usuario (o que se borró). Al confirmarla ningún worker confía ya en los
+    tokens emitidos antes ni en su caché. Llamar antes del commit.
+    """
+    user_id = int(user_id)
+    now = datetime.utcnow()
+    changes = AuthChange.__table__
+    result = db.session.execute(
+        update(changes).where(changes.c.user_id == user_id).values(changed_at=now)
+    )
+    if result.rowcount == 0:
+        db.session.execute(insert(changes).values(user_id=user_id, changed_at=now))
+
+    counters = Counter.__table__
+    result = db.session.execute(
+        update(counters)
+        .where(counters.c.name == AUTH_VERSION)
+        .values(value=counters.c.value + 1, updated_at=now)
+    )
+    if result.rowcount == 0:
+        db.session.execute(insert(counters).values(name=AUTH_VERSION, value=1))
+
+    _user_cache.delete(user_id)
+    # Este worker relee la versión en la próxima petición
+    _versions.delete(AUTH_VERSION)
+
+
+def _refresh_changes():
+    """
+    Relee los cambios si la versión cambió (la versión se consulta como mucho
+    una vez por intervalo) y descarta de la caché los usuarios afectados.
+    Solo importan los cambios posteriores al token más antiguo aún válido.
+    """
+    version = _versions.get(AUTH_VERSION)
+    if version is None:
+        version = _primary(select(Counter.value).where(Counter.name == AUTH_VERSION)).scalar() or 0
+        _versions.set(AUTH_VERSION, version,
+                      ttl=current_app.config.get('AUTH_VERSION_CHECK_SECONDS'))
+    if version == _changes['version']:
+        return
+
+    query = select(AuthChange.user_id, AuthChange.changed_at)
+    expires = current_app.config.get('JWT_ACCESS_TOKEN_EXPIRES')
+    if expires:
+        query = query.where(AuthChange.changed_at > datetime.utcnow() - expires)
+    changed_at = {
+        row.user_id: row.changed_at.replace(tzinfo=timezone.utc).timestamp()
+        for row in _primary(query)
+    }
+    known = _changes['changed_at']
+    for user_id, timestamp in changed_at.items():
+        if known.get(user_id) != timestamp:
+            _user_cache.delete(user_id)
+    _changes.update(version=version, changed_at=changed_at)
+
+
+def _load_user(user_id):
+    user = _user_cache.get(user_id)
+    if user is None:
+        row = _primary(
+            select(Users.id, Users.role, Users.is_active).where(Users.id == user_id)
+        ).first()
+        if row is None:
+            return None
+        user = AuthUser(row.id, row.role, row.is_active)
+        _user_cache.set(user_id, user, ttl=current_app.config.get('AUTH_USER_CACHE_TTL'))
+    return user
+
+
+def get_current_user():
+    """
+    Usuario de la petición actual para las comprobaciones de rol.
+    Con AUTH_TRUST_JWT_CLAIMS se usan el rol y el estado firmados en el token
+    sin consultar la base de datos, salvo que el usuario haya cambiado después
+    de emitirlo. En otro caso se lee de la caché por proceso (con TTL) o de la
+    base de datos primaria.
+    """
+    user_id = int(get_jwt_identity())
+    _refresh_changes()
+    if current_app.config.get('AUTH_TRUST_JWT_CLAIMS'):
+        claims = get_jwt()
+        changed_at = _changes['changed_at'].get(user_id)
+        if ('role' in claims and 'is_active' in claims
+                and (changed_at is None or claims.get('iat', 0) > changed_at)):
+            return AuthUser(user_id, claims['role'], claims['is_active'])
+    return _load_user(user_id)
+
+
+def _resource_id(kwargs, id_arg):
+    if id_arg is not None:
+        return kwargs.get(id_arg)
+    return kwargs.get('id') or kwargs.get('user_id') or kwargs.get('blog_id')
+
 
 def roles_required(*roles):
     """
@@ -12,9 +135,8 @@ def roles_required(*roles):
         @wraps(fn)
         def decorator(*args, **kwargs):
             verify_jwt_in_request()
-            user_id = get_jwt_identity()
-            user = Users.query.get(user_id)
-            if user and user.role in roles:
+            user = get_current_user()
+            if user and user.is_active and user.role in roles:
                 return fn(*args, **kwargs)
             return jsonify(message=f"Access restricted to {', '.join(roles)}"), 403
         return decorator
@@ -25,9 +147,8 @@ def admin_required():
         @wraps(fn)
         def decorator(*args, **kwargs):
             verify_jwt_in_request()
-            user_id = get_jwt_identity()
-            user = Users.query.get(user_id)
-            if user and user.role == 'admin':
+            user = get_current_user()
+            if user and user.is_active and user.role == 'admin':
                 return fn(*args, **kwargs)
             return jsonify(message="Admins only!"), 403
         return decorator
@@ -38,28 +159,29 @@ def moderator_required():
         @wraps(fn)
         def decorator(*args, **kwargs):
             verify_jwt_in_request()
-            user_id = get_jwt_identity()
-            user = Users.query.get(user_id)
-            if user and user.role in ['admin', 'moderator']:
+            user = get_current_user()
+            if user and user.is_active and user.role in ['admin', 'moderator']:
                 return fn(*args, **kwargs)
             return jsonify(message="Moderators and admins only!"), 403
         return decorator
     return wrapper
 
-def owner_required(model):
+def owner_required(model, id_arg=None):
     """
-    Decorador que verifica si el usuario es el propietario del recurso
-    Uso: @owner_required(Post)
+    Decorador que verifica si el usuario es el propietario del recurso.
+    id_arg es el argumento de la vista con el id del recurso.
+    Uso: @owner_required(Post, 'post_id')
     """
     def wrapper(fn):
         @wraps(fn)
         def decorator(*args, **kwargs):
             verify_jwt_in_request()
-            user_id = get_jwt_identity()
-            user = Users.query.get(user_id)
+            user = get_current_user()
+            if not user or not user.is_active:
+                return jsonify(message="You don't have permission to access this resource"), 403
             
             # Obtener el ID del recurso de los argumentos
-            resource_id = kwargs.get('id') or kwargs.get('user_id') or kwargs.get('blog_id')
+            resource_id = _resource_id(kwargs, id_arg)
             if not resource_id:
                 return jsonify(message="Resource ID not found"), 400
                 
@@ -75,24 +197,25 @@ def owner_required(model):
         return decorator
     return wrapper
 
-def is_owner_or_admin(model):
+def is_owner_or_admin(model, id_arg=None):
     """
     Decorador que verifica si el usuario es el propietario del recurso o es admin
-    Uso: @is_owner_or_admin(Post)
+    Uso: @is_owner_or_admin(Post, 'post_id')
     """
     def wrapper(fn):
         @wraps(fn)
         def decorator(*args, **kwargs):
             verify_jwt_in_request()
-            user_id = get_jwt_identity()
-            user = Users.query.get(user_id)
+            user = get_current_user()
+            if not user or not user.is_active:
+                return jsonify(message="You don't have permission to access this resource"), 403
             
             # Los admins siempre tienen acceso
             if user.role == 'admin':
                 return fn(*args, **kwargs)
             
             # Obtener el ID del recurso de los argumentos
-            resource_id = kwargs.get('id') or kwargs.get('user_id') or kwargs.get('blog_id')
+            resource_id = _resource_id(kwargs, id_arg)
             if not resource_id:
                 return jsonify(message="Resource ID not found"), 400
                 
@@ -106,4 +229,4 @@ def is_owner_or_admin(model):
                 return fn(*args, **kwargs)
             return jsonify(message="You don't have permission to access this resource"), 403
         return decorator
-    return wrapper
\ No newline at end of file
+    return wrapper
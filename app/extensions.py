@@ -2,9 +2,14 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_marshmallow import Marshmallow
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
+from flask_migrate import Migrate
+from .utils.routing import RoutingSession
+from .utils.async_db import AsyncDatabase
 
 # Crear instancias de las extensiones
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 ma = Marshmallow()
 jwt = JWTManager()
-cors = CORS()
\ No newline at end of file
+cors = CORS()
+migrate = Migrate()
+async_db = AsyncDatabase()
\ No newline at end of file
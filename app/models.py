@@ -1,7 +1,7 @@
 from .extensions import db
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
+from .utils.hashing import hash_password, verify_password, needs_rehash
 
 
 class UserCredentials(db.Model):
@@ -19,13 +19,23 @@ class UserCredentials(db.Model):
     user = db.relationship('Users', backref=db.backref('credentials', uselist=False))
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
+
+    def needs_rehash(self):
+        return needs_rehash(self.password_hash)
 
 
 class Users(db.Model, UserMixin):
+    __table_args__ = (
+        # Listado paginado por (created_at, id) y filtro de usuarios activos
+        db.Index('ix_users_created_at_id', 'created_at', 'id'),
+        db.Index('ix_users_is_active', 'is_active'),
+        db.Index('ix_users_updated_at', 'updated_at'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
@@ -56,6 +66,17 @@ class Users(db.Model, UserMixin):
 
 
 class Blogs(db.Model):
+    __table_args__ = (
+        # Índice de texto completo para /api/posts/search (en SQLite se usa FTS5)
+        db.Index('ix_blogs_fulltext', 'title', 'content', mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
+        # Listados paginados por (created_at, id), globales, por autor y por categoría
+        db.Index('ix_blogs_created_at_id', 'created_at', 'id'),
+        db.Index('ix_blogs_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+        db.Index('ix_blogs_category_id_created_at_id', 'category_id', 'created_at', 'id'),
+        # max(updated_at) para los ETag de la colección
+        db.Index('ix_blogs_updated_at', 'updated_at'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(100), nullable=False)
     content = db.Column(db.Text, nullable=False)
@@ -69,11 +90,22 @@ class Blogs(db.Model):
 
 
 class Comment(db.Model):
+    __table_args__ = (
+        # Comentarios de un post en orden cronológico y sus ETag
+        db.Index('ix_comment_post_id_created_at_id', 'post_id', 'created_at', 'id'),
+        db.Index('ix_comment_post_id_updated_at', 'post_id', 'updated_at'),
+        # Comentarios de un autor por rango de fechas y respuestas de un comentario
+        db.Index('ix_comment_user_id_created_at', 'user_id', 'created_at'),
+        db.Index('ix_comment_parent_id', 'parent_id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     content = db.Column(db.Text, nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     post_id = db.Column(db.Integer, db.ForeignKey('blogs.id'), nullable=False)
     parent_id = db.Column(db.Integer, db.ForeignKey('comment.id'), nullable=True)
+    # Path materializado ('00000001/00000007/') para leer un subárbol con un rango del índice
+    path = db.Column(db.String(255), index=True)
     is_approved = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -90,4 +122,50 @@ class Category(db.Model):
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relaciones
-    posts = db.relationship('Blogs', backref='category', lazy=True)
\ No newline at end of file
+    posts = db.relationship('Blogs', backref='category', lazy=True)
+
+
+class CategoryTopPost(db.Model):
+    """
+    Últimos posts de cada categoría (como mucho CATEGORY_TOP_POSTS por
+    categoría), mantenidos al escribir posts (ver app/utils/category_top.py)
+    """
+    __table_args__ = (
+        db.Index('ix_category_top_post_category_id_created_at', 'category_id', 'created_at', 'post_id'),
+        db.Index('ix_category_top_post_post_id', 'post_id'),
+    )
+
+    category_id = db.Column(db.Integer, db.ForeignKey('category.id', ondelete='CASCADE'), primary_key=True)
+    post_id = db.Column(db.Integer, db.ForeignKey('blogs.id', ondelete='CASCADE'), primary_key=True)
+    created_at = db.Column(db.DateTime, nullable=False)
+
+
+class Counter(db.Model):
+    """
+    Contadores mantenidos de forma incremental en la misma transacción que
+    los cambios que cuentan (ver app/utils/counters.py)
+    """
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class AuthChange(db.Model):
+    """
+    Último cambio de rol o estado (o borrado) de cada usuario, compartido por
+    todos los workers (ver app/decorators/auth.py). Sin clave foránea: la
+    fila sobrevive al borrado del usuario.
+    """
+    __table_args__ = (
+        db.Index('ix_auth_change_changed_at', 'changed_at'),
+    )
+
+    user_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    changed_at = db.Column(db.DateTime, nullable=False)
+
+
+class StatsRollup(db.Model):
+    """Agregados precalculados (ver app/utils/rollups.py)"""
+    name = db.Column(db.String(50), primary_key=True)
+    payload = db.Column(db.JSON, nullable=False)
+    computed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
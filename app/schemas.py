@@ -1,4 +1,4 @@
-from marshmallow import Schema, fields, validates, ValidationError
+from marshmallow import Schema, fields, validates, validates_schema, validate, ValidationError
 from .extensions import ma
 from .models import Users, UserCredentials, Blogs, Comment, Category
 
@@ -24,6 +24,11 @@ class UserSchema(ma.SQLAlchemySchema):
     updated_at = fields.DateTime(dump_only=True)
 
 class UserRegisterSchema(UserSchema):
+    class Meta:
+        model = Users
+        # El registro crea el usuario y sus credenciales a partir del dict
+        load_instance = False
+
     password = fields.Str(load_only=True, required=True)
 
 class BlogSchema(ma.SQLAlchemySchema):
@@ -57,7 +62,7 @@ class CommentSchema(ma.SQLAlchemySchema):
     
     # Campos anidados
     author = fields.Nested(UserSchema(only=('id', 'username')), dump_only=True)
-    replies = fields.Nested('self', many=True, dump_only=True)
+    replies = fields.Nested(lambda: CommentSchema(), many=True, dump_only=True)
 
 class CategorySchema(ma.SQLAlchemySchema):
     class Meta:
@@ -67,4 +72,46 @@ class CategorySchema(ma.SQLAlchemySchema):
     name = fields.Str(required=True)
     description = fields.Str()
     created_at = fields.DateTime(dump_only=True)
-    updated_at = fields.DateTime(dump_only=True)
\ No newline at end of file
+    updated_at = fields.DateTime(dump_only=True)
+
+class BlogImportSchema(ma.SQLAlchemySchema):
+    """Registro de la importación masiva de posts (una línea NDJSON)"""
+    class Meta:
+        model = Blogs
+
+    title = fields.Str(required=True, validate=validate.Length(min=1, max=100))
+    content = fields.Str(required=True)
+    user_id = fields.Int(required=True)
+    category_id = fields.Int(allow_none=True)
+    created_at = fields.DateTime()
+    updated_at = fields.DateTime()
+
+class CommentImportSchema(ma.SQLAlchemySchema):
+    """Registro de la importación masiva de comentarios (una línea NDJSON)"""
+    class Meta:
+        model = Comment
+
+    # id en el sistema de origen: no se conserva, resuelve el parent_id de sus respuestas
+    id = fields.Int()
+    content = fields.Str(required=True)
+    user_id = fields.Int(required=True)
+    post_id = fields.Int(required=True)
+    parent_id = fields.Int(allow_none=True)
+    is_approved = fields.Bool()
+    created_at = fields.DateTime()
+    updated_at = fields.DateTime()
+
+class CommentModerationSchema(Schema):
+    """Moderación masiva: lista de ids o filtro por autor/post y rango de fechas"""
+    action = fields.Str(required=True, validate=validate.OneOf(['approve', 'reject', 'delete']))
+    ids = fields.List(fields.Int(), validate=validate.Length(min=1, max=10000))
+    user_id = fields.Int()
+    post_id = fields.Int()
+    since = fields.DateTime()
+    until = fields.DateTime()
+
+    @validates_schema
+    def validate_target(self, data, **kwargs):
+        # Sin ids ni autor/post el filtro abarcaría todos los comentarios
+        if 'ids' not in data and 'user_id' not in data and 'post_id' not in data:
+            raise ValidationError('Provide ids or a user_id/post_id filter')
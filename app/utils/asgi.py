@@ -0,0 +1,40 @@
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+
+# Cuerpo síncrono de WsgiToAsgiInstance.run_wsgi_app: asgiref lo decora con
+# sync_to_async y su thread_sensitive=True por defecto, que ejecuta todas las
+# peticiones del proceso una detrás de otra en un único hilo compartido
+_run_wsgi_app = inspect.unwrap(WsgiToAsgiInstance.__dict__['run_wsgi_app'])
+
+
+class _PooledInstance(WsgiToAsgiInstance):
+    def __init__(self, wsgi_application, executor):
+        super().__init__(wsgi_application)
+        self.executor = executor
+
+    async def run_wsgi_app(self, body):
+        run = sync_to_async(_run_wsgi_app, thread_sensitive=False, executor=self.executor)
+        await run(self, body)
+
+
+class PooledWsgiToAsgi(WsgiToAsgi):
+    """
+    Adaptador WSGI -> ASGI que atiende cada petición en un hilo de un pool
+    propio. Así una vista async que espera a la base de datos (AsyncDatabase.run)
+    solo bloquea su hilo y el proceso mantiene hasta max_workers peticiones en
+    curso a la vez.
+    """
+
+    def __init__(self, wsgi_application, max_workers):
+        super().__init__(wsgi_application)
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix='asgi')
+
+    async def __call__(self, scope, receive, send):
+        await _PooledInstance(self.wsgi_application, self.executor)(scope, receive, send)
+
+
+def asgi_application(app):
+    """Aplicación ASGI de asgi.py para app, con ASGI_THREADS hilos"""
+    return PooledWsgiToAsgi(app, app.config['ASGI_THREADS'])
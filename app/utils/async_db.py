@@ -0,0 +1,100 @@
+import asyncio
+import os
+import threading
+from functools import wraps
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+# Driver async equivalente al driver síncrono de cada backend
+ASYNC_DRIVERS = {
+    'mysql': 'mysql+aiomysql',
+    'sqlite': 'sqlite+aiosqlite',
+}
+
+
+def async_database_url(uri):
+    """URI de SQLALCHEMY_DATABASE_URI con el driver async correspondiente"""
+    url = make_url(uri)
+    drivername = ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)
+    return url.set(drivername=drivername)
+
+
+class AsyncDatabase:
+    """
+    Engine async de SQLAlchemy con un event loop propio en un hilo por proceso.
+    Las vistas async se ejecutan en ese loop, así un mismo proceso mantiene
+    muchas consultas en curso a la vez sobre un único pool de conexiones
+    (aiomysql en producción, aiosqlite en tests).
+    El loop y el engine se crean en el primer uso de cada proceso, de modo que
+    los workers creados con fork no heredan los del proceso maestro.
+    """
+
+    def __init__(self):
+        self.url = None
+        self.engine_options = {}
+        self._lock = threading.Lock()
+        self._pid = None
+        self._loop = None
+        self._engine = None
+        self._sessionmaker = None
+
+    def init_app(self, app):
+        self.url = app.config.get('ASYNC_DATABASE_URL') or async_database_url(
+            app.config['SQLALCHEMY_DATABASE_URI']
+        )
+        self.engine_options = app.config.get('ASYNC_ENGINE_OPTIONS', {})
+        app.extensions['async_db'] = self
+        # Flask ejecuta las vistas async con async_to_sync: las llevamos a nuestro loop
+        app.async_to_sync = self.async_to_sync
+
+    def _start(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name='async-db', daemon=True)
+            thread.start()
+            self._loop = loop
+            self._engine = create_async_engine(self.url, **self.engine_options)
+            self._sessionmaker = async_sessionmaker(self._engine, expire_on_commit=False)
+            self._pid = os.getpid()
+
+    @property
+    def engine(self):
+        if self._pid != os.getpid():
+            self._start()
+        return self._engine
+
+    def session(self):
+        """Nueva AsyncSession (usar con async with)"""
+        if self._pid != os.getpid():
+            self._start()
+        return self._sessionmaker()
+
+    async def run_sync(self, fn, *args, **kwargs):
+        """
+        Ejecuta fn(session, ...) con la Session síncrona de una AsyncSession.
+        Cada consulta dentro de fn espera en el loop sin bloquearlo, y permite
+        reutilizar la paginación, los cargadores y los validadores existentes.
+        """
+        async with self.session() as session:
+            return await session.run_sync(fn, *args, **kwargs)
+
+    def run(self, coro):
+        """Ejecuta la corrutina en el loop del proceso y espera su resultado"""
+        if self._pid != os.getpid():
+            self._start()
+        # run_coroutine_threadsafe copia los contextvars del hilo que llama,
+        # así request, g y current_app siguen disponibles dentro de la vista
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def async_to_sync(self, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.run(func(*args, **kwargs))
+        return wrapper
+
+    def dispose(self):
+        """Cierra las conexiones del pool (p. ej. al terminar un benchmark)"""
+        if self._pid == os.getpid():
+            self.run(self._engine.dispose())
@@ -0,0 +1,215 @@
+import json
+from datetime import datetime
+from marshmallow import ValidationError
+from sqlalchemy import func, insert, select
+from ..extensions import db
+from ..models import Users, Blogs, Comment, Category
+from ..schemas import BlogImportSchema, CommentImportSchema
+from . import counters, search, category_top
+from .threads import rebuild_paths
+
+
+def _existing_ids(column, ids):
+    ids = {value for value in ids if value is not None}
+    if not ids:
+        return set()
+    return set(db.session.scalars(select(column).where(column.in_(ids))))
+
+
+def _insert_returning_ids(connection, table, rows):
+    """Inserta las filas con un INSERT masivo y devuelve sus ids en el mismo orden"""
+    if connection.dialect.insert_executemany_returning_sort_by_parameter_order:
+        return connection.execute(
+            insert(table).returning(table.c.id, sort_by_parameter_order=True), rows
+        ).scalars().all()
+    # Sin RETURNING (MySQL): los ids de un INSERT de varias filas son
+    # consecutivos y en orden salvo importaciones concurrentes en la tabla
+    first_id = connection.scalar(select(func.coalesce(func.max(table.c.id), 0)))
+    connection.execute(insert(table), rows)
+    return connection.scalars(
+        select(table.c.id).where(table.c.id > first_id).order_by(table.c.id).limit(len(rows))
+    ).all()
+
+
+def _check_references(chunk, references):
+    """
+    Comprueba las claves foráneas del bloque con una consulta IN por columna
+    y separa las líneas que apuntan a filas inexistentes.
+    """
+    valid, errors = [], []
+    existing = {
+        key: _existing_ids(column, (row[key] for _, row in chunk))
+        for key, column in references.items()
+    }
+    for line, row in chunk:
+        missing = {
+            key: ['Not found']
+            for key in references
+            if row.get(key) is not None and row[key] not in existing[key]
+        }
+        if missing:
+            errors.append({'line': line, 'errors': missing})
+        else:
+            valid.append((line, row))
+    return valid, errors
+
+
+class Importer:
+    schema_class = None
+    model = None
+    references = {}
+    defaults = {}
+
+    def normalize(self, row):
+        # executemany necesita las mismas columnas en todas las filas
+        now = datetime.utcnow()
+        row = {**self.defaults, **row}
+        row.setdefault('created_at', now)
+        row.setdefault('updated_at', row['created_at'])
+        return row
+
+    def after_chunk(self, connection, first_id, rows):
+        """Lo que harían los eventos del ORM, que los INSERT masivos no disparan"""
+
+    def insert_chunk(self, chunk):
+        valid, errors = _check_references(chunk, self.references)
+        if not valid:
+            return 0, errors
+
+        rows = [row for _, row in valid]
+        try:
+            connection = db.session.connection()
+            table = self.model.__table__
+            first_id = db.session.scalar(select(func.coalesce(func.max(table.c.id), 0)))
+            db.session.execute(insert(table), rows)
+            self.after_chunk(connection, first_id, rows)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            errors.extend({'line': line, 'errors': {'_chunk': [str(e)]}} for line, _ in valid)
+            return 0, errors
+        return len(rows), errors
+
+    def run(self, lines, chunk_size):
+        """
+        Valida e inserta un flujo NDJSON por bloques de chunk_size líneas,
+        cada bloque en su propia transacción. Devuelve el resultado por línea.
+        """
+        schema = self.schema_class()
+        result = {'inserted': 0, 'failed': 0, 'errors': []}
+        chunk = []
+
+        def flush():
+            inserted, errors = self.insert_chunk(chunk)
+            result['inserted'] += inserted
+            result['failed'] += len(errors)
+            result['errors'].extend(errors)
+            chunk.clear()
+
+        for line, raw in enumerate(lines, 1):
+            if isinstance(raw, bytes):
+                raw = raw.decode('utf-8', errors='replace')
+            if not raw.strip():
+                continue
+            try:
+                chunk.append((line, self.normalize(schema.load(json.loads(raw)))))
+            except ValueError:
+                result['failed'] += 1
+                result['errors'].append({'line': line, 'errors': {'_json': ['Invalid JSON']}})
+                continue
+            except ValidationError as err:
+                result['failed'] += 1
+                result['errors'].append({'line': line, 'errors': err.messages})
+                continue
+            if len(chunk) >= chunk_size:
+                flush()
+        if chunk:
+            flush()
+        result['errors'].sort(key=lambda error: error['line'])
+        return result
+
+
+class PostImporter(Importer):
+    schema_class = BlogImportSchema
+    model = Blogs
+    references = {'user_id': Users.id, 'category_id': Category.id}
+    defaults = {'category_id': None}
+
+    def after_chunk(self, connection, first_id, rows):
+        counters.increment(connection, counters.TOTAL_POSTS, len(rows))
+        backend = search.get_backend(connection)
+        if backend is not None:
+            backend.reindex_from(connection, first_id)
+        category_top.rebuild_top_posts({row['category_id'] for row in rows})
+
+
+class CommentImporter(Importer):
+    """
+    Las líneas pueden traer el id de origen del comentario. Su parent_id se
+    busca primero entre los ids de origen ya importados en este flujo (el
+    padre debe ir antes que sus respuestas) y si no, entre los comentarios
+    existentes. Un bloque se inserta por niveles para que cada respuesta
+    conozca el id asignado a su padre.
+    """
+    schema_class = CommentImportSchema
+    model = Comment
+    references = {'user_id': Users.id, 'post_id': Blogs.id}
+    defaults = {'id': None, 'parent_id': None, 'is_approved': True}
+
+    def __init__(self):
+        # id de origen -> id asignado, de los bloques ya confirmados
+        self.source_ids = {}
+
+    def after_chunk(self, connection, first_id, rows):
+        counters.increment(connection, counters.TOTAL_COMMENTS, len(rows))
+        rebuild_paths({row['post_id'] for row in rows})
+
+    def insert_chunk(self, chunk):
+        valid, errors = _check_references(chunk, self.references)
+        pending = [(line, row.pop('id'), row) for line, row in valid]
+        if not pending:
+            return 0, errors
+        existing = _existing_ids(Comment.id, (row['parent_id'] for _, _, row in pending))
+
+        assigned = {}
+        inserted = []
+        try:
+            connection = db.session.connection()
+            while pending:
+                waiting_for = {source_id for _, source_id, _ in pending if source_id is not None}
+                ready, waiting = [], []
+                for entry in pending:
+                    line, _, row = entry
+                    parent_id = row['parent_id']
+                    if parent_id in assigned or parent_id in self.source_ids:
+                        row['parent_id'] = assigned.get(parent_id, self.source_ids.get(parent_id))
+                        ready.append(entry)
+                    elif parent_id in waiting_for:
+                        waiting.append(entry)
+                    elif parent_id is None or parent_id in existing:
+                        ready.append(entry)
+                    else:
+                        errors.append({'line': line, 'errors': {'parent_id': ['Not found']}})
+                if not ready:
+                    # Padres que se referencian entre sí
+                    errors.extend({'line': line, 'errors': {'parent_id': ['Not found']}}
+                                  for line, _, _ in waiting)
+                    pending = []
+                    break
+                rows = [row for _, _, row in ready]
+                ids = _insert_returning_ids(connection, Comment.__table__, rows)
+                for (_, source_id, _), new_id in zip(ready, ids):
+                    if source_id is not None:
+                        assigned[source_id] = new_id
+                inserted.extend(ready)
+                pending = waiting
+
+            if inserted:
+                self.after_chunk(connection, None, [row for _, _, row in inserted])
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            errors.extend({'line': line, 'errors': {'_chunk': [str(e)]}} for line, _, _ in inserted + pending)
+            return 0, errors
+        self.source_ids.update(assigned)
+        return len(inserted), errors
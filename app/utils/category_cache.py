@@ -0,0 +1,94 @@
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import event, insert, select, update
+from ..extensions import db
+from ..models import Counter, Category
+from .cache import TTLCache
+from .conditional import make_etag
+
+# Fila de la tabla counter con la versión de las categorías. Cada escritura la
+# incrementa en su misma transacción; cada worker compara su caché con ella.
+CATEGORY_VERSION = 'category_version'
+
+# Respuestas ya serializadas, indexadas por (clave, versión): al cambiar la
+# versión las entradas antiguas dejan de consultarse y el LRU las descarta
+_responses = TTLCache(ttl=3600, maxsize=256)
+# Última versión leída de la base de datos, se relee cada pocos segundos
+_versions = TTLCache(ttl=1, maxsize=1)
+
+
+class CachedResponse:
+    __slots__ = ('body', 'etag', 'last_modified')
+
+    def __init__(self, body, etag, last_modified):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+def current_version():
+    """Versión de las categorías, leída como mucho una vez por intervalo"""
+    version = _versions.get(CATEGORY_VERSION)
+    if version is None:
+        version = db.session.scalar(
+            select(Counter.value).where(Counter.name == CATEGORY_VERSION)
+        ) or 0
+        _versions.set(CATEGORY_VERSION, version,
+                      ttl=current_app.config.get('CATEGORY_VERSION_CHECK_SECONDS'))
+    return version
+
+
+def bump_version(connection):
+    """Incrementa la versión dentro de la transacción de la conexión"""
+    counters = Counter.__table__
+    result = connection.execute(
+        update(counters)
+        .where(counters.c.name == CATEGORY_VERSION)
+        .values(value=counters.c.value + 1, updated_at=datetime.utcnow())
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(counters).values(name=CATEGORY_VERSION, value=1))
+    # Este worker relee la versión en la próxima petición
+    _versions.delete(CATEGORY_VERSION)
+
+
+def _cached(key, build):
+    version = current_version()
+    response = _responses.get((key, version))
+    if response is None:
+        data, last_modified = build()
+        body = current_app.json.dumps(data) + '\n'
+        etag = make_etag(Category.__tablename__, key, version)
+        response = CachedResponse(body, etag, last_modified)
+        _responses.set((key, version), response)
+    return response
+
+
+def category_list(dump):
+    """Listado completo de categorías serializado con dump(categorías)"""
+    def build():
+        categories = Category.query.order_by(Category.id).all()
+        # Sin Last-Modified: un borrado no cambia max(updated_at), el ETag
+        # (la versión) sí
+        return {'categories': dump(categories)}, None
+    return _cached('list', build)
+
+
+def category_detail(category_id, dump):
+    """Una categoría serializada con dump(categoría); 404 si no existe (no se cachea)"""
+    def build():
+        category = Category.query.get_or_404(category_id)
+        return {'category': dump(category)}, category.updated_at
+    return _cached(category_id, build)
+
+
+def clear():
+    _responses.clear()
+    _versions.clear()
+
+
+@event.listens_for(Category, 'after_insert')
+@event.listens_for(Category, 'after_update')
+@event.listens_for(Category, 'after_delete')
+def _category_changed(mapper, connection, target):
+    bump_version(connection)
@@ -0,0 +1,138 @@
+from flask import current_app, has_app_context
+from sqlalchemy import and_, delete, event, func, insert, or_, select
+from sqlalchemy.orm import attributes
+from ..extensions import db
+from ..models import Blogs, Category, CategoryTopPost
+from .pagination import keyset_query, encode_cursor, MAX_LIMIT
+
+# Una primera página del tamaño máximo más la fila extra que indica si hay
+# página siguiente: así la primera página nunca sale del top
+DEFAULT_TOP_POSTS = MAX_LIMIT + 1
+
+
+def top_size():
+    if has_app_context():
+        return current_app.config.get('CATEGORY_TOP_POSTS', DEFAULT_TOP_POSTS)
+    return DEFAULT_TOP_POSTS
+
+
+def _trim(connection, category_id, size):
+    """Descarta las entradas más antiguas que sobran del top de la categoría"""
+    top = CategoryTopPost.__table__
+    cutoff = connection.execute(
+        select(top.c.created_at, top.c.post_id)
+        .where(top.c.category_id == category_id)
+        .order_by(top.c.created_at.desc(), top.c.post_id.desc())
+        .offset(size).limit(1)
+    ).first()
+    if cutoff is not None:
+        connection.execute(delete(top).where(
+            top.c.category_id == category_id,
+            or_(top.c.created_at < cutoff.created_at,
+                and_(top.c.created_at == cutoff.created_at, top.c.post_id <= cutoff.post_id))
+        ))
+
+
+def refresh_category(connection, category_id, size=None):
+    """Recalcula el top de una categoría desde blogs (por el índice de categoría)"""
+    size = size or top_size()
+    top, blogs = CategoryTopPost.__table__, Blogs.__table__
+    connection.execute(delete(top).where(top.c.category_id == category_id))
+    latest = (
+        select(blogs.c.category_id, blogs.c.id, blogs.c.created_at)
+        .where(blogs.c.category_id == category_id)
+        .order_by(blogs.c.created_at.desc(), blogs.c.id.desc())
+        .limit(size)
+    )
+    connection.execute(insert(top).from_select(['category_id', 'post_id', 'created_at'], latest))
+
+
+def rebuild_top_posts(category_ids=None):
+    """Recalcula el top de las categorías indicadas o de todas (tras cargas masivas)"""
+    connection = db.session.connection()
+    if category_ids is None:
+        category_ids = db.session.scalars(select(Category.id)).all()
+    for category_id in category_ids:
+        if category_id is not None:
+            refresh_category(connection, category_id)
+    return len(category_ids)
+
+
+def category_posts_query(category_id):
+    """Posts del top de la categoría: solo accede a blogs por clave primaria"""
+    return Blogs.query.join(CategoryTopPost, CategoryTopPost.post_id == Blogs.id).filter(
+        CategoryTopPost.category_id == category_id
+    )
+
+
+def paginate_category_posts(category_id, limit, cursor=None, options=()):
+    """
+    Página de posts de la categoría por (created_at, id) descendente.
+    Se sirve del top precalculado; solo si la página sigue más allá de él y
+    la categoría tiene más posts se continúa sobre el índice de blogs.
+    Devuelve (items, next_cursor).
+    """
+    # Orden por las columnas del top: mismos valores y las sirve su índice
+    items = keyset_query(
+        category_posts_query(category_id).options(*options), Blogs, cursor,
+        columns=(CategoryTopPost.created_at, CategoryTopPost.post_id)
+    ).limit(limit + 1).all()
+
+    if len(items) <= limit:
+        # Con menos de top_size() entradas el top contiene toda la categoría
+        in_top = db.session.scalar(
+            select(func.count()).select_from(CategoryTopPost)
+            .where(CategoryTopPost.category_id == category_id)
+        )
+        if in_top >= top_size():
+            after = encode_cursor(items[-1].created_at, items[-1].id) if items else cursor
+            items += keyset_query(
+                Blogs.query.filter_by(category_id=category_id).options(*options), Blogs, after
+            ).limit(limit + 1 - len(items)).all()
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+    return items, next_cursor
+
+
+def _add(connection, category_id, post_id, created_at):
+    connection.execute(insert(CategoryTopPost.__table__).values(
+        category_id=category_id, post_id=post_id, created_at=created_at
+    ))
+    _trim(connection, category_id, top_size())
+
+
+@event.listens_for(Blogs, 'after_insert')
+def _post_inserted(mapper, connection, target):
+    if target.category_id is not None:
+        _add(connection, target.category_id, target.id, target.created_at)
+
+
+@event.listens_for(Blogs, 'after_update')
+def _post_updated(mapper, connection, target):
+    if not (attributes.get_history(target, 'category_id').has_changes()
+            or attributes.get_history(target, 'created_at').has_changes()):
+        return
+    # Categorías en cuyo top estaba el post, más la actual
+    top = CategoryTopPost.__table__
+    affected = set(connection.scalars(
+        select(top.c.category_id).where(top.c.post_id == target.id)
+    ))
+    affected.add(target.category_id)
+    for category_id in affected - {None}:
+        refresh_category(connection, category_id)
+
+
+@event.listens_for(Blogs, 'before_delete')
+def _post_deleting(mapper, connection, target):
+    # Antes del DELETE de blogs para no violar la clave foránea
+    top = CategoryTopPost.__table__
+    connection.execute(delete(top).where(top.c.post_id == target.id))
+
+
+@event.listens_for(Blogs, 'after_delete')
+def _post_deleted(mapper, connection, target):
+    if target.category_id is not None:
+        refresh_category(connection, target.category_id)
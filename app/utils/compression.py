@@ -0,0 +1,123 @@
+import zlib
+from flask import current_app, request
+from .cache import TTLCache
+
+# wbits de zlib por codificación: gzip con cabecera gzip, deflate en formato
+# zlib (lo que HTTP llama 'deflate')
+ENCODINGS = {
+    'gzip': 16 + zlib.MAX_WBITS,
+    'deflate': zlib.MAX_WBITS,
+}
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/x-ndjson',
+    'text/csv',
+    'text/plain',
+}
+
+# Cuerpos ya comprimidos, indexados por (ruta, ETag, codificación): una
+# respuesta con el mismo ETag no se vuelve a comprimir
+_compressed = TTLCache(ttl=3600, maxsize=256)
+
+
+def _negotiate():
+    """Codificación preferida por el cliente según Accept-Encoding, o None"""
+    return request.accept_encodings.best_match(list(ENCODINGS))
+
+
+def compress(data, encoding, level=6):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, ENCODINGS[encoding])
+    return compressor.compress(data) + compressor.flush()
+
+
+def _compressed_body(response, data, encoding, level):
+    etag, _ = response.get_etag()
+    if etag is None:
+        return compress(data, encoding, level)
+    key = (request.path, etag, encoding)
+    cached = _compressed.get(key)
+    # La longitud protege de dos representaciones distintas con el mismo ETag
+    if cached is not None and cached[0] == len(data):
+        return cached[1]
+    body = compress(data, encoding, level)
+    _compressed.set(key, (len(data), body))
+    return body
+
+
+def _compress_stream(iterable, encoding, level):
+    """
+    Comprime un cuerpo generado por partes. Cada parte se vacía con
+    Z_SYNC_FLUSH para que el cliente reciba cada lote según se genera.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, ENCODINGS[encoding])
+    try:
+        for chunk in iterable:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            if chunk:
+                yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+    finally:
+        close = getattr(iterable, 'close', None)
+        if close is not None:
+            close()
+
+
+def _weaken_etag(response):
+    etag, weak = response.get_etag()
+    if etag is not None and not weak:
+        response.set_etag(etag, weak=True)
+
+
+def _compress_response(response):
+    # La representación depende de Accept-Encoding y el cuerpo comprimido no
+    # es idéntico byte a byte: el ETag es débil con y sin compresión, y el 304
+    # lleva el mismo validador y las mismas cabeceras Vary que la respuesta
+    # completa. If-None-Match valida con contains_weak.
+    if response.status_code == 304:
+        response.vary.add('Accept-Encoding')
+        _weaken_etag(response)
+        return response
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    response.vary.add('Accept-Encoding')
+    _weaken_etag(response)
+    if (response.status_code < 200 or response.status_code in (204, 206)
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or response.cache_control.no_transform):
+        return response
+    encoding = _negotiate()
+    if encoding is None:
+        return response
+
+    config = current_app.config
+    level = config.get('COMPRESSION_LEVEL', 6)
+    if response.is_streamed:
+        if not config.get('COMPRESSION_STREAMING', True):
+            return response
+        response.response = _compress_stream(response.response, encoding, level)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < config.get('COMPRESSION_MIN_SIZE', 1024):
+            return response
+        response.set_data(_compressed_body(response, data, encoding, level))
+
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def clear():
+    _compressed.clear()
+
+
+def init_compression(app):
+    """
+    Comprime las respuestas JSON, NDJSON y CSV con gzip o deflate según
+    Accept-Encoding. Los cuerpos menores que COMPRESSION_MIN_SIZE se envían
+    tal cual; las respuestas en streaming (exportaciones) se comprimen por
+    partes y las que llevan ETag se guardan ya comprimidas.
+    """
+    app.after_request(_compress_response)
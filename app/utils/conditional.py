@@ -0,0 +1,91 @@
+import hashlib
+from datetime import timezone
+from flask import current_app, request
+from marshmallow import fields
+from sqlalchemy import func, inspect, select
+
+
+def make_etag(*parts):
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def _request_params():
+    # Los parámetros (limit, cursor...) forman parte de la representación
+    return sorted(request.args.items(multi=True))
+
+
+def embedded_relationships(schema_class):
+    """
+    Relaciones con otras tablas que el esquema serializa anidadas (p. ej. el
+    autor y la categoría de un post): sus cambios también cambian la respuesta.
+    """
+    model = schema_class.opts.model
+    relationships = inspect(model).relationships
+    return [
+        relationships[field.attribute or name]
+        for name, field in schema_class._declared_fields.items()
+        if isinstance(field, fields.Nested) and (field.attribute or name) in relationships
+        and relationships[field.attribute or name].mapper.class_ is not model
+    ]
+
+
+def collection_validators(query, model, *extra, schema=None):
+    """
+    ETag de una colección a partir de max(updated_at) y el número de filas,
+    más max(updated_at) de cada tabla que schema anida: una sola consulta
+    agregada, sin cargar ni serializar filas.
+    No hay Last-Modified: borrar una fila no cambia max(updated_at), así que
+    If-Modified-Since daría 304 tras un borrado; el ETag sí incluye el número
+    de filas.
+    """
+    embedded = [
+        select(func.max(relationship.mapper.class_.updated_at)).scalar_subquery()
+        for relationship in (embedded_relationships(schema) if schema else ())
+    ]
+    versions = query.with_entities(
+        func.max(model.updated_at), func.count(model.id), *embedded
+    ).order_by(None).one()
+    etag = make_etag(model.__tablename__, *versions, _request_params(), *extra)
+    return etag, None
+
+
+def resource_validators(obj, *extra, schema=None):
+    """
+    ETag y Last-Modified de un único recurso y de las filas que schema anida
+    (su autor, su categoría...)
+    """
+    versions = [obj.updated_at]
+    for relationship in (embedded_relationships(schema) if schema else ()):
+        related = getattr(obj, relationship.key)
+        versions.append(related.updated_at if related is not None else None)
+    etag = make_etag(obj.__tablename__, obj.id, *versions, _request_params(), *extra)
+    return etag, max(version for version in versions if version is not None)
+
+
+def is_not_modified(etag, last_modified):
+    if request.if_none_match:
+        # If-None-Match tiene prioridad sobre If-Modified-Since
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified:
+        last_modified = last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def conditional_response(etag, last_modified, build):
+    """
+    Responde 304 sin llamar a build() si el cliente ya tiene esta versión.
+    En otro caso construye la respuesta con build() y le añade los validadores.
+    """
+    if is_not_modified(etag, last_modified):
+        response = current_app.response_class(status=304)
+    else:
+        response = current_app.make_response(build())
+        if response.status_code != 200:
+            return response
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # Obliga a revalidar siempre, el 304 hace que sea barato
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
@@ -0,0 +1,100 @@
+from datetime import datetime
+from sqlalchemy import event, func, select, update
+from sqlalchemy.orm import attributes
+from ..extensions import db
+from ..models import Counter, Users, Blogs, Comment
+
+TOTAL_USERS = 'total_users'
+ACTIVE_USERS = 'active_users'
+TOTAL_POSTS = 'total_posts'
+TOTAL_COMMENTS = 'total_comments'
+
+STATS_COUNTERS = (TOTAL_USERS, ACTIVE_USERS, TOTAL_POSTS, TOTAL_COMMENTS)
+
+
+def increment(connection, name, amount=1):
+    """
+    Suma amount al contador dentro de la transacción de la conexión.
+    Si el contador todavía no existe no se crea: lo inicializa rebuild_counters
+    con el valor exacto, así nunca parte de un valor incompleto.
+    """
+    if not amount:
+        return
+    counters = Counter.__table__
+    connection.execute(
+        update(counters)
+        .where(counters.c.name == name)
+        .values(value=counters.c.value + amount, updated_at=datetime.utcnow())
+    )
+
+
+def get_counters(names=STATS_COUNTERS):
+    """Lee los contadores en una sola consulta por clave primaria"""
+    rows = db.session.execute(
+        select(Counter.name, Counter.value).where(Counter.name.in_(names))
+    ).all()
+    return {row.name: row.value for row in rows}
+
+
+def rebuild_counters():
+    """Recalcula todos los contadores con COUNT(*) para corregir desvíos"""
+    values = {
+        TOTAL_USERS: db.session.scalar(select(func.count(Users.id))),
+        ACTIVE_USERS: db.session.scalar(
+            select(func.count(Users.id)).where(Users.is_active.is_(True))
+        ),
+        TOTAL_POSTS: db.session.scalar(select(func.count(Blogs.id))),
+        TOTAL_COMMENTS: db.session.scalar(select(func.count(Comment.id))),
+    }
+    for name, value in values.items():
+        counter = db.session.get(Counter, name)
+        if counter is None:
+            db.session.add(Counter(name=name, value=value))
+        else:
+            counter.value = value
+    db.session.flush()
+    return values
+
+
+@event.listens_for(Users, 'after_insert')
+def _user_inserted(mapper, connection, target):
+    increment(connection, TOTAL_USERS)
+    if target.is_active:
+        increment(connection, ACTIVE_USERS)
+
+
+@event.listens_for(Users, 'after_delete')
+def _user_deleted(mapper, connection, target):
+    increment(connection, TOTAL_USERS, -1)
+    if target.is_active:
+        increment(connection, ACTIVE_USERS, -1)
+
+
+@event.listens_for(Users, 'after_update')
+def _user_updated(mapper, connection, target):
+    history = attributes.get_history(target, 'is_active')
+    if not history.has_changes():
+        return
+    was_active = bool(history.deleted and history.deleted[0])
+    if bool(target.is_active) != was_active:
+        increment(connection, ACTIVE_USERS, 1 if target.is_active else -1)
+
+
+@event.listens_for(Blogs, 'after_insert')
+def _post_inserted(mapper, connection, target):
+    increment(connection, TOTAL_POSTS)
+
+
+@event.listens_for(Blogs, 'after_delete')
+def _post_deleted(mapper, connection, target):
+    increment(connection, TOTAL_POSTS, -1)
+
+
+@event.listens_for(Comment, 'after_insert')
+def _comment_inserted(mapper, connection, target):
+    increment(connection, TOTAL_COMMENTS)
+
+
+@event.listens_for(Comment, 'after_delete')
+def _comment_deleted(mapper, connection, target):
+    increment(connection, TOTAL_COMMENTS, -1)
@@ -0,0 +1,99 @@
+from datetime import datetime
+from sqlalchemy import func, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.elements import ClauseElement
+from app.extensions import db
+from app.models import Users, Blogs, Comment, CategoryTopPost
+from .pagination import keyset_query, encode_cursor
+from .category_top import category_posts_query
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN de una sentencia, con sus parámetros procesados como en la consulta real"""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain)
+def _compile_explain(element, compiler, **kw):
+    prefix = 'EXPLAIN QUERY PLAN ' if compiler.dialect.name == 'sqlite' else 'EXPLAIN '
+    return prefix + compiler.process(element.statement, **kw)
+
+
+def _hot_queries():
+    """
+    Consultas de los caminos calientes tal y como las generan las vistas,
+    con valores representativos. Cada una debe resolverse con un índice.
+    """
+    cursor = encode_cursor(datetime(2024, 1, 1), 1000)
+    return {
+        'posts.list': keyset_query(Blogs.query, Blogs, cursor).limit(21),
+        'posts.by_user': keyset_query(Blogs.query.filter_by(user_id=1), Blogs, cursor).limit(21),
+        'posts.by_category': keyset_query(Blogs.query.filter_by(category_id=1), Blogs, cursor).limit(21),
+        'categories.top_posts': keyset_query(
+            category_posts_query(1), Blogs, cursor,
+            columns=(CategoryTopPost.created_at, CategoryTopPost.post_id)
+        ).limit(21),
+        'comments.list': keyset_query(
+            Comment.query.filter_by(post_id=1), Comment, cursor, descending=False
+        ).limit(21),
+        'comments.validators': Comment.query.filter_by(post_id=1).with_entities(
+            func.max(Comment.updated_at), func.count(Comment.id)
+        ),
+        'comments.subtree': Comment.query.filter(
+            Comment.post_id == 1,
+            Comment.path >= '00000001/', Comment.path < '000000010'
+        ).order_by(Comment.created_at.asc(), Comment.id.asc()),
+        'comments.replies': Comment.query.filter_by(parent_id=1),
+        'comments.by_user': Comment.query.filter(
+            Comment.user_id == 1, Comment.created_at >= datetime(2024, 1, 1)
+        ),
+        'users.list': keyset_query(Users.query, Users, cursor).limit(21),
+        'users.by_email': Users.query.filter_by(email='user@example.com'),
+        'users.active': select(func.count(Users.id)).where(Users.is_active.is_(True)),
+    }
+
+
+def _full_scans(dialect, rows):
+    """
+    Pasos del plan que recorren una tabla o un índice entero, o que ordenan
+    sin índice. Recorrer un índice completo ('SCAN ... USING INDEX', type
+    'index' en MySQL) también es un recorrido completo.
+    """
+    problems = []
+    for row in rows:
+        row = row._mapping
+        if dialect == 'sqlite':
+            detail = row['detail']
+            if detail.startswith('SCAN ') and detail != 'SCAN CONSTANT ROW':
+                problems.append(detail)
+            elif detail.startswith('USE TEMP B-TREE'):
+                problems.append(detail)
+        else:
+            if row['type'] in ('ALL', 'index'):
+                problems.append(f"full scan on {row['table']}")
+            if 'filesort' in (row['Extra'] or ''):
+                problems.append(f"filesort on {row['table']}")
+    return problems
+
+
+def explain_hot_queries():
+    """
+    Ejecuta EXPLAIN sobre cada consulta caliente.
+    Devuelve {nombre: (plan, problemas)}.
+    """
+    connection = db.session.connection()
+    dialect = connection.dialect.name
+    results = {}
+    for name, query in _hot_queries().items():
+        statement = getattr(query, 'statement', query)
+        rows = connection.execute(Explain(statement)).all()
+        if dialect == 'sqlite':
+            plan = [row._mapping['detail'] for row in rows]
+        else:
+            plan = [dict(row._mapping) for row in rows]
+        results[name] = (plan, _full_scans(dialect, rows))
+    return results
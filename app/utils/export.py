@@ -0,0 +1,68 @@
+import csv
+import io
+import json
+from sqlalchemy import select
+from ..extensions import db
+from ..models import Users, Blogs, Comment
+
+# Columnas exportadas por recurso (nunca credenciales)
+EXPORTS = {
+    'users': (Users, ['id', 'username', 'email', 'role', 'is_active', 'created_at', 'updated_at']),
+    'posts': (Blogs, ['id', 'title', 'content', 'user_id', 'category_id', 'created_at', 'updated_at']),
+    'comments': (Comment, ['id', 'content', 'user_id', 'post_id', 'parent_id', 'is_approved',
+                           'created_at', 'updated_at']),
+}
+
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def _json_value(value):
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+def iter_rows(resource, batch_size=1000):
+    """
+    Filas como tuplas con un cursor del lado del servidor (yield_per): la
+    memoria depende de batch_size, no del tamaño de la tabla.
+    """
+    model, columns = EXPORTS[resource]
+    statement = (
+        select(*(getattr(model, column) for column in columns))
+        .order_by(model.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for partition in db.session.execute(statement).partitions():
+        yield partition
+
+
+def generate_ndjson(resource, batch_size=1000):
+    _, columns = EXPORTS[resource]
+    for rows in iter_rows(resource, batch_size):
+        yield ''.join(
+            json.dumps(dict(zip(columns, map(_json_value, row))), ensure_ascii=False) + '\n'
+            for row in rows
+        )
+
+
+def generate_csv(resource, batch_size=1000):
+    _, columns = EXPORTS[resource]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in iter_rows(resource, batch_size):
+        writer.writerows([_json_value(value) for value in row] for row in rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Solo la cabecera si no había filas
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+GENERATORS = {
+    'ndjson': generate_ndjson,
+    'csv': generate_csv,
+}
@@ -0,0 +1,36 @@
+from flask import request
+
+
+class FieldsetError(ValueError):
+    """?fields= pide campos que el esquema no serializa"""
+
+
+def requested_fields(schema_class):
+    """
+    Campos de ?fields=id,title,author validados contra el esquema, o None si
+    no se pidió proyección. El id se incluye siempre.
+    """
+    value = request.args.get('fields')
+    if not value:
+        return None
+    names = {name.strip() for name in value.split(',') if name.strip()}
+    available = {
+        name for name, field in schema_class._declared_fields.items() if not field.load_only
+    }
+    unknown = names - available
+    if unknown:
+        raise FieldsetError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    if 'id' in available:
+        names.add('id')
+    return tuple(sorted(names))
+
+
+def fieldset_schema(schema_class, many=False):
+    """
+    Esquema proyectado a los campos pedidos. Con only= fijado, apply_loaders
+    y loader_options solo leen de la base de datos esas columnas.
+    """
+    only = requested_fields(schema_class)
+    if only is None:
+        return schema_class(many=many)
+    return schema_class(many=many, only=only)
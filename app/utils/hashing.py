@@ -0,0 +1,137 @@
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from flask import current_app, has_app_context
+from werkzeug.security import generate_password_hash, check_password_hash
+
+DEFAULT_METHOD = 'scrypt'
+
+
+class HashingUnavailable(Exception):
+    """El pool de hashing está saturado o no respondió a tiempo"""
+
+
+_lock = threading.Lock()
+_executor = None
+_executor_pid = None
+_slots = None
+_method_prefixes = {}
+_metrics = {
+    'calls': 0,
+    'rejected': 0,
+    'timeouts': 0,
+    'hash_time_total': 0.0,
+    'hash_time_max': 0.0,
+    'queue_wait_total': 0.0,
+    'queue_wait_max': 0.0,
+}
+
+
+def _config(key, default):
+    if has_app_context():
+        return current_app.config.get(key, default)
+    return default
+
+
+def _timed_call(fn, *args):
+    # Se ejecuta en el proceso del pool: devuelve también cuándo empezó y terminó
+    started = time.time()
+    result = fn(*args)
+    return result, started, time.time()
+
+
+def _get_executor():
+    """Pool por proceso; tras un fork se crea uno nuevo en el hijo"""
+    global _executor, _executor_pid, _slots
+    with _lock:
+        if _executor is None or _executor_pid != os.getpid():
+            workers = _config('PASSWORD_HASH_WORKERS', 2)
+            queue_depth = _config('PASSWORD_HASH_QUEUE_DEPTH', workers * 4)
+            _executor = ProcessPoolExecutor(max_workers=workers)
+            _executor_pid = os.getpid()
+            _slots = threading.BoundedSemaphore(queue_depth)
+        return _executor, _slots
+
+
+def _record(hash_time, queue_wait):
+    with _lock:
+        _metrics['calls'] += 1
+        _metrics['hash_time_total'] += hash_time
+        _metrics['hash_time_max'] = max(_metrics['hash_time_max'], hash_time)
+        _metrics['queue_wait_total'] += queue_wait
+        _metrics['queue_wait_max'] = max(_metrics['queue_wait_max'], queue_wait)
+
+
+def _count(key):
+    with _lock:
+        _metrics[key] += 1
+
+
+def _run(fn, *args):
+    """
+    Ejecuta fn en el pool de procesos. Si ya hay PASSWORD_HASH_QUEUE_DEPTH
+    operaciones en curso se rechaza al instante en lugar de encolar.
+    Con PASSWORD_HASH_WORKERS=0 se ejecuta en el propio hilo (tests).
+    """
+    if not _config('PASSWORD_HASH_WORKERS', 2):
+        result, started, finished = _timed_call(fn, *args)
+        _record(finished - started, 0.0)
+        return result
+
+    executor, slots = _get_executor()
+    if not slots.acquire(blocking=False):
+        _count('rejected')
+        raise HashingUnavailable('Password hashing queue is full')
+
+    submitted = time.time()
+    try:
+        future = executor.submit(_timed_call, fn, *args)
+    except Exception:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+
+    try:
+        result, started, finished = future.result(timeout=_config('PASSWORD_HASH_TIMEOUT', 5))
+    except FutureTimeoutError:
+        _count('timeouts')
+        raise HashingUnavailable('Password hashing timed out')
+    _record(finished - started, max(started - submitted, 0.0))
+    return result
+
+
+def hash_password(password):
+    method = _config('PASSWORD_HASH_METHOD', DEFAULT_METHOD)
+    return _run(generate_password_hash, password, method)
+
+
+def verify_password(password_hash, password):
+    return _run(check_password_hash, password_hash, password)
+
+
+def _method_prefix(method):
+    # Parámetros efectivos del método (p. ej. 'scrypt:32768:8:1'), calculados una vez
+    if method not in _method_prefixes:
+        _method_prefixes[method] = generate_password_hash('', method).split('$', 1)[0]
+    return _method_prefixes[method]
+
+
+def needs_rehash(password_hash):
+    """True si el hash se generó con parámetros distintos a los configurados"""
+    method = _config('PASSWORD_HASH_METHOD', DEFAULT_METHOD)
+    return password_hash.split('$', 1)[0] != _method_prefix(method)
+
+
+def get_metrics():
+    with _lock:
+        calls = _metrics['calls']
+        return {
+            'calls': calls,
+            'rejected': _metrics['rejected'],
+            'timeouts': _metrics['timeouts'],
+            'avg_hash_ms': _metrics['hash_time_total'] / calls * 1000 if calls else 0.0,
+            'max_hash_ms': _metrics['hash_time_max'] * 1000,
+            'avg_queue_wait_ms': _metrics['queue_wait_total'] / calls * 1000 if calls else 0.0,
+            'max_queue_wait_ms': _metrics['queue_wait_max'] * 1000,
+        }
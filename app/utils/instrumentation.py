@@ -0,0 +1,92 @@
+import json
+import logging
+import re
+import time
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from ..extensions import db
+
+slow_query_logger = logging.getLogger('app.slow_queries')
+
+_WHITESPACE = re.compile(r'\s+')
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDERS = re.compile(r'\(\s*(?:\?|%s|:\w+)(?:\s*,\s*(?:\?|%s|:\w+))*\s*\)')
+_VALUES_GROUPS = re.compile(r'(\(\?\))(?:\s*,\s*\(\?\))+')
+
+
+def normalize_sql(statement):
+    """
+    SQL sin literales y con las listas de parámetros colapsadas, para que
+    'IN (?, ?, ?)' e 'IN (?, ?)' cuenten como la misma consulta en el log.
+    """
+    sql = _WHITESPACE.sub(' ', statement).strip()
+    sql = _STRINGS.sub('?', sql)
+    sql = _NUMBERS.sub('?', sql)
+    sql = _PLACEHOLDERS.sub('(?)', sql)
+    return _VALUES_GROUPS.sub(r'\1', sql)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_start'].pop()
+    if not has_request_context():
+        return
+
+    stats = g.setdefault('sql_stats', {'count': 0, 'time': 0.0})
+    stats['count'] += 1
+    stats['time'] += elapsed
+
+    threshold = current_app.config.get('SLOW_QUERY_THRESHOLD_MS', 100)
+    if elapsed * 1000 >= threshold:
+        slow_query_logger.warning(json.dumps({
+            'event': 'slow_query',
+            'endpoint': request.endpoint,
+            'method': request.method,
+            'path': request.path,
+            'duration_ms': round(elapsed * 1000, 2),
+            'sql': normalize_sql(statement),
+        }))
+
+
+def _handle_error(context):
+    # La sentencia falló y no habrá after_cursor_execute: descartar su inicio
+    # para no desplazar el cronómetro de las siguientes de la conexión
+    if context.connection is None:
+        return
+    started = context.connection.info.get('query_start')
+    if started:
+        started.pop()
+
+
+def _start_timer():
+    g.request_started = time.perf_counter()
+
+
+def _add_server_timing(response):
+    stats = g.get('sql_stats', {'count': 0, 'time': 0.0})
+    timings = [f'db;dur={stats["time"] * 1000:.2f};desc="{stats["count"]} queries"']
+    if 'request_started' in g:
+        timings.append(f'app;dur={(time.perf_counter() - g.request_started) * 1000:.2f}')
+    response.headers.add('Server-Timing', ', '.join(timings))
+    return response
+
+
+def init_sql_instrumentation(app):
+    """
+    Cuenta y cronometra las sentencias de cada petición con los eventos de
+    cursor de SQLAlchemy, las expone en la cabecera Server-Timing y registra
+    las que superan SLOW_QUERY_THRESHOLD_MS en el logger 'app.slow_queries'.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+                event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+                event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+                event.listen(engine, 'handle_error', _handle_error)
+
+    app.before_request(_start_timer)
+    app.after_request(_add_server_timing)
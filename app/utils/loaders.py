@@ -0,0 +1,146 @@
+from contextlib import contextmanager
+from marshmallow import fields
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import joinedload, selectinload, load_only
+from ..extensions import db
+
+# Profundidad máxima al seguir esquemas anidados. Las relaciones recursivas
+# (respuestas de comentarios) se cargan completas, ver _loader_options
+MAX_DEPTH = 2
+
+# Columnas que se cargan siempre aunque el esquema no las serialice: las usan
+# el cursor de paginación y los validadores de caché
+ALWAYS_LOADED = ('id', 'created_at', 'updated_at')
+
+
+def _schema_model(schema):
+    return getattr(schema.opts, 'model', None)
+
+
+def _loaded_columns(schema, model):
+    """
+    Columnas a cargar cuando el esquema proyecta con only=: las que serializa,
+    la clave primaria, ALWAYS_LOADED y las claves foráneas de las relaciones
+    anidadas. None si el esquema serializa todo.
+    """
+    if not schema.only:
+        return None
+    mapper = inspect(model)
+    columns = mapper.column_attrs
+    names = {column.key for column in mapper.primary_key}
+    names.update(name for name in ALWAYS_LOADED if name in columns)
+    for name, field in schema.dump_fields.items():
+        attr = field.attribute or name
+        if attr in columns:
+            names.add(attr)
+        elif attr in mapper.relationships:
+            names.update(
+                column.key for column in mapper.relationships[attr].local_columns
+                if column.key in columns
+            )
+    return [getattr(model, name) for name in sorted(names)]
+
+
+def _is_recursive(schema, model, relationship, nested_schema):
+    """Colección del propio modelo serializada con el mismo esquema (un árbol)"""
+    return (relationship.uselist and relationship.mapper.class_ is model
+            and type(nested_schema) is type(schema))
+
+
+def _loader_options(schema, model, parent=None, depth=0, skip=None):
+    options = []
+    if model is None or depth >= MAX_DEPTH:
+        return options
+
+    relationships = inspect(model).relationships
+    for name, field in schema.dump_fields.items():
+        if not isinstance(field, fields.Nested):
+            continue
+        relationship = relationships.get(field.attribute or name)
+        if relationship is None or relationship.key == skip:
+            continue
+
+        attr = getattr(model, relationship.key)
+        nested_schema = field.schema
+        recursive = _is_recursive(schema, model, relationship, nested_schema)
+        # Colecciones con selectinload (una consulta IN), escalares con joinedload.
+        # Un árbol se sigue hasta el último nivel: una consulta por nivel, no
+        # por nodo, y sus opciones anidadas se aplican en cada nivel
+        if relationship.uselist:
+            extra = {'recursion_depth': -1} if recursive else {}
+            loader = parent.selectinload(attr, **extra) if parent else selectinload(attr, **extra)
+        else:
+            loader = parent.joinedload(attr) if parent else joinedload(attr)
+
+        nested_columns = _loaded_columns(nested_schema, relationship.mapper.class_)
+        if nested_columns:
+            loader = loader.load_only(*nested_columns)
+        options.append(loader)
+
+        options.extend(_loader_options(
+            nested_schema, relationship.mapper.class_, loader, depth + 1,
+            skip=relationship.key if recursive else None
+        ))
+    return options
+
+
+def loader_options(schema, skip=None, columns=()):
+    """
+    Estrategias de carga para las relaciones que el esquema va a serializar.
+    Se derivan de los campos Nested del esquema, así una lista de N elementos
+    cuesta un número constante de consultas en lugar de 2N+1. Si el esquema
+    proyecta con only= tampoco se leen las columnas que no va a serializar.
+    skip es una relación que el llamador carga por su cuenta y columns, las
+    columnas que necesita además de las del esquema.
+    """
+    model = _schema_model(schema)
+    options = _loader_options(schema, model, skip=skip)
+    loaded = _loaded_columns(schema, model) if model is not None else None
+    if loaded:
+        options.append(load_only(*loaded, *(getattr(model, name) for name in columns)))
+    return options
+
+
+def apply_loaders(query, schema):
+    """Aplica a la consulta las estrategias de carga del esquema"""
+    options = loader_options(schema)
+    return query.options(*options) if options else query
+
+
+class QueryCounter:
+    """Cuenta las sentencias SQL ejecutadas por el engine"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._on_execute)
+        return False
+
+
+@contextmanager
+def assert_max_queries(limit, engine=None):
+    """
+    Uso en tests:
+        with assert_max_queries(3):
+            client.get('/api/posts')
+    """
+    with QueryCounter(engine or db.engine) as counter:
+        yield counter
+    if counter.count > limit:
+        raise AssertionError(
+            f'Expected at most {limit} queries, got {counter.count}:\n'
+            + '\n'.join(counter.statements)
+        )
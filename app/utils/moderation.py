@@ -0,0 +1,71 @@
+from datetime import datetime
+from sqlalchemy import delete, or_, select, update
+from ..extensions import db
+from ..models import Comment
+from .counters import increment, TOTAL_COMMENTS
+from .threads import rebuild_paths
+
+
+def moderation_condition(data):
+    """Condición WHERE a partir de los datos validados por CommentModerationSchema"""
+    conditions = []
+    if 'ids' in data:
+        conditions.append(Comment.id.in_(data['ids']))
+    if 'user_id' in data:
+        conditions.append(Comment.user_id == data['user_id'])
+    if 'post_id' in data:
+        conditions.append(Comment.post_id == data['post_id'])
+    if 'since' in data:
+        conditions.append(Comment.created_at >= data['since'])
+    if 'until' in data:
+        conditions.append(Comment.created_at < data['until'])
+    return conditions
+
+
+def set_approval(conditions, approved):
+    """
+    UPDATE único de is_approved sobre los comentarios que cumplen la condición.
+    Solo cuenta las filas que cambian de estado.
+    """
+    result = db.session.execute(
+        update(Comment)
+        .where(*conditions)
+        .where(or_(Comment.is_approved.is_(None), Comment.is_approved != approved))
+        .values(is_approved=approved, updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def delete_comments(conditions):
+    """
+    Borra con un DELETE único los comentarios que cumplen la condición.
+    Las respuestas que no se borran pasan a ser comentarios de primer nivel y
+    se recalculan los paths de los posts afectados. Devuelve
+    (borrados, respuestas desvinculadas de un comentario borrado).
+    """
+    post_ids = db.session.scalars(
+        select(Comment.post_id).where(*conditions).distinct()
+    ).all()
+    if not post_ids:
+        return 0, 0
+
+    # Tabla derivada para que MySQL acepte la subconsulta sobre la misma tabla
+    targets = select(Comment.id).where(*conditions).subquery()
+    # Solo las respuestas que sobreviven: las que también se borran no cuentan
+    orphaned = db.session.execute(
+        update(Comment)
+        .where(Comment.parent_id.in_(select(targets.c.id)), ~Comment.id.in_(select(targets.c.id)))
+        .values(parent_id=None, updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    deleted = db.session.execute(
+        delete(Comment).where(*conditions).execution_options(synchronize_session=False)
+    ).rowcount
+
+    # Los DELETE masivos no disparan los eventos del mapper
+    increment(db.session.connection(), TOTAL_COMMENTS, -deleted)
+    if orphaned:
+        rebuild_paths(post_ids)
+    return deleted, orphaned
@@ -0,0 +1,99 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from flask import request
+from sqlalchemy import and_, or_
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+class PaginationError(ValueError):
+    """Error en los parámetros de paginación (limit o cursor inválidos)"""
+
+
+def encode_cursor(created_at, item_id):
+    """Codifica la posición (created_at, id) como un cursor opaco"""
+    raw = json.dumps([created_at.isoformat(), item_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decodifica un cursor generado por encode_cursor"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        # El id tiene que ser un entero JSON que quepa en la columna: con int()
+        # un 1e999 (infinito) lanzaría OverflowError y un 1.5 se truncaría
+        if not isinstance(created_at, str) or type(item_id) is not int or not 0 <= item_id < 2 ** 63:
+            raise ValueError
+        return datetime.fromisoformat(created_at), item_id
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+        raise PaginationError('Invalid cursor')
+
+
+def parse_limit(value, default=DEFAULT_LIMIT, maximum=MAX_LIMIT):
+    if value is None:
+        return default
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise PaginationError('Invalid limit')
+    if limit < 1:
+        raise PaginationError('Invalid limit')
+    return min(limit, maximum)
+
+
+def keyset_query(query, model, cursor=None, descending=True, columns=None):
+    """
+    Filtra a partir de la posición del cursor y ordena por (created_at, id).
+    columns permite usar otras dos columnas con los mismos valores, p. ej. las
+    de una tabla precalculada cuyo índice sirve el orden.
+    """
+    created_at, item_id = columns or (model.created_at, model.id)
+
+    if cursor is not None:
+        last_created_at, last_id = decode_cursor(cursor)
+        # La cota simple sobre created_at es redundante, pero permite recorrer
+        # el índice como un rango en lugar de evaluar el OR fila a fila
+        if descending:
+            query = query.filter(created_at <= last_created_at, or_(
+                created_at < last_created_at,
+                and_(created_at == last_created_at, item_id < last_id)
+            ))
+        else:
+            query = query.filter(created_at >= last_created_at, or_(
+                created_at > last_created_at,
+                and_(created_at == last_created_at, item_id > last_id)
+            ))
+
+    if descending:
+        return query.order_by(created_at.desc(), item_id.desc())
+    return query.order_by(created_at.asc(), item_id.asc())
+
+
+def paginate(query, model, limit=DEFAULT_LIMIT, cursor=None, descending=True):
+    """
+    Paginación por cursor (keyset) sobre (created_at, id).
+    En lugar de OFFSET filtra por la última posición vista, así cada página
+    cuesta lo mismo sin importar su profundidad.
+    Devuelve (items, next_cursor); next_cursor es None en la última página.
+    """
+    query = keyset_query(query, model, cursor, descending)
+
+    # Pedimos un elemento extra para saber si existe una página siguiente
+    items = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        last = items[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return items, next_cursor
+
+
+def paginate_request(query, model, descending=True):
+    """Aplica paginate() con los parámetros ?limit= y ?cursor= de la petición"""
+    limit = parse_limit(request.args.get('limit'))
+    cursor = request.args.get('cursor') or None
+    return paginate(query, model, limit=limit, cursor=cursor, descending=descending)
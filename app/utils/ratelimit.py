@@ -0,0 +1,139 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+from flask import current_app
+from .cache import TTLCache
+
+
+def parse_limit(value):
+    """'capacidad/segundos' -> (capacidad, tokens por segundo). '10/60' = ráfaga de 10, 10 por minuto"""
+    capacity, period = value.split('/')
+    capacity, period = float(capacity), float(period)
+    if capacity <= 0 or period <= 0:
+        raise ValueError(f'Invalid rate limit: {value}')
+    return capacity, capacity / period
+
+
+def _refill(tokens, updated_at, now, capacity, rate):
+    return min(capacity, tokens + max(0.0, now - updated_at) * rate)
+
+
+class MemoryBucketStore:
+    """
+    Token buckets en memoria del proceso. Cada entrada caduca cuando el cubo
+    estaría lleno de nuevo, así la memoria solo crece con los clientes activos.
+    """
+
+    def __init__(self, maxsize=100000):
+        self._buckets = TTLCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, rate, cost=1):
+        """Devuelve (permitido, segundos hasta poder reintentar)"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = _refill(tokens, updated_at, now, capacity, rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets.set(key, (tokens, now), ttl=(capacity - tokens) / rate)
+        return allowed, 0.0 if allowed else (cost - tokens) / rate
+
+    def clear(self):
+        self._buckets.clear()
+
+
+class SQLiteBucketStore:
+    """
+    Token buckets compartidos entre los workers de una máquina en un fichero
+    SQLite. Cada consumo es una transacción BEGIN IMMEDIATE corta.
+    """
+    # Cada cuántos consumos se borran los cubos que ya estarían llenos
+    PRUNE_EVERY = 1000
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._calls = 0
+        self._connection()  # Crea la tabla al configurar, no en la primera petición
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS rate_limit_buckets ('
+                'key TEXT PRIMARY KEY, tokens REAL NOT NULL, '
+                'updated_at REAL NOT NULL, full_at REAL NOT NULL)'
+            )
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def consume(self, key, capacity, rate, cost=1):
+        connection = self._connection()
+        now = time.time()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute(
+                'SELECT tokens, updated_at FROM rate_limit_buckets WHERE key = ?', (key,)
+            ).fetchone()
+            tokens = capacity if row is None else _refill(row[0], row[1], now, capacity, rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            connection.execute(
+                'INSERT OR REPLACE INTO rate_limit_buckets (key, tokens, updated_at, full_at) '
+                'VALUES (?, ?, ?, ?)',
+                (key, tokens, now, now + (capacity - tokens) / rate)
+            )
+            self._calls += 1
+            if self._calls % self.PRUNE_EVERY == 0:
+                connection.execute('DELETE FROM rate_limit_buckets WHERE full_at < ?', (now,))
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        return allowed, 0.0 if allowed else (cost - tokens) / rate
+
+    def clear(self):
+        self._connection().execute('DELETE FROM rate_limit_buckets')
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Almacén configurado en RATE_LIMIT_STORAGE: 'memory' o 'sqlite:///ruta'"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                storage = current_app.config.get('RATE_LIMIT_STORAGE', 'memory')
+                if storage.startswith('sqlite:///'):
+                    _store = SQLiteBucketStore(storage[len('sqlite:///'):])
+                else:
+                    _store = MemoryBucketStore()
+    return _store
+
+
+def reset_store():
+    """Descarta el almacén actual (p. ej. al cambiar RATE_LIMIT_STORAGE en tests)"""
+    global _store
+    with _store_lock:
+        _store = None
+
+
+def hit(key, limit):
+    """Consume un token del cubo key con el límite 'capacidad/segundos'"""
+    capacity, rate = parse_limit(limit)
+    return get_store().consume(key, capacity, rate)
+
+
+def retry_after_header(seconds):
+    return str(max(1, math.ceil(seconds)))
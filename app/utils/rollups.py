@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+from ..extensions import db
+from ..models import StatsRollup, Users, Blogs, Comment
+from .routing import use_primary
+
+DETAILED_STATS = 'detailed_stats'
+
+
+def _average_group_size(column):
+    """
+    AVG sobre una tabla derivada con el COUNT por grupo. Anidar
+    avg(count(...)) en la misma consulta no es SQL válido en MySQL.
+    """
+    per_group = (
+        select(func.count().label('total'))
+        .select_from(column.table)
+        .group_by(column)
+        .subquery()
+    )
+    return float(db.session.scalar(select(func.avg(per_group.c.total))) or 0)
+
+
+def compute_detailed_stats():
+    user_roles = db.session.execute(
+        select(Users.role, func.count(Users.id)).group_by(Users.role)
+    ).all()
+    return {
+        'users_by_role': {role: total for role, total in user_roles},
+        'avg_comments_per_post': _average_group_size(Comment.post_id),
+        'avg_posts_per_user': _average_group_size(Blogs.user_id),
+    }
+
+
+ROLLUPS = {
+    DETAILED_STATS: compute_detailed_stats,
+}
+
+
+def refresh_rollup(name):
+    """Recalcula y guarda un rollup; el commit queda a cargo del llamador"""
+    payload = ROLLUPS[name]()
+    rollup = db.session.get(StatsRollup, name)
+    if rollup is None:
+        rollup = StatsRollup(name=name)
+        db.session.add(rollup)
+    rollup.payload = payload
+    rollup.computed_at = datetime.utcnow()
+    db.session.flush()
+    return rollup
+
+
+def refresh_all():
+    return [refresh_rollup(name) for name in ROLLUPS]
+
+
+def get_rollup(name, max_age=None):
+    """
+    Devuelve el rollup guardado. Si no existe o es más antiguo que max_age
+    segundos se recalcula en el momento (el refresco periódico lo hace
+    'flask refresh-rollups').
+    """
+    rollup = db.session.get(StatsRollup, name)
+    stale = (
+        rollup is not None and max_age is not None
+        and rollup.computed_at < datetime.utcnow() - timedelta(seconds=max_age)
+    )
+    if rollup is None or stale:
+        use_primary()
+        rollup = refresh_rollup(name)
+        db.session.commit()
+    return rollup
@@ -0,0 +1,98 @@
+import math
+import random
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from itsdangerous import BadSignature, TimestampSigner
+from sqlalchemy.sql.dml import UpdateBase
+
+READ_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+REPLICA_PREFIX = 'replica_'
+
+# Marca firmada con el instante de la última escritura del cliente. Viaja en
+# una cookie y en una cabecera (para clientes sin cookies, que la reenvían):
+# mientras no caduque, sus lecturas van a la primaria aunque las atienda otro
+# worker o proceso.
+LAST_WRITE_COOKIE = 'last_write'
+LAST_WRITE_HEADER = 'X-Last-Write'
+
+
+class RoutingSession(Session):
+    """
+    Sesión que envía las lecturas de las peticiones de solo lectura a una
+    réplica y todo lo demás (escrituras, flush, peticiones de escritura)
+    a la primaria.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and not self._flushing and not isinstance(clause, UpdateBase)
+                and has_request_context() and g.get('db_route') == 'replica'):
+            replicas = [
+                engine for key, engine in self._db.engines.items()
+                if key is not None and key.startswith(REPLICA_PREFIX)
+            ]
+            if replicas:
+                return random.choice(replicas)
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def configure_replica_binds(config):
+    """Convierte SQLALCHEMY_READ_REPLICAS (lista de URIs) en binds 'replica_N'"""
+    replicas = config.get('SQLALCHEMY_READ_REPLICAS') or []
+    binds = dict(config.get('SQLALCHEMY_BINDS') or {})
+    for index, uri in enumerate(replicas):
+        binds[f'{REPLICA_PREFIX}{index}'] = uri
+    config['SQLALCHEMY_BINDS'] = binds
+
+
+def _signer():
+    return TimestampSigner(current_app.secret_key, salt='read-your-writes')
+
+
+def _wrote_recently():
+    token = request.headers.get(LAST_WRITE_HEADER) or request.cookies.get(LAST_WRITE_COOKIE)
+    if not token:
+        return False
+    try:
+        _signer().unsign(token, max_age=current_app.config['REPLICA_STICKY_SECONDS'])
+    except BadSignature:
+        # Firma inválida o caducada (SignatureExpired es una BadSignature)
+        return False
+    return True
+
+
+def use_primary():
+    """
+    Envía a la primaria las sentencias que quedan en la petición. Para las
+    lecturas que terminan escribiendo (inicializar contadores, recalcular
+    rollups): lo que leen para calcular la escritura no puede venir de una
+    réplica atrasada.
+    """
+    if has_request_context():
+        g.db_route = 'primary'
+
+
+def _choose_route():
+    if request.method in READ_METHODS and not _wrote_recently():
+        g.db_route = 'replica'
+    else:
+        g.db_route = 'primary'
+
+
+def _remember_write(response):
+    if request.method not in READ_METHODS and response.status_code < 400:
+        sticky = current_app.config['REPLICA_STICKY_SECONDS']
+        token = _signer().sign(b'w').decode()
+        response.headers[LAST_WRITE_HEADER] = token
+        response.set_cookie(
+            LAST_WRITE_COOKIE, token, max_age=math.ceil(sticky),
+            httponly=True, samesite='Lax'
+        )
+    return response
+
+
+def init_read_replicas(app):
+    """Activa el enrutamiento lectura/escritura si hay réplicas configuradas"""
+    if not app.config.get('SQLALCHEMY_READ_REPLICAS'):
+        return
+    app.before_request(_choose_route)
+    app.after_request(_remember_write)
@@ -0,0 +1,170 @@
+import logging
+import re
+import weakref
+from sqlalchemy import DDL, event, text
+from sqlalchemy.orm import attributes
+from ..extensions import db
+from ..models import Blogs
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'blogs_fts'
+
+
+class SearchUnavailable(Exception):
+    """La base de datos no tiene un backend de búsqueda de texto completo"""
+
+
+class SQLiteSearchBackend:
+    """Índice FTS5 en una tabla virtual, sincronizado con eventos de Blogs"""
+
+    def __init__(self):
+        # Engines en los que ya se comprobó que existe la tabla virtual
+        self._ready = weakref.WeakSet()
+
+    def ensure_table(self, connection):
+        """
+        Crea y rellena la tabla virtual en bases de datos anteriores al índice
+        que no pasaron por la migración (create_all solo la crea con blogs).
+        """
+        if connection.engine in self._ready:
+            return
+        exists = connection.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+        ), {'name': FTS_TABLE}).first()
+        if exists is None:
+            logger.warning('Creating missing %s table and indexing existing posts', FTS_TABLE)
+            connection.execute(text(f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(title, content)'))
+            self.reindex_from(connection, 0)
+        self._ready.add(connection.engine)
+
+    def index(self, connection, post_id, title, content):
+        self.remove(connection, post_id)
+        connection.execute(
+            text(f'INSERT INTO {FTS_TABLE} (rowid, title, content) VALUES (:id, :title, :content)'),
+            {'id': post_id, 'title': title, 'content': content}
+        )
+
+    def remove(self, connection, post_id):
+        connection.execute(text(f'DELETE FROM {FTS_TABLE} WHERE rowid = :id'), {'id': post_id})
+
+    def reindex_from(self, connection, min_id=0):
+        connection.execute(text(f'DELETE FROM {FTS_TABLE} WHERE rowid > :id'), {'id': min_id})
+        connection.execute(text(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, content) '
+            'SELECT id, title, content FROM blogs WHERE id > :id'
+        ), {'id': min_id})
+
+    def search(self, connection, terms, limit, offset):
+        # Cada término entre comillas: la entrada del usuario nunca se interpreta
+        # como sintaxis de FTS5. bm25 es menor cuanto más relevante.
+        match = ' '.join('"{}"'.format(term) for term in terms)
+        return connection.execute(text(
+            f'SELECT rowid AS id, -bm25({FTS_TABLE}) AS score FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH :match ORDER BY bm25({FTS_TABLE}), rowid '
+            'LIMIT :limit OFFSET :offset'
+        ), {'match': match, 'limit': limit, 'offset': offset}).all()
+
+
+class MySQLSearchBackend:
+    """Índice FULLTEXT de InnoDB: el propio motor lo mantiene al día"""
+
+    def index(self, connection, post_id, title, content):
+        pass
+
+    def remove(self, connection, post_id):
+        pass
+
+    def reindex_from(self, connection, min_id=0):
+        pass
+
+    def search(self, connection, terms, limit, offset):
+        return connection.execute(text(
+            'SELECT id, MATCH (title, content) AGAINST (:q IN NATURAL LANGUAGE MODE) AS score '
+            'FROM blogs WHERE MATCH (title, content) AGAINST (:q IN NATURAL LANGUAGE MODE) '
+            'ORDER BY score DESC, id LIMIT :limit OFFSET :offset'
+        ), {'q': ' '.join(terms), 'limit': limit, 'offset': offset}).all()
+
+
+_BACKENDS = {
+    'sqlite': SQLiteSearchBackend(),
+    'mysql': MySQLSearchBackend(),
+}
+
+
+# Dialectos sin backend ya avisados en el log
+_unsupported = set()
+
+
+def get_backend(connection):
+    """
+    Backend de búsqueda del dialecto de la conexión, o None si no hay. Se usa
+    dentro de los eventos de Blogs: en otras bases de datos (p. ej. Postgres)
+    los posts se escriben igual, solo que sin indexar.
+    """
+    dialect = connection.dialect.name
+    backend = _BACKENDS.get(dialect)
+    if backend is None:
+        if dialect not in _unsupported:
+            _unsupported.add(dialect)
+            logger.warning('Full-text search not supported on %s; posts will not be indexed', dialect)
+        return None
+    if isinstance(backend, SQLiteSearchBackend):
+        backend.ensure_table(connection)
+    return backend
+
+
+def parse_terms(query):
+    return re.findall(r'\w+', query or '')
+
+
+def search_posts(query, limit, offset=0):
+    """Ids de los posts que coinciden, ordenados por relevancia: [(id, score)]"""
+    terms = parse_terms(query)
+    if not terms:
+        return []
+    connection = db.session.connection()
+    backend = get_backend(connection)
+    if backend is None:
+        raise SearchUnavailable(f'Full-text search not supported on {connection.dialect.name}')
+    return backend.search(connection, terms, limit, offset)
+
+
+def rebuild_index():
+    connection = db.session.connection()
+    backend = get_backend(connection)
+    if backend is None:
+        raise SearchUnavailable(f'Full-text search not supported on {connection.dialect.name}')
+    backend.reindex_from(connection, 0)
+
+
+# Tabla virtual FTS5 creada y eliminada junto con la tabla blogs en SQLite
+event.listen(Blogs.__table__, 'after_create', DDL(
+    f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(title, content)'
+).execute_if(dialect='sqlite'))
+event.listen(Blogs.__table__, 'after_drop', DDL(
+    f'DROP TABLE IF EXISTS {FTS_TABLE}'
+).execute_if(dialect='sqlite'))
+
+
+@event.listens_for(Blogs, 'after_insert')
+def _post_inserted(mapper, connection, target):
+    backend = get_backend(connection)
+    if backend is not None:
+        backend.index(connection, target.id, target.title, target.content)
+
+
+@event.listens_for(Blogs, 'after_update')
+def _post_updated(mapper, connection, target):
+    if (attributes.get_history(target, 'title').has_changes()
+            or attributes.get_history(target, 'content').has_changes()):
+        backend = get_backend(connection)
+        if backend is not None:
+            backend.index(connection, target.id, target.title, target.content)
+
+
+@event.listens_for(Blogs, 'after_delete')
+def _post_deleted(mapper, connection, target):
+    backend = get_backend(connection)
+    if backend is not None:
+        backend.remove(connection, target.id)
@@ -0,0 +1,129 @@
+import json
+import threading
+from marshmallow import fields, missing
+
+_lock = threading.RLock()
+_compiled = {}
+
+
+def _text(value):
+    if isinstance(value, bytes):
+        value = value.decode('utf-8')
+    return str(value)
+
+
+def _schema_key(schema):
+    only = tuple(sorted(schema.only)) if schema.only else None
+    return type(schema), only, tuple(sorted(schema.exclude))
+
+
+def _has_dump_hooks(schema):
+    hooks = getattr(schema, '_hooks', {})
+    return any(hooks.get(tag) for tag in ('pre_dump', 'post_dump'))
+
+
+def _inline(field):
+    """True si el campo se puede volcar con una expresión generada"""
+    if field.dump_default is not missing:
+        return False
+    kind = type(field)
+    if kind is fields.Integer:
+        return not field.as_string
+    if kind is fields.DateTime:
+        return field.format in (None, 'iso')
+    return kind in (fields.String, fields.Email, fields.Boolean, fields.Nested)
+
+
+def _expression(field, index, namespace):
+    """Expresión Python que convierte `v` (distinto de None) como lo haría el campo"""
+    if isinstance(field, fields.Nested):
+        namespace[f'_nested_{index}'] = compile_schema(field.schema)
+        if field.many:
+            return f'[_nested_{index}(item) for item in v]'
+        return f'_nested_{index}(v)'
+    if isinstance(field, fields.Integer):
+        return 'int(v)'
+    if isinstance(field, fields.Boolean):
+        namespace[f'_truthy_{index}'] = field.truthy
+        namespace[f'_falsy_{index}'] = field.falsy
+        return (f'(True if v in _truthy_{index} else False if v in _falsy_{index} '
+                f'else bool(v))')
+    if isinstance(field, fields.DateTime):
+        return 'v.isoformat()'
+    return 'v if v.__class__ is str else _text(v)'
+
+
+def _compile(schema):
+    namespace = {'_missing': missing, '_text': _text, '_get': schema.get_attribute}
+    lines = ['def dump(obj):', '    result = {}']
+
+    for index, (name, field) in enumerate(schema.dump_fields.items()):
+        key = field.data_key if field.data_key is not None else name
+        if not _inline(field):
+            namespace[f'_field_{index}'] = field
+            lines += [
+                f'    v = _field_{index}.serialize({name!r}, obj, accessor=_get)',
+                f'    if v is not _missing: result[{key!r}] = v',
+            ]
+            continue
+        attribute = field.attribute or name
+        if '.' in attribute:
+            lines.append(f'    v = _get(obj, {attribute!r}, _missing)')
+        else:
+            lines.append(f'    v = getattr(obj, {attribute!r}, _missing)')
+        lines += [
+            '    if v is not _missing:',
+            f'        result[{key!r}] = None if v is None else {_expression(field, index, namespace)}',
+        ]
+
+    lines.append('    return result')
+    exec(compile('\n'.join(lines), f'<serializer {type(schema).__name__}>', 'exec'), namespace)
+    return namespace['dump']
+
+
+def compile_schema(schema):
+    """
+    Función especializada que vuelca un objeto igual que schema.dump(obj)
+    (sin many). Se genera una vez por clase de esquema y proyección (only/exclude).
+    """
+    key = _schema_key(schema)
+    with _lock:
+        if key in _compiled:
+            return _compiled[key]
+        if _has_dump_hooks(schema):
+            dump = lambda obj, _schema=schema: _schema.dump(obj, many=False)  # noqa: E731
+            _compiled[key] = dump
+            return dump
+
+        # Referencia provisional para los esquemas recursivos (respuestas de comentarios)
+        compiled = []
+        _compiled[key] = lambda obj: compiled[0](obj)
+        try:
+            compiled.append(_compile(schema))
+        except Exception:
+            del _compiled[key]
+            raise
+        _compiled[key] = compiled[0]
+        return compiled[0]
+
+
+def fast_dump(schema, data):
+    """Equivalente a schema.dump(data) usando el serializador compilado"""
+    dump = compile_schema(schema)
+    if schema.many:
+        return [dump(item) for item in data]
+    return dump(data)
+
+
+def check_parity(schema, data):
+    """
+    Compara la salida de marshmallow con la del serializador compilado.
+    Devuelve la lista de índices cuyos JSON no coinciden byte a byte.
+    """
+    items = data if schema.many else [data]
+    expected = schema.dump(items, many=True)
+    actual = [compile_schema(schema)(item) for item in items]
+    return [
+        index for index, (left, right) in enumerate(zip(expected, actual))
+        if json.dumps(left, sort_keys=True) != json.dumps(right, sort_keys=True)
+    ]
@@ -0,0 +1,150 @@
+from collections import defaultdict
+from sqlalchemy import bindparam, event, select, update
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.attributes import set_committed_value
+from ..extensions import db
+from ..models import Comment
+from .loaders import loader_options
+
+# Cada nivel del path ocupa un id con ceros a la izquierda y un separador
+PATH_SEGMENT = '{:08d}/'
+PATH_MAX_LENGTH = 255
+
+
+def build_path(parent_path, comment_id):
+    """Path materializado del comentario, o None si el hilo es demasiado profundo"""
+    path = parent_path + PATH_SEGMENT.format(comment_id)
+    return path if len(path) <= PATH_MAX_LENGTH else None
+
+
+@event.listens_for(Comment, 'after_insert')
+def _set_comment_path(mapper, connection, target):
+    comments = Comment.__table__
+    parent_path = ''
+    if target.parent_id is not None:
+        parent_path = connection.execute(
+            select(comments.c.path).where(comments.c.id == target.parent_id)
+        ).scalar()
+        if parent_path is None:
+            # Padre sin path (hilo demasiado profundo): el hijo tampoco lo tiene
+            return
+    path = build_path(parent_path, target.id)
+    # El path es derivado: updated_at conserva su valor (sin el onupdate)
+    connection.execute(
+        update(comments).where(comments.c.id == target.id)
+        .values(path=path, updated_at=comments.c.updated_at)
+    )
+    set_committed_value(target, 'path', path)
+
+
+def attach_replies(comments):
+    """
+    Construye el árbol de respuestas en memoria a partir de un índice
+    parent_id -> hijos, sin disparar la carga perezosa de Comment.replies.
+    Devuelve el índice para poder obtener las raíces.
+    """
+    children = defaultdict(list)
+    for comment in comments:
+        children[comment.parent_id].append(comment)
+    for comment in comments:
+        set_committed_value(comment, 'replies', children.get(comment.id, []))
+    return children
+
+
+def thread_options(schema):
+    """
+    Opciones de carga para volcar un árbol con schema (p. ej. el de
+    fieldset_schema). Las respuestas las arma attach_replies y no se cargan
+    como relación. Si se vuelcan, cualquier fila puede acabar serializada con
+    el esquema de las respuestas, que no está proyectado: se usa ese.
+    """
+    replies = schema.dump_fields.get('replies')
+    if replies is not None:
+        schema = replies.schema
+    return loader_options(schema, skip='replies', columns=('parent_id',))
+
+
+def _tree_options(options):
+    return [joinedload(Comment.author)] if options is None else options
+
+
+def _thread_query(post_id, options=None):
+    return Comment.query.filter_by(post_id=post_id).options(
+        *_tree_options(options)
+    ).order_by(Comment.created_at.asc(), Comment.id.asc())
+
+
+def load_thread(post_id, options=None):
+    """
+    Todos los comentarios de un post en una sola consulta, como árbol.
+    options: estrategias de carga (ver thread_options), por defecto con el autor.
+    """
+    comments = _thread_query(post_id, options).all()
+    return attach_replies(comments)[None]
+
+
+def subtree_query(post_id, comment_id):
+    """
+    Consulta de un comentario y todas sus respuestas, o None si el comentario
+    no existe en el post. Si tiene path materializado es un único rango sobre
+    el índice de path; si no, abarca el hilo completo del post.
+    """
+    path = db.session.execute(
+        select(Comment.path).where(Comment.id == comment_id, Comment.post_id == post_id)
+    ).first()
+    if path is None:
+        return None
+
+    query = Comment.query.filter(Comment.post_id == post_id)
+    if path.path:
+        # Rango [prefijo, prefijo sin '/' + '0'): todos los descendientes y nada más
+        query = query.filter(Comment.path >= path.path, Comment.path < path.path[:-1] + '0')
+    return query
+
+
+def load_subtree(query, comment_id, options=None):
+    """Carga el resultado de subtree_query() y devuelve el comentario con su árbol"""
+    comments = query.options(*_tree_options(options)).order_by(
+        Comment.created_at.asc(), Comment.id.asc()
+    ).all()
+    attach_replies(comments)
+    return next((c for c in comments if c.id == comment_id), None)
+
+
+def rebuild_paths(post_ids=None):
+    """
+    Recalcula el path materializado de los comentarios (de todos los posts o
+    solo de los indicados). Útil tras cargas masivas que no disparan eventos.
+    Devuelve el número de comentarios actualizados.
+    """
+    comments = Comment.__table__
+    query = select(comments.c.id, comments.c.parent_id, comments.c.path)
+    if post_ids is not None:
+        query = query.where(comments.c.post_id.in_(post_ids))
+    rows = db.session.execute(query.order_by(comments.c.id)).all()
+
+    # Un padre siempre tiene un id menor que sus respuestas, así que
+    # recorriendo por id su path ya está calculado al llegar a los hijos
+    paths = {}
+    changed = []
+    for row in rows:
+        if row.parent_id is None:
+            parent_path = ''
+        elif row.parent_id in paths:
+            parent_path = paths[row.parent_id]
+        else:
+            parent_path = db.session.execute(
+                select(comments.c.path).where(comments.c.id == row.parent_id)
+            ).scalar()
+        paths[row.id] = build_path(parent_path, row.id) if parent_path is not None else None
+        if paths[row.id] != row.path:
+            changed.append({'comment_id': row.id, 'path': paths[row.id]})
+
+    if changed:
+        # Sin tocar updated_at: p. ej. los comentarios importados conservan el suyo
+        db.session.execute(
+            update(comments).where(comments.c.id == bindparam('comment_id'))
+            .values(updated_at=comments.c.updated_at),
+            changed
+        )
+    return len(changed)
@@ -0,0 +1,142 @@
+from flask import current_app, request
+from sqlalchemy import func, text
+from .cache import TTLCache
+from .pagination import PaginationError
+
+EXACT = 'exact'
+CACHED = 'cached'
+ESTIMATED = 'estimated'
+
+# Totales ya contados, por consulta y parámetros
+_totals = TTLCache(ttl=30, maxsize=4096)
+# Estadísticas de tablas e índices, cambian despacio
+_stats = TTLCache(ttl=300, maxsize=256)
+
+
+def _count_query(query, model):
+    return query.order_by(None).with_entities(func.count(model.id))
+
+
+def exact_total(query, model, by=None):
+    """COUNT sobre la consulta filtrada"""
+    return _count_query(query, model).scalar()
+
+
+def cached_total(query, model, by=None):
+    """COUNT exacto reutilizado durante PAGINATION_COUNT_TTL segundos"""
+    compiled = _count_query(query, model).statement.compile()
+    key = (str(compiled), repr(sorted(compiled.params.items())))
+    total = _totals.get(key)
+    if total is None:
+        total = exact_total(query, model)
+        _totals.set(key, total, ttl=current_app.config.get('PAGINATION_COUNT_TTL'))
+    return total
+
+
+def _sqlite_stats(session, table):
+    # sqlite_stat1 solo existe tras ANALYZE: 'filas media_por_valor ...' por índice
+    exists = session.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+    )).first()
+    if exists is None:
+        return None
+    rows = session.execute(
+        text('SELECT idx, stat FROM sqlite_stat1 WHERE tbl = :table'), {'table': table}
+    ).all()
+    if not rows:
+        return None
+    indexes = {}
+    for idx, stat in rows:
+        numbers = [int(n) for n in stat.split() if n.isdigit()]
+        if idx and len(numbers) > 1:
+            indexes[idx] = numbers[0] / max(numbers[1], 1)
+    return int(rows[0].stat.split()[0]), indexes
+
+
+def _mysql_stats(session, table):
+    # Estimaciones de InnoDB, actualizadas por ANALYZE TABLE y en segundo plano
+    table_rows = session.execute(text(
+        'SELECT TABLE_ROWS FROM information_schema.TABLES '
+        'WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table'
+    ), {'table': table}).scalar()
+    if table_rows is None:
+        return None
+    rows = session.execute(text(
+        'SELECT INDEX_NAME, CARDINALITY FROM information_schema.STATISTICS '
+        'WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND SEQ_IN_INDEX = 1'
+    ), {'table': table}).all()
+    return int(table_rows), {
+        name: cardinality for name, cardinality in rows if cardinality
+    }
+
+
+_STATS_READERS = {
+    'sqlite': _sqlite_stats,
+    'mysql': _mysql_stats,
+}
+
+
+def _table_stats(session, table):
+    """(filas, {índice: valores distintos de su primera columna}) o None"""
+    dialect = session.get_bind().dialect.name
+    key = (dialect, table)
+    stats = _stats.get(key)
+    if stats is None:
+        reader = _STATS_READERS.get(dialect)
+        stats = (reader(session, table) if reader else None) or False
+        _stats.set(key, stats)
+    return stats or None
+
+
+def estimated_total(query, model, by=None):
+    """
+    Estimación a partir de las estadísticas de la tabla: el número de filas o,
+    si la consulta filtra por igualdad en la columna by, las filas divididas
+    entre los valores distintos del índice que empieza por esa columna.
+    None si la base de datos no tiene estadísticas (p. ej. antes de ANALYZE).
+    """
+    table = model.__table__
+    stats = _table_stats(query.session, table.name)
+    if stats is None:
+        return None
+    table_rows, distinct_values = stats
+    if by is None:
+        return table_rows
+    for index in table.indexes:
+        columns = list(index.columns)
+        if columns and columns[0].name == by.name and distinct_values.get(index.name):
+            return round(table_rows / distinct_values[index.name])
+    return None
+
+
+STRATEGIES = {
+    EXACT: exact_total,
+    CACHED: cached_total,
+    ESTIMATED: estimated_total,
+}
+
+
+def count_total(query, model, strategy, by=None):
+    """
+    Total de la colección con la estrategia indicada. Devuelve (total,
+    estrategia usada): si no hay estadísticas para estimar se usa el conteo
+    en caché.
+    """
+    if strategy not in STRATEGIES:
+        raise PaginationError('Invalid count strategy')
+    total = STRATEGIES[strategy](query, model, by)
+    if total is None:
+        strategy = CACHED
+        total = cached_total(query, model)
+    return total, strategy
+
+
+def total_request(query, model, by=None):
+    """
+    Campos total y total_strategy de la respuesta según ?count= o
+    PAGINATION_COUNT_STRATEGY. query es la consulta de la colección sin
+    paginar; by, la columna por la que se filtra (para estimar).
+    """
+    strategy = request.args.get('count') or current_app.config.get('PAGINATION_COUNT_STRATEGY', CACHED)
+    total, strategy = count_total(query, model, strategy, by)
+    return {'total': total, 'total_strategy': strategy}
@@ -0,0 +1,197 @@
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+from flask_jwt_extended import create_access_token
+from marshmallow import Schema
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import configure_mappers
+from ..extensions import db
+from .serializers import compile_schema
+
+logger = logging.getLogger('app.warmup')
+
+# Lecturas más frecuentes: pedirlas una vez compila sus sentencias en la caché
+# del engine, sus serializadores y la configuración perezosa de las vistas
+HOT_PATHS = [
+    '/api/posts?limit=20',
+    '/api/posts/1',
+    '/api/posts/1/comments?limit=20',
+    '/api/users?limit=20',
+    '/api/categories',
+    '/api/categories/1/posts?limit=20',
+]
+
+
+def _timed(fn, *args):
+    started = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - started) * 1000
+
+
+def _schema_classes():
+    from .. import schemas
+    return [
+        value for value in vars(schemas).values()
+        if isinstance(value, type) and issubclass(value, Schema)
+        and value.__module__ == schemas.__name__
+    ]
+
+
+def build_schemas():
+    """Instancia todos los esquemas y compila el serializador de los de modelo"""
+    for schema_class in _schema_classes():
+        schema = schema_class()
+        if getattr(schema.opts, 'model', None) is not None:
+            compile_schema(schema)
+
+
+def hot_requests(app, paths=HOT_PATHS):
+    """
+    Pide cada ruta con un token de administrador. Devuelve
+    {ruta: (estado, ms)}; un 404 por datos ausentes también calienta la vista.
+    """
+    headers = {'Authorization': 'Bearer ' + create_access_token(
+        identity='warmup', additional_claims={'role': 'admin'}
+    )}
+    client = app.test_client()
+    results = {}
+    for path in paths:
+        started = time.perf_counter()
+        response = client.get(path, headers=headers)
+        results[path] = (response.status_code, (time.perf_counter() - started) * 1000)
+    return results
+
+
+def prime_pool(engines):
+    """Abre las conexiones de cada pool a la vez y las devuelve"""
+    for engine in engines:
+        size = engine.pool.size() if hasattr(engine.pool, 'size') else 1
+        connections = []
+        try:
+            for _ in range(size):
+                connections.append(engine.connect())
+        except SQLAlchemyError as e:
+            logger.warning('No se pudo preparar el pool de %s: %s', engine.url, e)
+        finally:
+            for connection in connections:
+                connection.close()
+
+
+def after_fork(app):
+    """
+    Para el hook post_fork del servidor (ver gunicorn.conf.py): descarta sin
+    cerrarlas las conexiones heredadas del maestro y abre el pool del worker.
+    Solo se llama en los workers, no en otros procesos que estos creen (el
+    pool de hashing).
+    """
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        engine.dispose(close=False)
+    prime_pool(engines)
+
+
+def warmup(app, paths=HOT_PATHS, prefork=True):
+    """
+    Calienta la aplicación antes de atender tráfico: configura los mappers,
+    instancia los esquemas, compila los serializadores y las sentencias de
+    las rutas calientes. Con prefork (gunicorn con preload_app) cierra después
+    las conexiones del maestro para que ningún worker las herede; cada worker
+    prepara su pool con after_fork. Sin prefork el pool se prepara en el acto.
+    Devuelve los ms de cada paso.
+    """
+    timings = {}
+    with app.app_context():
+        timings['mappers'] = _timed(configure_mappers)
+        timings['schemas'] = _timed(build_schemas)
+        started = time.perf_counter()
+        for path, (status, _) in hot_requests(app, paths).items():
+            if status >= 500:
+                logger.warning('Calentamiento de %s: estado %s', path, status)
+        timings['requests'] = (time.perf_counter() - started) * 1000
+        engines = list(db.engines.values())
+
+    if prefork:
+        for engine in engines:
+            engine.dispose()
+    else:
+        timings['pool'] = _timed(prime_pool, engines)
+    logger.info('Calentamiento: %s', json.dumps({k: round(v, 1) for k, v in timings.items()}))
+    return timings
+
+
+def _view_module(app, path):
+    adapter = app.url_map.bind('localhost')
+    endpoint, _ = adapter.match(urlsplit(path).path, method='GET')
+    return app.view_functions[endpoint].__module__
+
+
+def profile_requests(app, with_warmup=False, paths=HOT_PATHS):
+    """Primera y segunda petición de cada ruta caliente, con su módulo de vistas"""
+    result = {'warmup_ms': None, 'requests': []}
+    if with_warmup:
+        result['warmup_ms'] = sum(warmup(app, paths, prefork=False).values())
+    with app.app_context():
+        first = hot_requests(app, paths)
+        second = hot_requests(app, paths)
+    for path in paths:
+        result['requests'].append({
+            'path': path,
+            'module': _view_module(app, path),
+            'status': first[path][0],
+            'first_ms': first[path][1],
+            'second_ms': second[path][1],
+        })
+    return result
+
+
+# Se ejecuta en un intérprete nuevo con -X importtime para medir en frío
+_PROFILE_SCRIPT = '''
+import json, sys, time
+started = time.perf_counter()
+from app import create_app
+result = {'import_ms': (time.perf_counter() - started) * 1000}
+started = time.perf_counter()
+app = create_app()
+result['create_app_ms'] = (time.perf_counter() - started) * 1000
+from app.utils.warmup import profile_requests
+result.update(profile_requests(app, with_warmup=sys.argv[1] == '1'))
+print(json.dumps(result))
+'''
+
+# 'import time:  self [us] | cumulative | imported package'
+_IMPORTTIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def parse_importtime(output):
+    """Líneas de -X importtime como [(módulo, propio ms, acumulado ms, profundidad)]"""
+    imports = []
+    for line in output.splitlines():
+        match = _IMPORTTIME.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            imports.append((module, int(self_us) / 1000, int(cumulative_us) / 1000, len(indent) // 2))
+    return imports
+
+
+def profile_startup(with_warmup=False):
+    """
+    Arranca la aplicación en un proceso nuevo y devuelve el tiempo de
+    importación de cada módulo, el de create_app y el de la primera petición
+    de cada ruta caliente.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _PROFILE_SCRIPT, '1' if with_warmup else '0'],
+        cwd=root, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result['imports'] = parse_importtime(completed.stderr)
+    return result
@@ -0,0 +1,126 @@
+from flask import Blueprint, jsonify, abort
+from flask.views import MethodView
+from flask_jwt_extended import jwt_required
+from app.extensions import async_db
+from app.models import Blogs, Comment, Users
+from app.schemas import BlogSchema, CommentSchema, UserSchema
+from app.utils.pagination import paginate_request, PaginationError
+from app.utils.loaders import apply_loaders
+from app.utils.conditional import collection_validators, resource_validators, conditional_response
+from app.utils.serializers import fast_dump
+from app.utils.totals import total_request
+from app.utils.fieldsets import fieldset_schema
+
+# Versiones async de las lecturas más frecuentes, montadas en /api/async con
+# ASYNC_VIEWS. Cada vista ejecuta su lógica con async_db.run_sync: las
+# consultas van por el driver async y esperan en el loop sin bloquear a las
+# demás peticiones del proceso. Las escrituras siguen en las vistas síncronas.
+async_bp = Blueprint('async_api', __name__)
+
+
+class AsyncPostAPI(MethodView):
+    decorators = [jwt_required()]
+
+    async def get(self, post_id=None):
+        return await async_db.run_sync(self._get, post_id)
+
+    def _get(self, session, post_id):
+        if post_id is None:
+            etag, last_modified = collection_validators(session.query(Blogs), Blogs, schema=BlogSchema)
+            return conditional_response(etag, last_modified, lambda: self._list(session))
+
+        schema = fieldset_schema(BlogSchema)
+        post = apply_loaders(session.query(Blogs), schema).filter_by(id=post_id).first()
+        if post is None:
+            abort(404)
+        etag, last_modified = resource_validators(post, schema=BlogSchema)
+        return conditional_response(
+            etag, last_modified, lambda: jsonify({'post': schema.dump(post)})
+        )
+
+    def _list(self, session):
+        schema = fieldset_schema(BlogSchema, many=True)
+        try:
+            posts, next_cursor = paginate_request(
+                apply_loaders(session.query(Blogs), schema), Blogs
+            )
+            totals = total_request(session.query(Blogs), Blogs)
+        except PaginationError as e:
+            return {'message': str(e)}, 400
+        return jsonify({
+            'posts': fast_dump(schema, posts),
+            'next_cursor': next_cursor,
+            **totals
+        }), 200
+
+
+class AsyncCommentAPI(MethodView):
+    decorators = [jwt_required()]
+
+    async def get(self, post_id):
+        return await async_db.run_sync(self._get, post_id)
+
+    def _get(self, session, post_id):
+        query = session.query(Comment).filter_by(post_id=post_id)
+        etag, last_modified = collection_validators(query, Comment, post_id, schema=CommentSchema)
+        return conditional_response(etag, last_modified, lambda: self._list(query))
+
+    def _list(self, query):
+        schema = fieldset_schema(CommentSchema, many=True)
+        try:
+            comments, next_cursor = paginate_request(
+                apply_loaders(query, schema), Comment, descending=False
+            )
+            totals = total_request(query, Comment, by=Comment.post_id)
+        except PaginationError as e:
+            return {'message': str(e)}, 400
+        return jsonify({
+            'comments': fast_dump(schema, comments),
+            'next_cursor': next_cursor,
+            **totals
+        }), 200
+
+
+class AsyncUserAPI(MethodView):
+    decorators = [jwt_required()]
+
+    async def get(self, user_id=None):
+        return await async_db.run_sync(self._get, user_id)
+
+    def _get(self, session, user_id):
+        if user_id is None:
+            etag, last_modified = collection_validators(session.query(Users), Users)
+            return conditional_response(etag, last_modified, lambda: self._list(session))
+
+        schema = fieldset_schema(UserSchema)
+        user = apply_loaders(session.query(Users), schema).filter_by(id=user_id).first()
+        if user is None:
+            abort(404)
+        etag, last_modified = resource_validators(user)
+        return conditional_response(etag, last_modified, lambda: jsonify({
+            'user': schema.dump(user)
+        }))
+
+    def _list(self, session):
+        schema = fieldset_schema(UserSchema, many=True)
+        try:
+            users, next_cursor = paginate_request(apply_loaders(session.query(Users), schema), Users)
+            totals = total_request(session.query(Users), Users)
+        except PaginationError as e:
+            return {'message': str(e)}, 400
+        return jsonify({
+            'users': fast_dump(schema, users),
+            'next_cursor': next_cursor,
+            **totals
+        }), 200
+
+
+# Registrar las vistas
+post_view = AsyncPostAPI.as_view('async_post_api')
+async_bp.add_url_rule('/posts', defaults={'post_id': None}, view_func=post_view, methods=['GET'])
+async_bp.add_url_rule('/posts/<int:post_id>', view_func=post_view, methods=['GET'])
+async_bp.add_url_rule('/posts/<int:post_id>/comments',
+                      view_func=AsyncCommentAPI.as_view('async_comment_api'), methods=['GET'])
+user_view = AsyncUserAPI.as_view('async_user_api')
+async_bp.add_url_rule('/users', defaults={'user_id': None}, view_func=user_view, methods=['GET'])
+async_bp.add_url_rule('/users/<int:user_id>', view_func=user_view, methods=['GET'])
@@ -4,10 +4,21 @@ from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identi
 from ..models import Users, UserCredentials
 from ..extensions import db
 from ..schemas import UserSchema, UserRegisterSchema
+from ..utils.hashing import HashingUnavailable
+from ..decorators.ratelimit import rate_limited
 from datetime import datetime
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
+
+def busy_response():
+    """503 inmediato cuando el pool de hashing está saturado"""
+    response = jsonify({'message': 'Server busy, try again later'})
+    response.status_code = 503
+    response.headers['Retry-After'] = '1'
+    return response
+
+
 class AuthAPI(MethodView):
     """
     Endpoints de autenticación
@@ -32,7 +43,11 @@ class AuthAPI(MethodView):
           description: Login exitoso
         401:
           description: Credenciales inválidas
+        429:
+          description: Demasiados intentos desde la IP o para la cuenta
     """
+    decorators = [rate_limited('login')]
+
     def post(self):
         """Endpoint de login"""
         data = request.get_json()
@@ -42,8 +57,11 @@ class AuthAPI(MethodView):
             
         user = Users.query.filter_by(email=data.get('email')).first()
         
-        if not user or not user.check_password(data.get('password')):
-            return jsonify({'message': 'Invalid email or password'}), 401
+        try:
+            if not user or not user.check_password(data.get('password')):
+                return jsonify({'message': 'Invalid email or password'}), 401
+        except HashingUnavailable:
+            return busy_response()
             
         if not user.is_active:
             return jsonify({'message': 'Account is deactivated'}), 401
@@ -51,12 +69,19 @@ class AuthAPI(MethodView):
         # Actualizar último login
         if user.credentials:
             user.credentials.last_login = datetime.utcnow()
+            # Rehash transparente si cambiaron los parámetros de hashing
+            if user.credentials.needs_rehash():
+                try:
+                    user.credentials.set_password(data.get('password'))
+                except HashingUnavailable:
+                    pass  # Se reintentará en el próximo login
             db.session.commit()
         
         access_token = create_access_token(
             identity=user.id,
             additional_claims={
                 'role': user.role,
+                'is_active': user.is_active,
                 'email': user.email,
                 'username': user.username
             }
@@ -68,6 +93,8 @@ class AuthAPI(MethodView):
         }), 200
 
 class RegisterAPI(MethodView):
+    decorators = [rate_limited('register')]
+
     def post(self):
         """Endpoint de registro"""
         try:
@@ -102,6 +129,7 @@ class RegisterAPI(MethodView):
                 identity=new_user.id,
                 additional_claims={
                     'role': new_user.role,
+                    'is_active': new_user.is_active,
                     'email': new_user.email,
                     'username': new_user.username
                 }
@@ -113,6 +141,9 @@ class RegisterAPI(MethodView):
                 'user': UserSchema().dump(new_user)
             }), 201
             
+        except HashingUnavailable:
+            db.session.rollback()
+            return busy_response()
         except Exception as e:
             db.session.rollback()
             return jsonify({'message': str(e)}), 400
@@ -0,0 +1,59 @@
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
+from flask.views import MethodView
+from flask_jwt_extended import jwt_required
+from app.decorators.auth import admin_required
+from app.utils.bulk_import import PostImporter, CommentImporter
+from app.utils.export import EXPORTS, FORMATS, GENERATORS
+
+bulk_bp = Blueprint('bulk', __name__)
+
+class BulkImportAPI(MethodView):
+    decorators = [jwt_required(), admin_required()]
+
+    def __init__(self, importer_class):
+        # Un importador por petición: guarda estado del flujo (ids de origen)
+        self.importer_class = importer_class
+
+    def post(self):
+        """
+        Importación masiva desde NDJSON (un objeto JSON por línea).
+        El cuerpo se lee en streaming y se inserta por bloques.
+        """
+        chunk_size = current_app.config.get('BULK_IMPORT_CHUNK_SIZE', 500)
+        result = self.importer_class().run(request.stream, chunk_size)
+        return jsonify(result), 200
+
+class ExportAPI(MethodView):
+    decorators = [jwt_required(), admin_required()]
+
+    def get(self, resource):
+        """
+        Exportación completa en NDJSON o CSV (?format=).
+        Las filas se envían a medida que se leen, sin construir la respuesta en memoria.
+        """
+        if resource not in EXPORTS:
+            return {'message': 'Unknown export'}, 404
+        export_format = request.args.get('format', 'ndjson')
+        if export_format not in FORMATS:
+            return {'message': 'Invalid format'}, 400
+
+        batch_size = current_app.config.get('EXPORT_BATCH_SIZE', 1000)
+        generate = GENERATORS[export_format]
+        return Response(
+            stream_with_context(generate(resource, batch_size)),
+            mimetype=FORMATS[export_format],
+            headers={
+                'Content-Disposition': f'attachment; filename={resource}.{export_format}'
+            }
+        )
+
+# Registrar las vistas
+bulk_bp.add_url_rule('/admin/import/posts',
+                     view_func=BulkImportAPI.as_view('import_posts', PostImporter),
+                     methods=['POST'])
+bulk_bp.add_url_rule('/admin/import/comments',
+                     view_func=BulkImportAPI.as_view('import_comments', CommentImporter),
+                     methods=['POST'])
+bulk_bp.add_url_rule('/admin/export/<string:resource>',
+                     view_func=ExportAPI.as_view('export'),
+                     methods=['GET'])
@@ -1,20 +1,31 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, current_app, jsonify
 from flask.views import MethodView
 from flask_jwt_extended import jwt_required
-from app.models import db, Category
-from app.schemas import CategorySchema
+from app.models import db, Category, Blogs
+from app.schemas import CategorySchema, BlogSchema
 from app.decorators.auth import admin_required
+from app.utils.conditional import collection_validators, conditional_response
+from app.utils.pagination import parse_limit, PaginationError
+from app.utils.loaders import loader_options
+from app.utils.serializers import fast_dump
+from app.utils.category_cache import category_list, category_detail
+from app.utils.category_top import category_posts_query, paginate_category_posts
+from app.utils.totals import total_request
+from app.utils.fieldsets import fieldset_schema
 
 category_bp = Blueprint('category', __name__)
 
 class CategoryAPI(MethodView):
     def get(self, category_id=None):
+        # Respuestas serializadas en caché por worker; las invalida la versión
+        # de categorías que incrementan post, put y delete (ver utils/category_cache.py)
         if category_id is None:
-            categories = Category.query.all()
-            return jsonify({'categories': CategorySchema(many=True).dump(categories)}), 200
-            
-        category = Category.query.get_or_404(category_id)
-        return jsonify({'category': CategorySchema().dump(category)}), 200
+            cached = category_list(lambda categories: fast_dump(CategorySchema(many=True), categories))
+        else:
+            cached = category_detail(category_id, CategorySchema().dump)
+        return conditional_response(cached.etag, cached.last_modified, lambda: current_app.response_class(
+            cached.body, mimetype='application/json'
+        ))
     
     @admin_required()
     def post(self):
@@ -22,7 +33,6 @@ class CategoryAPI(MethodView):
             data = CategorySchema().load(request.get_json())
             new_category = Category(
                 name=data['name'],
-                slug=data['slug'],
                 description=data.get('description')
             )
             db.session.add(new_category)
@@ -56,10 +66,45 @@ class CategoryAPI(MethodView):
             db.session.rollback()
             return {'message': str(e)}, 400
 
+class CategoryPostsAPI(MethodView):
+    decorators = [jwt_required()]
+
+    def get(self, category_id):
+        """Posts de la categoría, del más reciente al más antiguo"""
+        Category.query.get_or_404(category_id)
+        cursor = request.args.get('cursor') or None
+        # La primera página sale entera del top precalculado; las siguientes
+        # pueden continuar sobre blogs y se validan contra toda la categoría
+        if cursor is None:
+            query = category_posts_query(category_id)
+        else:
+            query = Blogs.query.filter_by(category_id=category_id)
+        etag, last_modified = collection_validators(query, Blogs, category_id, schema=BlogSchema)
+        return conditional_response(etag, last_modified, lambda: self._list(category_id, cursor))
+
+    def _list(self, category_id, cursor):
+        schema = fieldset_schema(BlogSchema, many=True)
+        try:
+            posts, next_cursor = paginate_category_posts(
+                category_id, parse_limit(request.args.get('limit')), cursor, loader_options(schema)
+            )
+            totals = total_request(
+                Blogs.query.filter_by(category_id=category_id), Blogs, by=Blogs.category_id
+            )
+        except PaginationError as e:
+            return {'message': str(e)}, 400
+        return jsonify({
+            'posts': fast_dump(schema, posts),
+            'next_cursor': next_cursor,
+            **totals
+        }), 200
+
 # Registrar las vistas
 category_view = CategoryAPI.as_view('category_api')
 category_bp.add_url_rule('/categories', defaults={'category_id': None}, 
                         view_func=category_view, methods=['GET'])
 category_bp.add_url_rule('/categories', view_func=category_view, methods=['POST'])
 category_bp.add_url_rule('/categories/<int:category_id>', 
-                        view_func=category_view, methods=['GET', 'PUT', 'DELETE'])
\ No newline at end of file
+                        view_func=category_view, methods=['GET', 'PUT', 'DELETE'])
+category_bp.add_url_rule('/categories/<int:category_id>/posts',
+                        view_func=CategoryPostsAPI.as_view('category_posts'), methods=['GET'])
\ No newline at end of file
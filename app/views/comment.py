@@ -2,8 +2,17 @@ from flask import Blueprint, request, jsonify
 from flask.views import MethodView
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import db, Comment, Blogs
-from app.schemas import CommentSchema
+from marshmallow import ValidationError
+from app.schemas import CommentSchema, CommentModerationSchema
 from app.decorators.auth import owner_required, moderator_required
+from app.utils.pagination import paginate_request, PaginationError
+from app.utils.loaders import apply_loaders
+from app.utils.threads import load_thread, load_subtree, subtree_query, thread_options
+from app.utils.conditional import collection_validators, conditional_response
+from app.utils.serializers import fast_dump
+from app.utils.totals import total_request
+from app.utils.fieldsets import fieldset_schema
+from app.utils.moderation import moderation_condition, set_approval, delete_comments
 
 comment_bp = Blueprint('comment', __name__)
 
@@ -12,13 +21,41 @@ class CommentAPI(MethodView):
     
     def get(self, post_id, comment_id=None):
         if comment_id is None:
-            comments = Comment.query.filter_by(post_id=post_id).all()
-            return jsonify({'comments': CommentSchema(many=True).dump(comments)}), 200
+            etag, last_modified = collection_validators(
+                Comment.query.filter_by(post_id=post_id), Comment, post_id, schema=CommentSchema
+            )
+            return conditional_response(etag, last_modified, lambda: self._list(post_id))
             
-        comment = Comment.query.get_or_404(comment_id)
-        if comment.post_id != post_id:
+        schema = fieldset_schema(CommentSchema)
+        query = subtree_query(post_id, comment_id)
+        if query is None:
             return {'message': 'Comment not found in this post'}, 404
-        return jsonify({'comment': CommentSchema().dump(comment)}), 200
+        # El comentario incluye sus respuestas: los validadores cubren el subárbol
+        etag, last_modified = collection_validators(
+            query, Comment, post_id, comment_id, schema=CommentSchema
+        )
+        return conditional_response(etag, last_modified, lambda: jsonify({
+            'comment': fast_dump(schema, load_subtree(query, comment_id, thread_options(schema)))
+        }))
+
+    def _list(self, post_id):
+        schema = fieldset_schema(CommentSchema, many=True)
+        try:
+            # Los comentarios se listan en orden cronológico
+            comments, next_cursor = paginate_request(
+                apply_loaders(Comment.query.filter_by(post_id=post_id), schema),
+                Comment, descending=False
+            )
+            totals = total_request(
+                Comment.query.filter_by(post_id=post_id), Comment, by=Comment.post_id
+            )
+        except PaginationError as e:
+            return {'message': str(e)}, 400
+        return jsonify({
+            'comments': fast_dump(schema, comments),
+            'next_cursor': next_cursor,
+            **totals
+        }), 200
     
     def post(self, post_id):
         post = Blogs.query.get_or_404(post_id)
@@ -27,8 +64,7 @@ class CommentAPI(MethodView):
             new_comment = Comment(
                 content=data['content'],
                 user_id=get_jwt_identity(),
-                post_id=post_id,
-                is_visible=True
+                post_id=post_id
             )
             db.session.add(new_comment)
             db.session.commit()
@@ -37,7 +73,7 @@ class CommentAPI(MethodView):
             db.session.rollback()
             return {'message': str(e)}, 400
     
-    @owner_required(Comment)
+    @owner_required(Comment, 'comment_id')
     def put(self, post_id, comment_id):
         comment = Comment.query.get_or_404(comment_id)
         if comment.post_id != post_id:
@@ -52,7 +88,7 @@ class CommentAPI(MethodView):
             db.session.rollback()
             return {'message': str(e)}, 400
     
-    @owner_required(Comment)
+    @owner_required(Comment, 'comment_id')
     def delete(self, post_id, comment_id):
         comment = Comment.query.get_or_404(comment_id)
         if comment.post_id != post_id:
@@ -66,6 +102,20 @@ class CommentAPI(MethodView):
             db.session.rollback()
             return {'message': str(e)}, 400
 
+class CommentThreadAPI(MethodView):
+    decorators = [jwt_required()]
+
+    def get(self, post_id):
+        """Hilo completo de comentarios del post, cargado en una sola consulta"""
+        Blogs.query.get_or_404(post_id)
+        schema = fieldset_schema(CommentSchema, many=True)
+        etag, last_modified = collection_validators(
+            Comment.query.filter_by(post_id=post_id), Comment, post_id, schema=CommentSchema
+        )
+        return conditional_response(etag, last_modified, lambda: jsonify({
+            'comments': fast_dump(schema, load_thread(post_id, thread_options(schema)))
+        }))
+
 class CommentModeration(MethodView):
     decorators = [jwt_required(), moderator_required()]
     
@@ -73,8 +123,8 @@ class CommentModeration(MethodView):
         comment = Comment.query.get_or_404(comment_id)
         data = request.get_json()
         
-        if 'is_visible' in data:
-            comment.is_visible = data['is_visible']
+        if 'is_approved' in data:
+            comment.is_approved = data['is_approved']
             
         try:
             db.session.commit()
@@ -83,8 +133,36 @@ class CommentModeration(MethodView):
             db.session.rollback()
             return {'message': str(e)}, 400
 
+class BulkCommentModeration(MethodView):
+    decorators = [jwt_required(), moderator_required()]
+
+    def post(self):
+        """
+        Aprueba, rechaza o borra muchos comentarios a la vez: una lista de ids
+        o un filtro por autor/post y rango de fechas. Todo en una transacción
+        con sentencias UPDATE/DELETE sobre el conjunto, sin cargar las filas.
+        """
+        try:
+            data = CommentModerationSchema().load(request.get_json() or {})
+        except ValidationError as err:
+            return {'message': 'Invalid moderation request', 'errors': err.messages}, 400
+
+        conditions = moderation_condition(data)
+        try:
+            if data['action'] == 'delete':
+                deleted, detached = delete_comments(conditions)
+                result = {'deleted': deleted, 'detached_replies': detached}
+            else:
+                result = {'updated': set_approval(conditions, data['action'] == 'approve')}
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            return {'message': str(e)}, 400
+        return {'action': data['action'], **result}, 200
+
 # Registrar las vistas
 comment_view = CommentAPI.as_view('comment_api')
+thread_view = CommentThreadAPI.as_view('comment_thread')
 moderation_view = CommentModeration.as_view('comment_moderation')
 
 comment_bp.add_url_rule('/posts/<int:post_id>/comments', 
@@ -97,6 +175,12 @@ comment_bp.add_url_rule('/posts/<int:post_id>/comments',
 comment_bp.add_url_rule('/posts/<int:post_id>/comments/<int:comment_id>',
                        view_func=comment_view,
                        methods=['GET', 'PUT', 'DELETE'])
+comment_bp.add_url_rule('/posts/<int:post_id>/comments/thread',
+                       view_func=thread_view,
+                       methods=['GET'])
 comment_bp.add_url_rule('/comments/<int:comment_id>/moderate',
                        view_func=moderation_view,
-                       methods=['PUT'])
\ No newline at end of file
+                       methods=['PUT'])
+comment_bp.add_url_rule('/comments/moderate',
+                       view_func=BulkCommentModeration.as_view('comment_bulk_moderation'),
+                       methods=['POST'])
\ No newline at end of file
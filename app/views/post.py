@@ -1,9 +1,16 @@
 from flask import Blueprint, request, jsonify
 from flask.views import MethodView
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models import db, Blogs, Users
+from app.models import db, Blogs
 from app.schemas import BlogSchema
 from app.decorators.auth import owner_required
+from app.utils.pagination import paginate_request, parse_limit, PaginationError
+from app.utils.loaders import apply_loaders
+from app.utils.conditional import collection_validators, resource_validators, conditional_response
+from app.utils.search import search_posts, SearchUnavailable
+from app.utils.serializers import fast_dump
+from app.utils.totals import total_request
+from app.utils.fieldsets import fieldset_schema
 
 post_bp = Blueprint('post', __name__)
 
@@ -12,18 +19,37 @@ class PostAPI(MethodView):
     
     def get(self, post_id=None):
         if post_id is None:
-            posts = Blogs.query.all()
-            return jsonify({'posts': BlogSchema(many=True).dump(posts)}), 200
+            etag, last_modified = collection_validators(Blogs.query, Blogs, schema=BlogSchema)
+            return conditional_response(etag, last_modified, self._list)
             
-        post = Blogs.query.get_or_404(post_id)
-        return jsonify({'post': BlogSchema().dump(post)}), 200
+        schema = fieldset_schema(BlogSchema)
+        post = apply_loaders(Blogs.query, schema).filter_by(id=post_id).first_or_404()
+        etag, last_modified = resource_validators(post, schema=BlogSchema)
+        return conditional_response(
+            etag, last_modified, lambda: jsonify({'post': schema.dump(post)})
+        )
+
+    def _list(self):
+        schema = fieldset_schema(BlogSchema, many=True)
+        try:
+            posts, next_cursor = paginate_request(
+                apply_loaders(Blogs.query, schema), Blogs
+            )
+            totals = total_request(Blogs.query, Blogs)
+        except PaginationError as e:
+            return {'message': str(e)}, 400
+        return jsonify({
+            'posts': fast_dump(schema, posts),
+            'next_cursor': next_cursor,
+            **totals
+        }), 200
     
     def post(self):
         try:
             data = BlogSchema().load(request.get_json())
             new_post = Blogs(
                 title=data['title'],
-                description=data['description'],
+                content=data['content'],
                 user_id=get_jwt_identity(),
                 category_id=data.get('category_id')
             )
@@ -34,7 +60,7 @@ class PostAPI(MethodView):
             db.session.rollback()
             return {'message': str(e)}, 400
     
-    @owner_required(Blogs)
+    @owner_required(Blogs, 'post_id')
     def put(self, post_id):
         post = Blogs.query.get_or_404(post_id)
         try:
@@ -47,7 +73,7 @@ class PostAPI(MethodView):
             db.session.rollback()
             return {'message': str(e)}, 400
     
-    @owner_required(Blogs)
+    @owner_required(Blogs, 'post_id')
     def delete(self, post_id):
         post = Blogs.query.get_or_404(post_id)
         try:
@@ -58,8 +84,48 @@ class PostAPI(MethodView):
             db.session.rollback()
             return {'message': str(e)}, 400
 
+class PostSearchAPI(MethodView):
+    decorators = [jwt_required()]
+
+    def get(self):
+        """Búsqueda de texto completo en título y contenido, por relevancia"""
+        query = request.args.get('q', '').strip()
+        if not query:
+            return {'message': 'Missing search query'}, 400
+        try:
+            limit = parse_limit(request.args.get('limit'))
+            page = int(request.args.get('page', 1))
+            if page < 1:
+                raise ValueError
+        except (PaginationError, ValueError):
+            return {'message': 'Invalid limit or page'}, 400
+
+        # Primero solo ids y puntuación; luego se cargan únicamente esas filas
+        try:
+            matches = search_posts(query, limit + 1, (page - 1) * limit)
+        except SearchUnavailable as e:
+            return {'message': str(e)}, 501
+        has_next = len(matches) > limit
+        matches = matches[:limit]
+
+        schema = fieldset_schema(BlogSchema, many=True)
+        ids = [match.id for match in matches]
+        posts = {
+            post.id: post
+            for post in apply_loaders(Blogs.query, schema).filter(Blogs.id.in_(ids))
+        } if ids else {}
+        results = [posts[match.id] for match in matches if match.id in posts]
+
+        return jsonify({
+            'posts': fast_dump(schema, results),
+            'scores': {match.id: float(match.score) for match in matches},
+            'page': page,
+            'next_page': page + 1 if has_next else None
+        }), 200
+
 # Registrar las vistas
 post_view = PostAPI.as_view('post_api')
 post_bp.add_url_rule('/posts', defaults={'post_id': None}, view_func=post_view, methods=['GET'])
 post_bp.add_url_rule('/posts', view_func=post_view, methods=['POST'])
+post_bp.add_url_rule('/posts/search', view_func=PostSearchAPI.as_view('post_search'), methods=['GET'])
 post_bp.add_url_rule('/posts/<int:post_id>', view_func=post_view, methods=['GET', 'PUT', 'DELETE'])
\ No newline at end of file
@@ -1,53 +1,60 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, current_app
 from flask.views import MethodView
-from flask_jwt_extended import jwt_required
-from ..models import Users, Blogs, Comment
 from ..extensions import db
 from app.decorators.auth import admin_required, moderator_required
+from app.utils.counters import (
+    get_counters, rebuild_counters, STATS_COUNTERS,
+    TOTAL_USERS, ACTIVE_USERS, TOTAL_POSTS, TOTAL_COMMENTS
+)
+from app.utils.rollups import get_rollup, DETAILED_STATS
+from app.utils.hashing import get_metrics as get_hashing_metrics
+from app.utils.routing import use_primary
 
 stats_bp = Blueprint('stats', __name__)
 
 class StatsAPI(MethodView):
     @moderator_required()
     def get(self):
-        total_users = Users.query.count()
-        total_posts = Blogs.query.count()
-        total_comments = Comment.query.count()
-        active_users = Users.query.filter_by(is_active=True).count()
+        # Una lectura por clave primaria en lugar de cuatro COUNT(*)
+        counters = get_counters()
+        if len(counters) < len(STATS_COUNTERS):
+            # Primera vez: inicializar los contadores con los valores exactos,
+            # contados y escritos en la primaria
+            use_primary()
+            counters = rebuild_counters()
+            db.session.commit()
         
         return jsonify({
             'stats': {
-                'total_users': total_users,
-                'active_users': active_users,
-                'total_posts': total_posts,
-                'total_comments': total_comments
+                'total_users': counters[TOTAL_USERS],
+                'active_users': counters[ACTIVE_USERS],
+                'total_posts': counters[TOTAL_POSTS],
+                'total_comments': counters[TOTAL_COMMENTS]
             }
         }), 200
 
 class DetailedStatsAPI(MethodView):
     @admin_required()
     def get(self):
-        # Estadísticas detalladas para administradores
-        user_roles = db.session.query(
-            Users.role, db.func.count(Users.id)
-        ).group_by(Users.role).all()
-        
-        comments_per_post = db.session.query(
-            db.func.avg(db.func.count(Comment.id))
-        ).group_by(Comment.post_id).scalar() or 0
-        
-        posts_per_user = db.session.query(
-            db.func.avg(db.func.count(Blogs.id))
-        ).group_by(Blogs.user_id).scalar() or 0
+        # Estadísticas detalladas para administradores, precalculadas
+        rollup = get_rollup(
+            DETAILED_STATS, max_age=current_app.config.get('STATS_ROLLUP_MAX_AGE')
+        )
         
         return jsonify({
             'detailed_stats': {
-                'users_by_role': dict(user_roles),
-                'avg_comments_per_post': float(comments_per_post),
-                'avg_posts_per_user': float(posts_per_user)
+                **rollup.payload,
+                'computed_at': rollup.computed_at.isoformat()
             }
         }), 200
 
+class HashingStatsAPI(MethodView):
+    @admin_required()
+    def get(self):
+        # Métricas del pool de hashing de este proceso
+        return jsonify({'hashing': get_hashing_metrics()}), 200
+
 # Registrar las vistas
 stats_bp.add_url_rule('/stats', view_func=StatsAPI.as_view('stats'))
-stats_bp.add_url_rule('/stats/detailed', view_func=DetailedStatsAPI.as_view('detailed_stats'))
\ No newline at end of file
+stats_bp.add_url_rule('/stats/detailed', view_func=DetailedStatsAPI.as_view('detailed_stats'))
+stats_bp.add_url_rule('/stats/hashing', view_func=HashingStatsAPI.as_view('hashing_stats'))
\ No newline at end of file
@@ -4,21 +4,43 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from ..models import Users, UserCredentials
 from ..extensions import db
 from ..schemas import UserSchema, UserRegisterSchema
-from ..decorators.auth import roles_required, is_owner_or_admin
+from ..decorators.auth import roles_required, is_owner_or_admin, invalidate_user
+from ..utils.pagination import paginate_request, PaginationError
+from ..utils.conditional import collection_validators, resource_validators, conditional_response
+from ..utils.serializers import fast_dump
+from ..utils.totals import total_request
+from ..utils.fieldsets import fieldset_schema
+from ..utils.loaders import apply_loaders
 
 user_bp = Blueprint('user', __name__)
 user_schema = UserSchema()
-users_schema = UserSchema(many=True)
 
 class UserAPI(MethodView):
     @jwt_required()
     def get(self, user_id=None):
         if user_id is None:
-            users = Users.query.all()
-            return jsonify({'users': users_schema.dump(users)}), 200
+            etag, last_modified = collection_validators(Users.query, Users)
+            return conditional_response(etag, last_modified, self._list)
         
-        user = Users.query.get_or_404(user_id)
-        return jsonify({'user': user_schema.dump(user)}), 200
+        schema = fieldset_schema(UserSchema)
+        user = apply_loaders(Users.query, schema).filter_by(id=user_id).first_or_404()
+        etag, last_modified = resource_validators(user)
+        return conditional_response(etag, last_modified, lambda: jsonify({
+            'user': schema.dump(user)
+        }))
+
+    def _list(self):
+        schema = fieldset_schema(UserSchema, many=True)
+        try:
+            users, next_cursor = paginate_request(apply_loaders(Users.query, schema), Users)
+            totals = total_request(Users.query, Users)
+        except PaginationError as e:
+            return jsonify({'message': str(e)}), 400
+        return jsonify({
+            'users': fast_dump(schema, users),
+            'next_cursor': next_cursor,
+            **totals
+        }), 200
 
     @jwt_required()
     def put(self, user_id):
@@ -61,6 +83,7 @@ class UserAPI(MethodView):
         user = Users.query.get_or_404(user_id)
         try:
             db.session.delete(user)
+            invalidate_user(user_id)
             db.session.commit()
             return jsonify({'message': 'User deleted successfully'}), 200
         except Exception as e:
@@ -88,6 +111,8 @@ class UserAdminAPI(MethodView):
             user.is_active = data['is_active']
         
         try:
+            # El rol o el estado cambiaron: en la misma transacción, para todos los workers
+            invalidate_user(user.id)
             db.session.commit()
             return jsonify({'user': user_schema.dump(user)}), 200
         except Exception as e:
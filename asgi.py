@@ -0,0 +1,11 @@
+"""
+Punto de entrada ASGI con las vistas async activadas:
+    uvicorn asgi:application --workers 4
+
+Cada worker atiende hasta ASGI_THREADS peticiones a la vez (ver
+app/utils/asgi.py).
+"""
+from app import create_app
+from app.utils.asgi import asgi_application
+
+application = asgi_application(create_app({'ASYNC_VIEWS': True}))
@@ -0,0 +1,168 @@
+"""
+Compara las vistas síncronas con las vistas async (/api/async) bajo carga
+concurrente: peticiones por segundo y latencia p50/p95 por nivel de concurrencia.
+Las peticiones pasan por la aplicación ASGI de asgi.py (httpx con ASGITransport),
+el mismo camino que en producción con uvicorn.
+
+Por defecto siembra una base SQLite temporal. Con --database-url se mide contra
+una base existente (p. ej. MySQL) sin sembrarla, salvo que se pase --seed.
+--db-latency-ms añade a cada consulta una espera que simula la latencia de red
+de un servidor remoto: bloquea el hilo en el camino síncrono y cede el event
+loop en el async, como harían pymysql y aiomysql.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.async_compare
+    python -m benchmarks.async_compare --concurrency 1,16,64 --db-latency-ms 2
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+from flask_jwt_extended import create_access_token  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.util import await_only  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.extensions import db, async_db  # noqa: E402
+from app.utils.asgi import asgi_application  # noqa: E402
+from benchmarks.run import seed, percentile  # noqa: E402
+
+PATHS = {
+    'post.list': '/posts?limit=20',
+    'post.get': '/posts/1',
+    'comment.list': '/posts/1/comments?limit=20',
+    'user.list': '/users?limit=20',
+}
+
+
+def _add_latency(app, seconds):
+    """Espera simulada antes de cada consulta en ambos engines"""
+    with app.app_context():
+        @event.listens_for(db.engine, 'before_cursor_execute')
+        def _sync_wait(*args):
+            time.sleep(seconds)
+
+    @event.listens_for(async_db.engine.sync_engine, 'before_cursor_execute')
+    def _async_wait(*args):
+        # Dentro de run_sync: cede el loop mientras "espera a la red"
+        await_only(asyncio.sleep(seconds))
+
+
+async def _send_all(application, path, headers, concurrency, requests):
+    transport = httpx.ASGITransport(app=application)
+    limit = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+        async def send():
+            async with limit:
+                started = time.perf_counter()
+                response = await client.get(path, headers=headers)
+                return response.status_code, (time.perf_counter() - started) * 1000
+
+        return await asyncio.gather(*(send() for _ in range(requests)))
+
+
+def _load(application, path, headers, concurrency, requests):
+    started = time.perf_counter()
+    results = asyncio.run(_send_all(application, path, headers, concurrency, requests))
+    wall = time.perf_counter() - started
+
+    statuses = {status for status, _ in results}
+    latencies = [elapsed for _, elapsed in results]
+    return {
+        'status': ','.join(str(status) for status in sorted(statuses)),
+        'rps': requests / wall,
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+    }
+
+
+def run(database_url, concurrency_levels, requests, latency_ms, size, do_seed, only=None):
+    tmpdir = None
+    if database_url is None:
+        tmpdir = tempfile.TemporaryDirectory()
+        database_url = f"sqlite:///{os.path.join(tmpdir.name, 'bench.db')}"
+        do_seed = True
+
+    # Pools del mismo tamaño en ambos caminos para que la comparación sea justa
+    pool_size = max(concurrency_levels)
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': database_url,
+        'SQLALCHEMY_ENGINE_OPTIONS': {'pool_size': pool_size, 'max_overflow': 0},
+        'ASYNC_ENGINE_OPTIONS': {'pool_size': pool_size, 'max_overflow': 0},
+        'ASYNC_VIEWS': True,
+        'ASGI_THREADS': pool_size,
+        'PASSWORD_HASH_WORKERS': 0,
+    })
+    application = asgi_application(app)
+    with app.app_context():
+        if do_seed:
+            db.create_all()
+            seed(size)
+        headers = {'Authorization': 'Bearer ' + create_access_token(
+            identity='1', additional_claims={'role': 'admin'})}
+    if latency_ms:
+        _add_latency(app, latency_ms / 1000)
+
+    results = {}
+    try:
+        for name, path in PATHS.items():
+            if only and not any(name.startswith(prefix) for prefix in only):
+                continue
+            for mode, prefix in (('sync', '/api'), ('async', '/api/async')):
+                # Calentamiento: cargas perezosas y conexiones del pool
+                _load(application, prefix + path, headers, 2, 4)
+                for concurrency in concurrency_levels:
+                    results[(name, concurrency, mode)] = _load(
+                        application, prefix + path, headers, concurrency, requests
+                    )
+    finally:
+        async_db.dispose()
+        with app.app_context():
+            db.engine.dispose()
+        if tmpdir:
+            tmpdir.cleanup()
+    return results
+
+
+def report(results):
+    header = (f"{'benchmark':<16}{'conc':>6}{'mode':>7}{'status':>8}"
+              f"{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'speedup':>9}")
+    print(header)
+    print('-' * len(header))
+    for (name, concurrency, mode), result in results.items():
+        speedup = ''
+        if mode == 'async':
+            speedup = f"{result['rps'] / results[(name, concurrency, 'sync')]['rps']:.2f}x"
+        print(f"{name:<16}{concurrency:>6}{mode:>7}{result['status']:>8}{result['rps']:>10.1f}"
+              f"{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}{speedup:>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database-url', help='Base de datos existente (por defecto SQLite temporal sembrada)')
+    parser.add_argument('--seed', action='store_true', help='Sembrar también la base de --database-url')
+    parser.add_argument('--size', type=int, default=1000, help='Número de posts sembrados')
+    parser.add_argument('--concurrency', default='1,8,32', help='Niveles de concurrencia, separados por comas')
+    parser.add_argument('--requests', type=int, default=200, help='Peticiones por nivel y modo')
+    parser.add_argument('--db-latency-ms', type=float, default=0, help='Latencia simulada por consulta')
+    parser.add_argument('--only', help='Prefijos de rutas a medir, separados por comas')
+    args = parser.parse_args(argv)
+
+    levels = [int(level) for level in args.concurrency.split(',')]
+    only = args.only.split(',') if args.only else None
+    results = run(args.database_url, levels, args.requests, args.db_latency_ms,
+                  args.size, args.seed, only)
+    report(results)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
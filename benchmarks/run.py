@@ -0,0 +1,387 @@
+"""
+Benchmarks de la API contra una base SQLite sembrada.
+
+Crea la aplicación con create_app() para cada tamaño de datos, la recorre con
+el cliente de pruebas de Flask y mide cada ruta de los blueprints: latencia
+(p50/p95/p99), consultas SQL por petición y memoria asignada por petición.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.run                          # medir e informar
+    python -m benchmarks.run --save                   # guardar como baseline
+    python -m benchmarks.run --compare --threshold 0.25
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from itertools import count
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+from werkzeug.security import generate_password_hash  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import Users, UserCredentials, Blogs, Comment, Category  # noqa: E402
+from app.utils.loaders import QueryCounter  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+PASSWORD = 'benchmark-password'
+
+_unique = count(1)
+
+
+@dataclass
+class Route:
+    name: str
+    method: str
+    path: str
+    role: str = 'admin'            # 'admin', 'user' o None (sin token)
+    json: dict = None
+    data: str = None
+    setup: object = None           # callable(bench) -> dict con path/json por iteración
+    headers: dict = None           # cabeceras adicionales (p. ej. Accept-Encoding)
+    status: int = 200              # estado esperado: otro indica que no se midió la operación
+    options: dict = field(default_factory=dict)
+
+
+def _new_post(bench):
+    post = Blogs(title='bench post', content='bench content', user_id=bench.admin_id,
+                 category_id=bench.category_id)
+    db.session.add(post)
+    db.session.commit()
+    return post.id
+
+
+def _new_comment(bench):
+    comment = Comment(content='bench comment', user_id=bench.admin_id, post_id=1)
+    db.session.add(comment)
+    db.session.commit()
+    return comment.id
+
+
+def _new_category(bench):
+    category = Category(name=f'bench-{next(_unique)}')
+    db.session.add(category)
+    db.session.commit()
+    return category.id
+
+
+def _new_user(bench):
+    user = Users(username=f'bench-{next(_unique)}', email=f'bench-{next(_unique)}@example.com')
+    db.session.add(user)
+    db.session.commit()
+    return user.id
+
+
+ROUTES = [
+    # auth
+    Route('auth.login', 'POST', '/api/login', role=None,
+          json={'email': 'user1@example.com', 'password': PASSWORD}),
+    Route('auth.register', 'POST', '/api/register', role=None,
+          setup=lambda b: {'json': {'username': f'reg-{next(_unique)}',
+                                    'email': f'reg-{next(_unique)}@example.com',
+                                    'password': PASSWORD}},
+          status=201),
+    Route('auth.profile.get', 'GET', '/api/profile', role='user'),
+    Route('auth.profile.put', 'PUT', '/api/profile', role='user',
+          json={'username': 'user2'}),
+    # user
+    Route('user.list', 'GET', '/api/users?limit=20'),
+    Route('user.get', 'GET', '/api/users/1'),
+    Route('user.put', 'PUT', '/api/users/1', json={'username': 'user1'}),
+    Route('user.delete', 'DELETE', None,
+          setup=lambda b: {'path': f'/api/users/{_new_user(b)}'}),
+    Route('user.admin', 'POST', '/api/users/admin/manage',
+          json={'user_id': 2, 'is_active': True}),
+    # post
+    Route('post.list', 'GET', '/api/posts?limit=20'),
+    Route('post.list.gzip', 'GET', '/api/posts?limit=20', headers={'Accept-Encoding': 'gzip'}),
+    Route('post.get', 'GET', '/api/posts/1'),
+    Route('post.search', 'GET', '/api/posts/search?q=lorem&limit=20'),
+    Route('post.create', 'POST', '/api/posts',
+          json={'title': 'bench', 'content': 'bench content'}, status=201),
+    # El post 1 y su primer comentario son de user2 (ver seed)
+    Route('post.put', 'PUT', '/api/posts/1', role='user',
+          json={'title': 'bench', 'content': 'updated'}),
+    Route('post.delete', 'DELETE', None,
+          setup=lambda b: {'path': f'/api/posts/{_new_post(b)}'}),
+    # comment
+    Route('comment.list', 'GET', '/api/posts/1/comments?limit=20'),
+    Route('comment.list.gzip', 'GET', '/api/posts/1/comments?limit=20',
+          headers={'Accept-Encoding': 'gzip'}),
+    Route('comment.thread', 'GET', '/api/posts/1/comments/thread'),
+    Route('comment.get', 'GET', '/api/posts/1/comments/1'),
+    Route('comment.create', 'POST', '/api/posts/1/comments',
+          json={'content': 'bench', 'post_id': 1}, status=201),
+    Route('comment.put', 'PUT', '/api/posts/1/comments/1', role='user',
+          json={'content': 'bench', 'post_id': 1}),
+    Route('comment.delete', 'DELETE', None,
+          setup=lambda b: {'path': f'/api/posts/1/comments/{_new_comment(b)}'}),
+    Route('comment.moderate', 'PUT', '/api/comments/1/moderate', json={'is_approved': True}),
+    Route('comment.moderate.bulk', 'POST', '/api/comments/moderate',
+          json={'action': 'approve', 'post_id': 1}),
+    # category
+    Route('category.list', 'GET', '/api/categories', role=None),
+    Route('category.list.gzip', 'GET', '/api/categories', role=None,
+          headers={'Accept-Encoding': 'gzip'}),
+    Route('category.get', 'GET', '/api/categories/1', role=None),
+    Route('category.create', 'POST', '/api/categories',
+          setup=lambda b: {'json': {'name': f'cat-{next(_unique)}'}}, status=201),
+    Route('category.put', 'PUT', '/api/categories/1', json={'name': 'category-1'}),
+    Route('category.delete', 'DELETE', None,
+          setup=lambda b: {'path': f'/api/categories/{_new_category(b)}'}),
+    Route('category.posts', 'GET', '/api/categories/1/posts?limit=20'),
+    # stats
+    Route('stats.summary', 'GET', '/api/stats'),
+    Route('stats.detailed', 'GET', '/api/stats/detailed'),
+    Route('stats.hashing', 'GET', '/api/stats/hashing'),
+]
+
+
+def seed(posts, users=None, comments_per_post=3, categories=10):
+    """Inserta los datos con INSERT masivos y recalcula las estructuras derivadas"""
+    from app.utils.category_top import rebuild_top_posts
+    from app.utils.counters import rebuild_counters
+    from app.utils.rollups import refresh_all
+    from app.utils.search import rebuild_index
+    from app.utils.threads import rebuild_paths
+
+    users = users or max(posts // 10, 5)
+    password_hash = generate_password_hash(PASSWORD)
+    start = datetime(2024, 1, 1)
+
+    db.session.execute(insert(Category), [
+        {'name': f'category-{i}', 'description': 'benchmark'} for i in range(1, categories + 1)
+    ])
+    db.session.execute(insert(Users), [
+        {'username': f'user{i}', 'email': f'user{i}@example.com',
+         'role': 'admin' if i == 1 else 'user', 'is_active': True,
+         'created_at': start + timedelta(seconds=i), 'updated_at': start + timedelta(seconds=i)}
+        for i in range(1, users + 1)
+    ])
+    db.session.execute(insert(UserCredentials), [
+        {'user_id': i, 'password_hash': password_hash} for i in range(1, users + 1)
+    ])
+    db.session.execute(insert(Blogs), [
+        {'title': f'post {i} lorem', 'content': f'lorem ipsum dolor sit amet {i} ' * 20,
+         'user_id': i % users + 1, 'category_id': i % categories + 1,
+         'created_at': start + timedelta(minutes=i), 'updated_at': start + timedelta(minutes=i)}
+        for i in range(1, posts + 1)
+    ])
+    comment_rows = []
+    comment_id = 0
+    for post_id in range(1, posts + 1):
+        first = comment_id + 1
+        for j in range(comments_per_post):
+            comment_id += 1
+            comment_rows.append({
+                'content': f'comment {comment_id}', 'user_id': comment_id % users + 1,
+                'post_id': post_id, 'parent_id': first if j else None,
+                'created_at': start + timedelta(minutes=post_id, seconds=j),
+                'updated_at': start + timedelta(minutes=post_id, seconds=j),
+            })
+    if comment_rows:
+        db.session.execute(insert(Comment), comment_rows)
+
+    rebuild_counters()
+    rebuild_paths()
+    rebuild_index()
+    rebuild_top_posts()
+    refresh_all()
+    db.session.commit()
+
+
+class Bench:
+    def __init__(self, size, iterations, alloc_iterations):
+        self.size = size
+        self.iterations = iterations
+        self.alloc_iterations = alloc_iterations
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(self.tmpdir.name, 'bench.db')}",
+            'PASSWORD_HASH_WORKERS': 0,
+            # Las rutas de auth se repiten cientos de veces desde la misma IP
+            'RATE_LIMIT_ENABLED': False,
+        })
+        self.client = self.app.test_client()
+
+    def __enter__(self):
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        seed(self.size)
+        self.admin_id = 1
+        self.category_id = 1
+        self.headers = {
+            'admin': {'Authorization': 'Bearer ' + create_access_token(
+                identity='1', additional_claims={'role': 'admin'})},
+            'user': {'Authorization': 'Bearer ' + create_access_token(
+                identity='2', additional_claims={'role': 'user'})},
+            None: {},
+        }
+        return self
+
+    def __exit__(self, *exc):
+        db.session.remove()
+        db.engine.dispose()
+        self.ctx.pop()
+        self.tmpdir.cleanup()
+
+    def _request(self, route):
+        kwargs = {'path': route.path, 'json': route.json, 'data': route.data}
+        if route.setup:
+            kwargs.update(route.setup(self))
+        path = kwargs.pop('path')
+        kwargs = {key: value for key, value in kwargs.items() if value is not None}
+        headers = {**self.headers[route.role], **(route.headers or {})}
+        return lambda: self.client.open(path, method=route.method, headers=headers, **kwargs)
+
+    def measure(self, route):
+        # Calentamiento: la primera petición incluye la configuración perezosa
+        for _ in range(2):
+            self._request(route)()
+
+        latencies, queries, statuses = [], [], []
+        for _ in range(self.iterations):
+            send = self._request(route)
+            with QueryCounter(db.engine) as counter:
+                started = time.perf_counter()
+                response = send()
+                latencies.append((time.perf_counter() - started) * 1000)
+            queries.append(counter.count)
+            statuses.append(response.status_code)
+
+        # La memoria se mide aparte para que tracemalloc no distorsione la latencia
+        allocations = []
+        for _ in range(self.alloc_iterations):
+            send = self._request(route)
+            tracemalloc.start()
+            send()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            allocations.append(peak / 1024)
+
+        return {
+            # El primer estado inesperado, si lo hubo
+            'status': next((status for status in statuses if status != route.status), route.status),
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+            'p99_ms': percentile(latencies, 99),
+            'queries': statistics.median(queries),
+            'alloc_kib': statistics.median(allocations) if allocations else 0.0,
+        }
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run(sizes, iterations, alloc_iterations, only=None):
+    results = {}
+    for size in sizes:
+        with Bench(size, iterations, alloc_iterations) as bench:
+            for route in ROUTES:
+                if only and not any(route.name.startswith(prefix) for prefix in only):
+                    continue
+                results[f'{size}:{route.name}'] = bench.measure(route)
+    return results
+
+
+def report(results):
+    header = f"{'benchmark':<32}{'status':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}{'KiB':>10}"
+    print(header)
+    print('-' * len(header))
+    for name, result in results.items():
+        print(f"{name:<32}{result['status']:>7}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}"
+              f"{result['p99_ms']:>10.2f}{result['queries']:>9g}{result['alloc_kib']:>10.1f}")
+
+
+def unexpected_statuses(results):
+    """Rutas que respondieron con un estado distinto del esperado"""
+    expected = {route.name: route.status for route in ROUTES}
+    errors = []
+    for name, result in results.items():
+        status = expected[name.split(':', 1)[1]]
+        if result['status'] != status:
+            errors.append(f"{name}: status {result['status']} (expected {status})")
+    return errors
+
+
+def compare(results, baseline, threshold):
+    """
+    Regresiones: estado distinto del baseline, p50 por encima del umbral
+    relativo o más consultas que el baseline
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result['status'] != base['status']:
+            regressions.append(f"{name}: status {base['status']} -> {result['status']}")
+        if result['p50_ms'] > base['p50_ms'] * (1 + threshold):
+            regressions.append(f"{name}: p50 {base['p50_ms']:.2f} -> {result['p50_ms']:.2f} ms")
+        if result['queries'] > base['queries']:
+            regressions.append(f"{name}: queries {base['queries']:g} -> {result['queries']:g}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='100,1000', help='Número de posts sembrados, separados por comas')
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--alloc-iterations', type=int, default=3)
+    parser.add_argument('--only', help='Prefijos de rutas a medir, separados por comas (p. ej. post,stats)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save', action='store_true', help='Guardar los resultados como baseline')
+    parser.add_argument('--compare', action='store_true', help='Fallar si hay regresiones respecto al baseline')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Regresión relativa de p50 tolerada')
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    only = args.only.split(',') if args.only else None
+    results = run(sizes, args.iterations, args.alloc_iterations, only)
+    report(results)
+
+    # Un estado inesperado invalida la medida: no se guarda ni se compara
+    errors = unexpected_statuses(results)
+    if errors:
+        print('\nEstados inesperados:')
+        for error in errors:
+            print(f'  {error}')
+        return 1
+
+    if args.save:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f'\nBaseline guardado en {args.baseline}')
+
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f'\nNo existe el baseline {args.baseline}')
+            return 2
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print('\nRegresiones:')
+            for regression in regressions:
+                print(f'  {regression}')
+            return 1
+        print('\nSin regresiones')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
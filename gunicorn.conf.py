@@ -0,0 +1,15 @@
+"""
+Configuración de gunicorn: la aplicación se crea y se calienta en el proceso
+maestro (wsgi.py) y cada worker prepara su propio pool de conexiones al crearse.
+    gunicorn wsgi:application -c gunicorn.conf.py
+"""
+import os
+
+preload_app = True
+workers = int(os.getenv('WEB_CONCURRENCY', 4))
+
+
+def post_fork(server, worker):
+    from wsgi import application
+    from app.utils.warmup import after_fork
+    after_fork(application)
@@ -0,0 +1,114 @@
+"""comment paths, stats counters and rollups, full-text search index
+
+Revision ID: 0002_paths_counters_search
+Revises: 0001_baseline
+Create Date: 2026-10-18 12:15:02.640118
+
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_paths_counters_search'
+down_revision = '0001_baseline'
+branch_labels = None
+depends_on = None
+
+# Mismo formato que app/utils/threads.py
+PATH_SEGMENT = '{:08d}/'
+PATH_MAX_LENGTH = 255
+BATCH_SIZE = 1000
+
+
+def _comment_paths(rows):
+    """{id: path} a partir de (id, parent_id); None si el hilo es demasiado profundo"""
+    parents = dict(rows)
+    paths = {}
+    for comment_id in parents:
+        # Subir hasta el primer antepasado con path conocido y bajar calculando
+        chain = []
+        current = comment_id
+        while current is not None and current not in paths:
+            chain.append(current)
+            current = parents.get(current)
+        parent_path = paths[current] if current is not None else ''
+        for node in reversed(chain):
+            if parent_path is None:
+                path = None
+            else:
+                path = parent_path + PATH_SEGMENT.format(node)
+                if len(path) > PATH_MAX_LENGTH:
+                    path = None
+            paths[node] = path
+            parent_path = path
+    return paths
+
+
+def upgrade():
+    connection = op.get_bind()
+    dialect = connection.dialect.name
+
+    # Path materializado de los comentarios
+    with op.batch_alter_table('comment', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('path', sa.String(length=255), nullable=True))
+        batch_op.create_index(batch_op.f('ix_comment_path'), ['path'], unique=False)
+
+    comment = sa.table('comment', sa.column('id'), sa.column('parent_id'), sa.column('path'))
+    paths = _comment_paths(connection.execute(sa.select(comment.c.id, comment.c.parent_id)).all())
+    statement = comment.update().where(comment.c.id == sa.bindparam('_id')).values(path=sa.bindparam('_path'))
+    rows = [{'_id': comment_id, '_path': path} for comment_id, path in paths.items()]
+    for start in range(0, len(rows), BATCH_SIZE):
+        connection.execute(statement, rows[start:start + BATCH_SIZE])
+
+    # Contadores de /api/stats, inicializados con el valor exacto
+    counter = op.create_table('counter',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('value', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    users = sa.table('users', sa.column('id'), sa.column('is_active'))
+    counts = {
+        'total_users': sa.select(sa.func.count()).select_from(users),
+        'active_users': sa.select(sa.func.count()).select_from(users).where(users.c.is_active.is_(True)),
+        'total_posts': sa.select(sa.func.count()).select_from(sa.table('blogs')),
+        'total_comments': sa.select(sa.func.count()).select_from(sa.table('comment')),
+    }
+    now = datetime.utcnow()
+    op.bulk_insert(counter, [
+        {'name': name, 'value': connection.scalar(query), 'updated_at': now}
+        for name, query in counts.items()
+    ])
+
+    # Agregados de /api/stats/detailed (se calculan en la primera lectura)
+    op.create_table('stats_rollup',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+    # Índice de búsqueda: FULLTEXT en MySQL (lo llena InnoDB), tabla virtual
+    # FTS5 en SQLite rellenada con los posts existentes
+    if dialect == 'mysql':
+        op.create_index('ix_blogs_fulltext', 'blogs', ['title', 'content'], unique=False, mysql_prefix='FULLTEXT')
+    elif dialect == 'sqlite':
+        op.execute('CREATE VIRTUAL TABLE IF NOT EXISTS blogs_fts USING fts5(title, content)')
+        op.execute('INSERT INTO blogs_fts (rowid, title, content) SELECT id, title, content FROM blogs')
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'mysql':
+        op.drop_index('ix_blogs_fulltext', table_name='blogs')
+    elif dialect == 'sqlite':
+        op.execute('DROP TABLE IF EXISTS blogs_fts')
+
+    op.drop_table('stats_rollup')
+    op.drop_table('counter')
+
+    with op.batch_alter_table('comment', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_comment_path'))
+        batch_op.drop_column('path')
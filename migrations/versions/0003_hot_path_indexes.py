@@ -0,0 +1,56 @@
+"""composite indexes for the hot access paths
+
+Revision ID: 0003_hot_path_indexes
+Revises: 0002_paths_counters_search
+Create Date: 2026-10-18 12:20:11.402318
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_hot_path_indexes'
+down_revision = '0002_paths_counters_search'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Listado de usuarios por (created_at, id), filtro is_active y ETag por updated_at
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index('ix_users_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_users_is_active', ['is_active'], unique=False)
+        batch_op.create_index('ix_users_updated_at', ['updated_at'], unique=False)
+
+    # Posts paginados globalmente, por autor y por categoría
+    with op.batch_alter_table('blogs', schema=None) as batch_op:
+        batch_op.create_index('ix_blogs_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_blogs_user_id_created_at_id', ['user_id', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_blogs_category_id_created_at_id', ['category_id', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_blogs_updated_at', ['updated_at'], unique=False)
+
+    # Comentarios de un post, de un autor y respuestas de un comentario
+    with op.batch_alter_table('comment', schema=None) as batch_op:
+        batch_op.create_index('ix_comment_post_id_created_at_id', ['post_id', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_comment_post_id_updated_at', ['post_id', 'updated_at'], unique=False)
+        batch_op.create_index('ix_comment_user_id_created_at', ['user_id', 'created_at'], unique=False)
+        batch_op.create_index('ix_comment_parent_id', ['parent_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('comment', schema=None) as batch_op:
+        batch_op.drop_index('ix_comment_parent_id')
+        batch_op.drop_index('ix_comment_user_id_created_at')
+        batch_op.drop_index('ix_comment_post_id_updated_at')
+        batch_op.drop_index('ix_comment_post_id_created_at_id')
+
+    with op.batch_alter_table('blogs', schema=None) as batch_op:
+        batch_op.drop_index('ix_blogs_updated_at')
+        batch_op.drop_index('ix_blogs_category_id_created_at_id')
+        batch_op.drop_index('ix_blogs_user_id_created_at_id')
+        batch_op.drop_index('ix_blogs_created_at_id')
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index('ix_users_updated_at')
+        batch_op.drop_index('ix_users_is_active')
+        batch_op.drop_index('ix_users_created_at_id')
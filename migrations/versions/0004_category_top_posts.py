@@ -0,0 +1,53 @@
+"""latest posts per category
+
+Revision ID: 0004_category_top_posts
+Revises: 0003_hot_path_indexes
+Create Date: 2026-10-18 13:10:42.118530
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_category_top_posts'
+down_revision = '0003_hot_path_indexes'
+branch_labels = None
+depends_on = None
+
+# Valor por defecto de CATEGORY_TOP_POSTS
+TOP_POSTS = 101
+
+
+def upgrade():
+    top = op.create_table('category_top_post',
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['category.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['post_id'], ['blogs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('category_id', 'post_id')
+    )
+    with op.batch_alter_table('category_top_post', schema=None) as batch_op:
+        batch_op.create_index('ix_category_top_post_category_id_created_at', ['category_id', 'created_at', 'post_id'], unique=False)
+        batch_op.create_index('ix_category_top_post_post_id', ['post_id'], unique=False)
+
+    # Rellenar con los posts existentes, categoría a categoría por el índice
+    blogs = sa.table('blogs', sa.column('id'), sa.column('category_id'), sa.column('created_at'))
+    connection = op.get_bind()
+    for category_id in connection.scalars(sa.select(sa.table('category', sa.column('id')).c.id)):
+        latest = (
+            sa.select(blogs.c.category_id, blogs.c.id, blogs.c.created_at)
+            .where(blogs.c.category_id == category_id)
+            .order_by(blogs.c.created_at.desc(), blogs.c.id.desc())
+            .limit(TOP_POSTS)
+        )
+        connection.execute(top.insert().from_select(['category_id', 'post_id', 'created_at'], latest))
+
+
+def downgrade():
+    with op.batch_alter_table('category_top_post', schema=None) as batch_op:
+        batch_op.drop_index('ix_category_top_post_post_id')
+        batch_op.drop_index('ix_category_top_post_category_id_created_at')
+
+    op.drop_table('category_top_post')
@@ -0,0 +1,33 @@
+"""shared auth change markers
+
+Revision ID: 0005_auth_change
+Revises: 0004_category_top_posts
+Create Date: 2026-10-18 18:02:15.406221
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_auth_change'
+down_revision = '0004_category_top_posts'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('auth_change',
+    sa.Column('user_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('changed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    with op.batch_alter_table('auth_change', schema=None) as batch_op:
+        batch_op.create_index('ix_auth_change_changed_at', ['changed_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('auth_change', schema=None) as batch_op:
+        batch_op.drop_index('ix_auth_change_changed_at')
+
+    op.drop_table('auth_change')
@@ -0,0 +1,30 @@
+import pytest
+from app import create_app
+from app.extensions import db as _db
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}",
+        'PASSWORD_HASH_WORKERS': 0,
+        'RATE_LIMIT_ENABLED': False,
+    })
+    with app.app_context():
+        yield app
+        _db.session.remove()
+        _db.engine.dispose()
+
+
+@pytest.fixture
+def db(app):
+    """Base de datos vacía con el esquema actual de los modelos"""
+    _db.create_all(bind_key=None)
+    yield _db
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
@@ -0,0 +1,7 @@
+from flask_jwt_extended import create_access_token
+
+
+def auth_headers(user):
+    """Cabecera Authorization con un token para user"""
+    token = create_access_token(identity=str(user.id), additional_claims={'role': user.role})
+    return {'Authorization': f'Bearer {token}'}
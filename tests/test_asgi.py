@@ -0,0 +1,51 @@
+import asyncio
+import time
+import httpx
+import pytest
+from app import create_app
+from app.extensions import async_db
+from app.utils.asgi import asgi_application
+
+DELAY = 0.2
+REQUESTS = 8
+
+
+@pytest.fixture
+def application(tmp_path):
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}",
+        'ASYNC_VIEWS': True,
+        'ASGI_THREADS': REQUESTS,
+        'PASSWORD_HASH_WORKERS': 0,
+    })
+
+    @app.get('/slow/async')
+    async def slow_async():
+        # Como una consulta async: espera en el loop de async_db
+        await asyncio.sleep(DELAY)
+        return {'ok': True}
+
+    @app.get('/slow/sync')
+    def slow_sync():
+        time.sleep(DELAY)
+        return {'ok': True}
+
+    yield asgi_application(app)
+    async_db.dispose()
+
+
+async def _concurrent(application, path):
+    transport = httpx.ASGITransport(app=application)
+    async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(client.get(path) for _ in range(REQUESTS)))
+        elapsed = time.perf_counter() - started
+    assert all(response.status_code == 200 for response in responses)
+    return elapsed
+
+
+@pytest.mark.parametrize('path', ['/slow/async', '/slow/sync'])
+def test_requests_run_concurrently(application, path):
+    # En serie tardarían REQUESTS * DELAY
+    assert asyncio.run(_concurrent(application, path)) < REQUESTS * DELAY / 2
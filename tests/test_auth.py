@@ -0,0 +1,71 @@
+from unittest import mock
+import pytest
+from flask_jwt_extended import create_access_token, verify_jwt_in_request
+from app.decorators import auth
+from app.decorators.auth import get_current_user
+from app.models import Users, UserCredentials
+from app.utils.cache import TTLCache
+from .helpers import auth_headers
+
+
+@pytest.fixture
+def users(app, db):
+    # Cada worker relee la versión en cada petición
+    app.config['AUTH_VERSION_CHECK_SECONDS'] = -1
+    auth._user_cache.clear()
+    auth._versions.clear()
+    auth._changes.update(version=None, changed_at={})
+    admin = Users(username='admin', email='admin@example.com', role='admin')
+    editor = Users(username='ana', email='ana@example.com', role='admin')
+    db.session.add_all([admin, editor])
+    db.session.flush()
+    db.session.add_all([UserCredentials(user_id=user.id, password_hash='-') for user in (admin, editor)])
+    db.session.commit()
+    return admin, editor
+
+
+def _current_user(app, headers):
+    with app.test_request_context('/', headers=headers):
+        verify_jwt_in_request()
+        return get_current_user()
+
+
+def _other_worker():
+    """Estado por proceso vacío: lo que ocurra dentro no lo ve este worker"""
+    return mock.patch.multiple(
+        auth, _user_cache=TTLCache(), _versions=TTLCache(ttl=1, maxsize=1),
+        _changes={'version': None, 'changed_at': {}}
+    )
+
+
+def _manage(client, admin, **changes):
+    with _other_worker():
+        response = client.post('/api/users/admin/manage', json=changes, headers=auth_headers(admin))
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('trust_claims', [True, False])
+def test_role_change_reaches_every_worker(app, client, users, trust_claims):
+    app.config['AUTH_TRUST_JWT_CLAIMS'] = trust_claims
+    admin, editor = users
+    headers = {'Authorization': 'Bearer ' + create_access_token(
+        identity=str(editor.id), additional_claims={'role': 'admin', 'is_active': True}
+    )}
+    assert _current_user(app, headers).role == 'admin'
+
+    _manage(client, admin, user_id=editor.id, role='user')
+    assert _current_user(app, headers).role == 'user'
+
+    _manage(client, admin, user_id=editor.id, is_active=False)
+    assert _current_user(app, headers).is_active is False
+
+
+def test_claims_without_active_state_are_checked(app, db, users):
+    app.config['AUTH_TRUST_JWT_CLAIMS'] = True
+    _, editor = users
+    editor.is_active = False
+    db.session.commit()
+    headers = {'Authorization': 'Bearer ' + create_access_token(
+        identity=str(editor.id), additional_claims={'role': 'admin'}
+    )}
+    assert _current_user(app, headers).is_active is False
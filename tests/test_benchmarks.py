@@ -0,0 +1,13 @@
+from benchmarks.run import run, compare, unexpected_statuses
+
+
+def test_every_scenario_returns_its_expected_status():
+    results = run([20], iterations=1, alloc_iterations=0)
+    assert unexpected_statuses(results) == []
+
+
+def test_compare_fails_on_status_change():
+    base = {'100:post.create': {'status': 201, 'p50_ms': 5.0, 'queries': 6}}
+    result = {'100:post.create': {'status': 400, 'p50_ms': 1.0, 'queries': 0}}
+    assert compare(result, base, 0.2) == ['100:post.create: status 201 -> 400']
+    assert unexpected_statuses(result) == ['100:post.create: status 400 (expected 201)']
@@ -0,0 +1,74 @@
+import json
+from datetime import datetime
+import pytest
+from app.models import Users, Blogs, Comment
+from app.utils.bulk_import import CommentImporter
+
+STAMP = '2015-06-06T10:00:00'
+
+
+@pytest.fixture
+def post(db):
+    user = Users(username='ana', email='ana@example.com')
+    db.session.add(user)
+    db.session.flush()
+    post = Blogs(title='post', content='lorem', user_id=user.id)
+    db.session.add(post)
+    db.session.flush()
+    # Comentario existente con el mismo id que uno de origen
+    db.session.add(Comment(content='existente', user_id=user.id, post_id=post.id))
+    db.session.commit()
+    return post
+
+
+def _lines(*comments):
+    return [json.dumps({'user_id': 1, 'post_id': 1, 'created_at': STAMP, 'updated_at': STAMP, **c})
+            for c in comments]
+
+
+def _by_content():
+    return {comment.content: comment for comment in Comment.query.all()}
+
+
+def test_threads_are_resolved_by_source_id(db, post):
+    lines = _lines(
+        # Respuesta antes que su padre dentro del mismo bloque
+        {'id': 11, 'content': 'respuesta', 'parent_id': 10},
+        {'id': 10, 'content': 'raíz'},
+        # Bloque siguiente: el padre ya se importó
+        {'id': 1, 'content': 'segundo nivel', 'parent_id': 11},
+        {'id': 12, 'content': 'tercer nivel', 'parent_id': 1},
+        {'content': 'respuesta a existente', 'parent_id': 1},
+    )
+    # La última referencia a 1 ya resuelve al id de origen, no al existente
+    result = CommentImporter().run(lines, chunk_size=2)
+    assert result == {'inserted': 5, 'failed': 0, 'errors': []}
+
+    comments = _by_content()
+    assert comments['raíz'].parent_id is None
+    assert comments['respuesta'].parent_id == comments['raíz'].id
+    assert comments['segundo nivel'].parent_id == comments['respuesta'].id
+    assert comments['tercer nivel'].parent_id == comments['segundo nivel'].id
+    assert comments['respuesta a existente'].parent_id == comments['segundo nivel'].id
+    assert comments['tercer nivel'].path.count('/') == 4
+
+
+def test_imported_timestamps_are_kept(db, post):
+    CommentImporter().run(_lines({'id': 10, 'content': 'raíz'},
+                                 {'id': 11, 'content': 'respuesta', 'parent_id': 10}), 100)
+    db.session.expire_all()
+    for comment in Comment.query.filter(Comment.content != 'existente'):
+        assert comment.path
+        assert comment.updated_at == datetime.fromisoformat(STAMP)
+
+
+def test_unknown_or_circular_parents_fail(db, post):
+    result = CommentImporter().run(_lines(
+        {'id': 10, 'content': 'a', 'parent_id': 11},
+        {'id': 11, 'content': 'b', 'parent_id': 10},
+        {'content': 'c', 'parent_id': 99},
+        {'content': 'd', 'parent_id': 1},
+    ), 100)
+    assert result['inserted'] == 1
+    assert [error['line'] for error in result['errors']] == [1, 2, 3]
+    assert all(error['errors'] == {'parent_id': ['Not found']} for error in result['errors'])
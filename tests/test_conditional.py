@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+from app.models import Users, Blogs, Category, Comment
+from .helpers import auth_headers
+
+
+def _seed(db):
+    user = Users(username='ana', email='ana@example.com', role='admin')
+    category = Category(name='news')
+    db.session.add_all([user, category])
+    db.session.flush()
+    post = Blogs(title='hello', content='world', user_id=user.id, category_id=category.id)
+    db.session.add(post)
+    db.session.flush()
+    db.session.add(Comment(content='first', user_id=user.id, post_id=post.id))
+    db.session.commit()
+    return user, category, post
+
+
+def _revalidate(client, headers, path, response):
+    return client.get(path, headers={**headers, 'If-None-Match': response.headers['ETag']})
+
+
+def test_embedded_rows_change_the_etag(client, db):
+    user, category, post = _seed(db)
+    headers = auth_headers(user)
+    paths = ['/api/posts', f'/api/posts/{post.id}', f'/api/posts/{post.id}/comments',
+             f'/api/posts/{post.id}/comments/thread', f'/api/categories/{category.id}/posts']
+    first = {path: client.get(path, headers=headers) for path in paths}
+    for path, response in first.items():
+        assert response.status_code == 200, path
+        assert _revalidate(client, headers, path, response).status_code == 304, path
+
+    # Un instante después, para que updated_at cambie también con resolución de segundos
+    user.username = 'ana maria'
+    user.updated_at = datetime.utcnow() + timedelta(seconds=1)
+    db.session.commit()
+    for path, response in first.items():
+        assert _revalidate(client, headers, path, response).status_code == 200, path
+
+    renamed = client.get(f'/api/posts/{post.id}', headers=headers)
+    category.name = 'breaking'
+    category.updated_at = datetime.utcnow() + timedelta(seconds=2)
+    db.session.commit()
+    assert _revalidate(client, headers, f'/api/posts/{post.id}', renamed).status_code == 200
+
+
+def test_collections_have_no_last_modified(client, db):
+    user, _, post = _seed(db)
+    headers = auth_headers(user)
+    response = client.get('/api/posts', headers=headers)
+    assert 'Last-Modified' not in response.headers
+
+    db.session.delete(post)
+    db.session.commit()
+    since = {**headers, 'If-Modified-Since': 'Fri, 01 Jan 2100 00:00:00 GMT'}
+    assert client.get('/api/posts', headers=since).status_code == 200
+    assert client.get('/api/categories', headers=since).status_code == 200
+
+
+def test_validator_does_not_depend_on_status_or_encoding(app, client, db):
+    _seed(db)
+    app.config['COMPRESSION_MIN_SIZE'] = 0
+    gzip = {'Accept-Encoding': 'gzip'}
+    compressed = client.get('/api/categories', headers=gzip)
+    identity = client.get('/api/categories')
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Encoding' not in identity.headers
+
+    etag = compressed.headers['ETag']
+    assert etag.startswith('W/') and identity.headers['ETag'] == etag
+    for headers in (gzip, {}):
+        revalidated = client.get('/api/categories', headers={**headers, 'If-None-Match': etag})
+        assert revalidated.status_code == 304
+        assert revalidated.headers['ETag'] == etag
+        assert 'Accept-Encoding' in revalidated.headers['Vary']
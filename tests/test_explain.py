@@ -0,0 +1,16 @@
+from sqlalchemy import text
+from app.utils.explain import explain_hot_queries
+
+
+def test_hot_queries_use_index_searches(db):
+    problems = {
+        name: found for name, (plan, found) in explain_hot_queries().items() if found
+    }
+    assert problems == {}
+
+
+def test_full_index_scan_is_reported(db):
+    # Sin el índice compuesto el listado recorre otro índice o la tabla entera
+    db.session.execute(text('DROP INDEX ix_blogs_created_at_id'))
+    plan, problems = explain_hot_queries()['posts.list']
+    assert problems, plan
@@ -0,0 +1,63 @@
+import pytest
+from app.models import Users, Blogs, Comment
+from app.utils.loaders import QueryCounter
+from .helpers import auth_headers
+
+
+@pytest.fixture
+def thread(db):
+    user = Users(username='ana', email='ana@example.com')
+    db.session.add(user)
+    db.session.flush()
+    post = Blogs(title='lorem post', content='lorem ipsum', user_id=user.id)
+    db.session.add(post)
+    db.session.flush()
+    root = Comment(content='raíz', user_id=user.id, post_id=post.id)
+    db.session.add(root)
+    db.session.flush()
+    db.session.add(Comment(content='respuesta', user_id=user.id, post_id=post.id, parent_id=root.id))
+    db.session.commit()
+    return user
+
+
+def _get(client, db, user, path):
+    with QueryCounter(db.engine) as counter:
+        response = client.get(path, headers=auth_headers(user))
+    return response, ' '.join(counter.statements)
+
+
+def test_thread_projection(client, db, thread):
+    response, sql = _get(client, db, thread, '/api/posts/1/comments/thread?fields=content')
+    assert response.status_code == 200
+    assert response.json['comments'] == [{'id': 1, 'content': 'raíz'}]
+    # Ni el autor ni las columnas no pedidas
+    assert 'JOIN users' not in sql and 'comment.is_approved' not in sql
+
+
+def test_single_comment_projection(client, db, thread):
+    response, sql = _get(client, db, thread, '/api/posts/1/comments/1?fields=content,replies')
+    assert response.status_code == 200
+    comment = response.json['comment']
+    assert set(comment) == {'id', 'content', 'replies'}
+    # Las respuestas se vuelcan con el esquema completo
+    assert comment['replies'][0]['author'] == {'id': 1, 'username': 'ana'}
+
+    response, sql = _get(client, db, thread, '/api/posts/1/comments/1?fields=content')
+    assert response.json['comment'] == {'id': 1, 'content': 'raíz'}
+    assert 'comment.is_approved' not in sql
+
+
+def test_search_projection(client, db, thread):
+    response, sql = _get(client, db, thread, '/api/posts/search?q=lorem&fields=title')
+    assert response.status_code == 200
+    assert response.json['posts'] == [{'id': 1, 'title': 'lorem post'}]
+    assert 'blogs.content' not in sql
+
+
+@pytest.mark.parametrize('path', [
+    '/api/posts/1/comments/thread', '/api/posts/1/comments/1', '/api/posts/search?q=lorem'
+])
+def test_unknown_field(client, db, thread, path):
+    separator = '&' if '?' in path else '?'
+    response, _ = _get(client, db, thread, f'{path}{separator}fields=nope')
+    assert response.status_code == 400
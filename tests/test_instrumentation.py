@@ -0,0 +1,16 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app.extensions import db
+from app.utils.instrumentation import init_sql_instrumentation
+
+
+def test_failed_statement_does_not_leak_its_timer(app):
+    init_sql_instrumentation(app)
+    with db.engine.connect() as connection:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                connection.execute(text('SELECT * FROM missing_table'))
+        assert connection.info['query_start'] == []
+        connection.execute(text('SELECT 1'))
+        assert connection.info['query_start'] == []
@@ -0,0 +1,55 @@
+from app.models import Users, Blogs, Comment
+from app.schemas import CommentSchema
+from app.utils.fieldsets import fieldset_schema
+from app.utils.loaders import apply_loaders, assert_max_queries
+from app.utils.serializers import fast_dump
+
+THREADS = 10
+DEPTH = 4
+
+
+def _depth(comment):
+    return 1 + max((_depth(reply) for reply in comment['replies']), default=0)
+
+
+def _threads(db):
+    """THREADS hilos de DEPTH niveles, cada comentario de un autor distinto"""
+    post = None
+    for thread in range(THREADS):
+        parent_id = None
+        for level in range(DEPTH):
+            author = Users(username=f'u{thread}-{level}', email=f'u{thread}-{level}@example.com')
+            db.session.add(author)
+            db.session.flush()
+            if post is None:
+                post = Blogs(title='post', content='lorem', user_id=author.id)
+                db.session.add(post)
+                db.session.flush()
+            comment = Comment(content='x', user_id=author.id, post_id=post.id, parent_id=parent_id)
+            db.session.add(comment)
+            db.session.flush()
+            parent_id = comment.id
+    db.session.commit()
+    db.session.expire_all()
+
+
+def test_deep_threads_load_per_level_not_per_comment(db):
+    _threads(db)
+    schema = CommentSchema(many=True)
+    # Raíces con sus autores y una consulta por nivel (la última no encuentra hijos)
+    with assert_max_queries(1 + DEPTH):
+        roots = apply_loaders(Comment.query.filter(Comment.parent_id.is_(None)), schema).all()
+        comments = fast_dump(schema, roots)
+    assert len(comments) == THREADS
+    assert all(_depth(comment) == DEPTH for comment in comments)
+    assert comments[0]['replies'][0]['replies'][0]['author']['username'] == 'u0-2'
+
+
+def test_deep_threads_with_fieldset(app, db):
+    _threads(db)
+    with app.test_request_context('/?fields=content,replies'):
+        schema = fieldset_schema(CommentSchema, many=True)
+    with assert_max_queries(1 + DEPTH):
+        roots = apply_loaders(Comment.query.filter(Comment.parent_id.is_(None)), schema).all()
+        comments = fast_dump(schema, roots)
+    assert all(_depth(comment) == DEPTH for comment in comments)
@@ -0,0 +1,54 @@
+import os
+from datetime import datetime
+from flask_migrate import upgrade, downgrade
+from sqlalchemy import inspect, text
+from app.extensions import db
+from app.utils.search import search_posts
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+
+def _seed_baseline():
+    # Filas tal y como las dejaba la aplicación antes de las migraciones
+    now = datetime(2024, 1, 1)
+    statements = [
+        ("INSERT INTO users (id, username, email, role, is_active, created_at, updated_at) "
+         "VALUES (1, 'ana', 'ana@example.com', 'admin', 1, :now, :now), "
+         "(2, 'luis', 'luis@example.com', 'user', 0, :now, :now)"),
+        ("INSERT INTO blogs (id, title, content, user_id, created_at, updated_at) "
+         "VALUES (1, 'hello world', 'first post', 1, :now, :now), "
+         "(2, 'another', 'lorem ipsum', 2, :now, :now)"),
+        ("INSERT INTO comment (id, content, user_id, post_id, parent_id, created_at, updated_at) "
+         "VALUES (1, 'root', 1, 1, NULL, :now, :now), (2, 'reply', 2, 1, 1, :now, :now), "
+         "(3, 'nested', 1, 1, 2, :now, :now), (4, 'other', 2, 2, NULL, :now, :now)"),
+    ]
+    for statement in statements:
+        db.session.execute(text(statement), {'now': now})
+    db.session.commit()
+
+
+def test_upgrade_from_baseline_backfills(app):
+    upgrade(directory=MIGRATIONS, revision='0001_baseline')
+    assert 'path' not in {c['name'] for c in inspect(db.engine).get_columns('comment')}
+    _seed_baseline()
+
+    upgrade(directory=MIGRATIONS)
+
+    paths = dict(db.session.execute(text('SELECT id, path FROM comment')).all())
+    assert paths == {
+        1: '00000001/',
+        2: '00000001/00000002/',
+        3: '00000001/00000002/00000003/',
+        4: '00000004/',
+    }
+    counters = dict(db.session.execute(text('SELECT name, value FROM counter')).all())
+    assert counters == {'total_users': 2, 'active_users': 1, 'total_posts': 2, 'total_comments': 4}
+    assert [row.id for row in search_posts('lorem', 10)] == [2]
+
+
+def test_downgrade_to_baseline(app):
+    upgrade(directory=MIGRATIONS)
+    downgrade(directory=MIGRATIONS, revision='0001_baseline')
+    tables = set(inspect(db.engine).get_table_names())
+    assert {'users', 'blogs', 'comment', 'category', 'user_credentials'} <= tables
+    assert not tables & {'counter', 'stats_rollup', 'blogs_fts', 'category_top_post'}
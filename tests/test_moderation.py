@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+from app.models import Users, Blogs, Comment
+from app.utils.moderation import delete_comments
+
+
+def test_orphaned_replies_are_marked_updated(db):
+    user = Users(username='ana', email='ana@example.com')
+    db.session.add(user)
+    db.session.flush()
+    post = Blogs(title='post', content='lorem', user_id=user.id)
+    db.session.add(post)
+    db.session.flush()
+    created = datetime.utcnow() - timedelta(days=1)
+    parent = Comment(content='padre', user_id=user.id, post_id=post.id, created_at=created, updated_at=created)
+    db.session.add(parent)
+    db.session.flush()
+    reply = Comment(content='respuesta', user_id=user.id, post_id=post.id, parent_id=parent.id,
+                    created_at=created, updated_at=created)
+    db.session.add(reply)
+    db.session.commit()
+    reply_id = reply.id
+
+    assert delete_comments([Comment.id == parent.id]) == (1, 1)
+    db.session.commit()
+    db.session.expire_all()
+
+    reply = db.session.get(Comment, reply_id)
+    assert reply.parent_id is None
+    # El ETag de los comentarios del post (max(updated_at)) cambia
+    assert reply.updated_at > created
+
+
+def test_replies_deleted_with_their_parent_are_not_detached(db):
+    user = Users(username='ana', email='ana@example.com')
+    db.session.add(user)
+    db.session.flush()
+    post = Blogs(title='post', content='lorem', user_id=user.id)
+    db.session.add(post)
+    db.session.flush()
+    parent_id = None
+    chain = []
+    for content in ('padre', 'respuesta', 'superviviente'):
+        comment = Comment(content=content, user_id=user.id, post_id=post.id, parent_id=parent_id)
+        db.session.add(comment)
+        db.session.flush()
+        chain.append(comment.id)
+        parent_id = comment.id
+    db.session.commit()
+
+    # Se borran el padre y su respuesta; solo la respuesta de esta queda suelta
+    assert delete_comments([Comment.id.in_(chain[:2])]) == (2, 1)
+    db.session.commit()
+    db.session.expire_all()
+    survivor = db.session.get(Comment, chain[2])
+    assert survivor.parent_id is None
+    assert survivor.path == f'{chain[2]:08d}/'
@@ -0,0 +1,71 @@
+import base64
+from datetime import datetime
+import pytest
+from app.models import Users, Blogs
+from app.utils.pagination import decode_cursor, encode_cursor, paginate, PaginationError
+from .helpers import auth_headers
+
+
+@pytest.fixture
+def posts(db):
+    user = Users(username='ana', email='ana@example.com')
+    db.session.add(user)
+    db.session.flush()
+    # Empates en created_at: el id decide el orden
+    stamps = [datetime(2024, 1, 1)] * 3 + [datetime(2024, 1, 2)] * 2 + [datetime(2024, 1, 3)]
+    db.session.add_all([
+        Blogs(title=f'post {i}', content='lorem', user_id=user.id, created_at=stamp, updated_at=stamp)
+        for i, stamp in enumerate(stamps, 1)
+    ])
+    db.session.commit()
+    return user
+
+
+def _walk(limit, descending):
+    ids, cursor, pages = [], None, 0
+    while True:
+        items, cursor = paginate(Blogs.query, Blogs, limit=limit, cursor=cursor, descending=descending)
+        ids.extend(item.id for item in items)
+        pages += 1
+        if cursor is None:
+            return ids, pages
+
+
+@pytest.mark.parametrize('limit', [1, 2, 4, 6])
+def test_pages_cover_every_row_once_across_ties(posts, limit):
+    ids, pages = _walk(limit, descending=True)
+    assert ids == [6, 5, 4, 3, 2, 1]
+    # Se pide una fila de más: la última página no deja un cursor a una página vacía
+    assert pages == -(-6 // limit)
+    assert _walk(limit, descending=False)[0] == [1, 2, 3, 4, 5, 6]
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(datetime(2020, 1, 1, 12), 7)) == (datetime(2020, 1, 1, 12), 7)
+
+
+def _raw_cursor(raw):
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+MALFORMED = [
+    'not a cursor!', _raw_cursor('{}'), _raw_cursor('[]'), _raw_cursor('["2020-01-01"]'),
+    _raw_cursor('["2020-01-01", 1e999]'), _raw_cursor('["2020-01-01", 1.5]'),
+    _raw_cursor('["2020-01-01", true]'), _raw_cursor('["2020-01-01", "1"]'),
+    _raw_cursor('["2020-01-01", -1]'), _raw_cursor(f'["2020-01-01", {10 ** 30}]'),
+    _raw_cursor('["yesterday", 1]'), _raw_cursor('[20200101, 1]'),
+    base64.urlsafe_b64encode(b'\xff\xfe').decode(),
+]
+
+
+@pytest.mark.parametrize('cursor', MALFORMED)
+def test_malformed_cursor(cursor):
+    with pytest.raises(PaginationError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize('cursor', MALFORMED)
+def test_malformed_cursor_is_a_bad_request(client, posts, cursor):
+    response = client.get('/api/posts', query_string={'cursor': cursor}, headers=auth_headers(posts))
+    assert response.status_code == 400
+    assert response.json == {'message': 'Invalid cursor'}
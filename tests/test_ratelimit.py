@@ -0,0 +1,52 @@
+import pytest
+from app import create_app
+from app.extensions import db as _db
+from app.utils.ratelimit import reset_store
+
+
+@pytest.fixture
+def make_client(tmp_path):
+    apps = []
+
+    def make(**config):
+        app = create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}",
+            'PASSWORD_HASH_WORKERS': 0,
+            'RATE_LIMIT_IP': '1/60',
+            **config,
+        })
+        with app.app_context():
+            _db.create_all(bind_key=None)
+        apps.append(app)
+        return app.test_client()
+
+    reset_store()
+    yield make
+    reset_store()
+    for app in apps:
+        with app.app_context():
+            _db.engine.dispose()
+
+
+def _login(client, forwarded_for):
+    # Todas las peticiones llegan desde la misma IP: la del proxy
+    return client.post(
+        '/api/login',
+        json={},
+        headers={'X-Forwarded-For': forwarded_for},
+        environ_base={'REMOTE_ADDR': '10.0.0.1'},
+    )
+
+
+def test_clients_behind_proxy_get_their_own_bucket(make_client):
+    client = make_client(PROXY_FIX_X_FOR=1)
+    assert _login(client, '203.0.113.1').status_code != 429
+    assert _login(client, '203.0.113.2').status_code != 429
+    assert _login(client, '203.0.113.1').status_code == 429
+
+
+def test_forwarded_for_is_ignored_without_proxy_fix(make_client):
+    client = make_client()
+    assert _login(client, '203.0.113.1').status_code != 429
+    assert _login(client, '203.0.113.2').status_code == 429
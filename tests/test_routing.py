@@ -0,0 +1,63 @@
+import pytest
+from flask import g
+from sqlalchemy import select
+from app import create_app
+from app.extensions import db
+from app.models import Counter, StatsRollup, Users
+from app.utils.routing import LAST_WRITE_HEADER, LAST_WRITE_COOKIE, _choose_route, _remember_write
+from app.utils.rollups import DETAILED_STATS, get_rollup
+
+
+@pytest.fixture
+def replicated_app(tmp_path):
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'primary.db'}",
+        'SQLALCHEMY_READ_REPLICAS': [f"sqlite:///{tmp_path / 'replica.db'}"],
+        'PASSWORD_HASH_WORKERS': 0,
+    })
+    with app.app_context():
+        db.create_all()
+        # Réplica atrasada: mismo esquema, sin filas
+        db.metadata.create_all(db.engines['replica_0'])
+        db.session.add(Users(username='ana', email='ana@example.com'))
+        db.session.commit()
+        yield app
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def _route(app, method='GET', headers=None):
+    with app.test_request_context('/api/posts', method=method, headers=headers or {}):
+        _choose_route()
+        return g.db_route
+
+
+def test_write_marker_routes_reads_to_primary(replicated_app):
+    assert _route(replicated_app) == 'replica'
+    with replicated_app.test_request_context('/api/posts', method='POST'):
+        response = _remember_write(replicated_app.response_class(status=201))
+    token = response.headers[LAST_WRITE_HEADER]
+    assert LAST_WRITE_COOKIE in response.headers['Set-Cookie']
+
+    # La marca viaja con el cliente: cualquier worker la puede comprobar
+    assert _route(replicated_app, headers={LAST_WRITE_HEADER: token}) == 'primary'
+    assert _route(replicated_app, headers={'Cookie': f'{LAST_WRITE_COOKIE}={token}'}) == 'primary'
+    assert _route(replicated_app, headers={LAST_WRITE_HEADER: token + 'x'}) == 'replica'
+
+    replicated_app.config['REPLICA_STICKY_SECONDS'] = -1
+    assert _route(replicated_app, headers={LAST_WRITE_HEADER: token}) == 'replica'
+
+
+def test_reads_that_write_use_primary(replicated_app):
+    with replicated_app.test_request_context('/api/stats/detailed'):
+        g.db_route = 'replica'
+        rollup = get_rollup(DETAILED_STATS)
+    # Calculado con los datos de la primaria y guardado en ella
+    assert rollup.payload['users_by_role'] == {'user': 1}
+    db.session.remove()
+    assert db.session.get(StatsRollup, DETAILED_STATS) is not None
+    with db.engines['replica_0'].connect() as connection:
+        assert connection.execute(select(StatsRollup.name)).first() is None
+        assert connection.execute(select(Counter.name)).first() is None
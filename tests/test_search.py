@@ -0,0 +1,38 @@
+from unittest import mock
+import pytest
+from sqlalchemy import text
+from app.models import Users, Blogs
+from app.utils import search
+from app.utils.search import search_posts, SearchUnavailable
+
+
+def _user(db):
+    user = Users(username='ana', email='ana@example.com')
+    db.session.add(user)
+    db.session.flush()
+    return user
+
+
+def test_missing_fts_table_is_created_and_backfilled(db):
+    user = _user(db)
+    db.session.add(Blogs(title='old post', content='lorem ipsum', user_id=user.id))
+    db.session.commit()
+    # Base de datos anterior al índice: sin tabla virtual
+    db.session.execute(text(f'DROP TABLE {search.FTS_TABLE}'))
+    db.session.commit()
+    search._BACKENDS['sqlite']._ready.clear()
+
+    db.session.add(Blogs(title='new post', content='lorem dolor', user_id=user.id))
+    db.session.commit()
+
+    assert sorted(match.id for match in search_posts('lorem', 10)) == [1, 2]
+
+
+def test_unsupported_dialect_skips_indexing(db):
+    user = _user(db)
+    with mock.patch.dict(search._BACKENDS, clear=True):
+        db.session.add(Blogs(title='post', content='lorem', user_id=user.id))
+        db.session.commit()
+        with pytest.raises(SearchUnavailable):
+            search_posts('lorem', 10)
+    assert db.session.query(Blogs).count() == 1
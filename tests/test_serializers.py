@@ -0,0 +1,79 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import update
+from app.models import Users, Blogs, Comment, Category
+from app.schemas import UserSchema, BlogSchema, CommentSchema, CategorySchema
+from app.utils.serializers import fast_dump, check_parity
+
+
+@pytest.fixture
+def content(db):
+    """Posts con y sin categoría y un hilo de tres niveles con valores nulos"""
+    stamp = datetime(2024, 2, 29, 23, 59, 58, 123456)
+    author = Users(username='ana', email='ana@example.com', role='moderator', created_at=stamp)
+    inactive = Users(username='luis', email='luis@example.com')
+    category = Category(name='python', description=None)
+    db.session.add_all([author, inactive, category])
+    db.session.flush()
+    posts = [
+        Blogs(title='con categoría', content='ñandú ✓', user_id=author.id,
+              category_id=category.id, created_at=stamp, updated_at=stamp),
+        Blogs(title='sin categoría', content='', user_id=inactive.id, category_id=None),
+    ]
+    db.session.add_all(posts)
+    db.session.flush()
+    root = Comment(content='raíz', user_id=author.id, post_id=posts[0].id, created_at=stamp)
+    db.session.add(root)
+    db.session.flush()
+    reply = Comment(content='respuesta', user_id=inactive.id, post_id=posts[0].id,
+                    parent_id=root.id)
+    db.session.add(reply)
+    db.session.flush()
+    db.session.add(Comment(content='tercer nivel', user_id=author.id, post_id=posts[0].id,
+                           parent_id=reply.id, is_approved=False))
+    # Los defaults de columna sustituyen los None al insertar
+    db.session.execute(update(Users).where(Users.id == inactive.id).values(is_active=None))
+    db.session.execute(update(Comment).where(Comment.id == reply.id).values(is_approved=None))
+    db.session.commit()
+    db.session.expire_all()
+    return {
+        'users': Users.query.order_by(Users.id).all(),
+        'categories': Category.query.all(),
+        'posts': Blogs.query.order_by(Blogs.id).all(),
+        'comments': Comment.query.filter(Comment.parent_id.is_(None)).all(),
+    }
+
+
+@pytest.mark.parametrize('schema_class, key', [
+    (UserSchema, 'users'),
+    (CategorySchema, 'categories'),
+    (BlogSchema, 'posts'),
+    (CommentSchema, 'comments'),
+])
+def test_fast_dump_matches_marshmallow(content, schema_class, key):
+    items = content[key]
+    assert fast_dump(schema_class(many=True), items) == schema_class(many=True).dump(items)
+    assert fast_dump(schema_class(), items[0]) == schema_class().dump(items[0])
+    assert check_parity(schema_class(many=True), items) == []
+
+
+def test_nested_and_null_values(content):
+    post, uncategorized = fast_dump(BlogSchema(many=True), content['posts'])
+    assert post['author'] == {'id': 1, 'username': 'ana'}
+    assert post['created_at'] == '2024-02-29T23:59:58.123456'
+    assert uncategorized['category'] is None and uncategorized['category_id'] is None
+    assert fast_dump(UserSchema(), content['users'][1])['is_active'] is None
+
+    thread = fast_dump(CommentSchema(), content['comments'][0])
+    assert thread == CommentSchema().dump(content['comments'][0])
+    reply = thread['replies'][0]
+    assert reply['is_approved'] is None
+    assert reply['replies'][0]['is_approved'] is False
+    assert reply['replies'][0]['replies'] == []
+
+
+def test_projections_are_compiled_separately(content):
+    only = ('id', 'title', 'author')
+    schema = BlogSchema(many=True, only=only)
+    assert fast_dump(schema, content['posts']) == schema.dump(content['posts'])
+    assert fast_dump(BlogSchema(many=True), content['posts'])[0].keys() > set(only)
@@ -0,0 +1,31 @@
+import os
+from app.utils.warmup import warmup, after_fork
+
+
+def _in_child(fn):
+    """Ejecuta fn() en un proceso hijo creado con fork y devuelve su resultado (int)"""
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read)
+        os.write(write, str(fn()).encode())
+        os._exit(0)
+    os.close(write)
+    os.waitpid(pid, 0)
+    with os.fdopen(read) as pipe:
+        return int(pipe.read())
+
+
+def test_prefork_warmup_leaves_no_connections(app, db):
+    warmup(app)
+    pool = db.engine.pool
+    assert pool.checkedin() == 0
+    # Los procesos creados con fork que no son workers (p. ej. el pool de
+    # hashing) no abren conexiones por su cuenta
+    assert _in_child(pool.checkedin) == 0
+
+
+def test_after_fork_primes_worker_pool(app, db):
+    warmup(app)
+    after_fork(app)
+    assert db.engine.pool.checkedin() == db.engine.pool.size()
@@ -0,0 +1,12 @@
+"""
+Punto de entrada WSGI. Con preload_app la aplicación se crea y se calienta
+en el proceso maestro y los workers la heredan ya preparada:
+    gunicorn wsgi:application -c gunicorn.conf.py
+"""
+from app import create_app
+from app.utils.warmup import warmup
+
+application = create_app()
+
+if application.config['WARMUP_ON_STARTUP']:
+    warmup(application)